@@ -1,9 +1,11 @@
 import os
-import json
-import time
-from groq import Groq
+import asyncio
+import argparse
 from dotenv import load_dotenv
 from humanizer import humanize_bullet
+from corpus import CORPUS_PATH, CLEAN_CORPUS, append_records, ensure_jsonl, iter_records, load_nested, make_record, write_records
+from llm_client import get_llm
+from near_dup import filter_new
 
 # Load Environment Variables
 load_dotenv()
@@ -13,15 +15,18 @@ if not GROQ_API_KEY:
     print("Error: GROQ_API_KEY not found in .env")
     exit(1)
 
-# Configure Groq
-client = Groq(api_key=GROQ_API_KEY)
 # Using Llama 3.3 70B as requested
 MODEL_NAME = "llama-3.3-70b-versatile"
 
 # Filter domains as requested
 TARGET_DOMAINS = ["IT", "Product"]
 
-def generate_bullets(domain, seeds, count=20):
+BATCHES_PER_DOMAIN = 2
+BATCH_SIZE = 25
+SKIP_THRESHOLD = 50
+DEFAULT_CONCURRENCY = 4
+
+async def generate_bullets(domain, seeds, count=20):
     seed_text = "\n".join([f"- {s}" for s in seeds[:5]]) 
     
     prompt = f"""
@@ -39,20 +44,19 @@ def generate_bullets(domain, seeds, count=20):
     """
     
     try:
-        completion = client.chat.completions.create(
-            model=MODEL_NAME,
-            messages=[
+        # Shared client handles Groq rate limits (RPM/TPM) and retries on 429/5xx
+        completion = await get_llm().chat(
+            [
                 {"role": "system", "content": "You are a helpful AI assistant that writes perfect resume bullet points."},
                 {"role": "user", "content": prompt}
             ],
+            model=MODEL_NAME,
             temperature=0.7,
             max_tokens=2048,
             top_p=1,
-            stream=False,
-            stop=None,
         )
         
-        text = completion.choices[0].message.content
+        text = completion.text
         
         # Clean up response
         new_bullets = []
@@ -72,32 +76,46 @@ def generate_bullets(domain, seeds, count=20):
         print(f"    ! Error generating for {domain}: {e}")
         return []
 
-def main():
-    # 1. Load Data
-    data_structure = {}
-    
-    if os.path.exists('augmented_resumes.json'):
-         with open('augmented_resumes.json', 'r', encoding='utf-8') as f:
-            data_structure = json.load(f)
-    else:
-         with open('cleaned_resumes.json', 'r', encoding='utf-8') as f:
-            raw = json.load(f)
-            for d, pts in raw.items():
-                data_structure[d] = {"real": pts, "synthetic": []}
+def load_data():
+    # First run on the JSON-lines corpus: convert the old augmented file, or seed it with the cleaned real bullets
+    ensure_jsonl(CORPUS_PATH)
+    if not os.path.exists(CORPUS_PATH):
+        write_records(iter_records(CLEAN_CORPUS), CORPUS_PATH)
 
-    # 2. Iterate Domains
-    for domain in TARGET_DOMAINS:
+    return load_nested(CORPUS_PATH)
+
+def pending_domains(data_structure, domains):
+    pending = []
+    for domain in domains:
         if domain not in data_structure:
             continue
 
-        real_count = len(data_structure[domain]['real'])
-        
         # Check if already augmented (threshold check)
         existing_synthetic = data_structure[domain].get('synthetic', [])
-        if len(existing_synthetic) > 50: 
+        if len(existing_synthetic) > SKIP_THRESHOLD: 
              print(f"\nSkipping {domain} (Enough synthetic data: {len(existing_synthetic)})")
              continue
-             
+
+        pending.append(domain)
+    return pending
+
+def record_domain(data_structure, domain, domain_new_points):
+    content = data_structure[domain]
+    existing = content.get('real', []) + content.get('synthetic', [])
+
+    # Drop paraphrased near-copies of what we already have (and of each other)
+    unique_points = filter_new(existing, domain_new_points)
+    print(f"  > {domain}: generated {len(domain_new_points)} new points, {len(unique_points)} after near-duplicate filter.")
+    
+    # Append to SYNTHETIC list
+    content.setdefault('synthetic', []).extend(unique_points)
+    
+    # SAVE INCREMENTALLY: append only the new records; already humanized, so pipeline.py won't re-jitter them
+    append_records((make_record(domain, p, "synthetic", ["humanize"]) for p in unique_points), CORPUS_PATH)
+    print(f"  [Saved progress for {domain}]")
+
+async def run_serial(data_structure, domains):
+    for domain in domains:
         print(f"\nProcessing Domain: {domain}")
         
         seeds = data_structure[domain].get('real', [])
@@ -105,28 +123,60 @@ def main():
         
         domain_new_points = []
         # Groq is fast, let's do bigger batches
-        for i in range(2): 
-            print(f"  > Batch {i+1}/2...")
-            new_points = generate_bullets(domain, context_seeds, count=25)
+        for i in range(BATCHES_PER_DOMAIN): 
+            print(f"  > Batch {i+1}/{BATCHES_PER_DOMAIN}...")
+            new_points = await generate_bullets(domain, context_seeds, count=BATCH_SIZE)
             
             # HUMANIZE SYNTHETIC POINTS
             humanized_points = [humanize_bullet(p) for p in new_points]
             domain_new_points.extend(humanized_points)
             
-            # Groq rate limits are generous but let's be safe
-            time.sleep(2) 
-            
-        print(f"  > Generated {len(domain_new_points)} new points.")
-        
-        # Append to SYNTHETIC list
-        data_structure[domain]['synthetic'].extend(domain_new_points)
-        
-        # SAVE INCREMENTALLY
-        with open('augmented_resumes.json', 'w', encoding='utf-8') as f:
-            json.dump(data_structure, f, indent=2, ensure_ascii=False)
-        print(f"  [Saved progress for {domain}]")
+        record_domain(data_structure, domain, domain_new_points)
+
+async def run_concurrent(data_structure, domains, concurrency):
+    # Every (domain, batch) request is in flight at once, capped by the semaphore here and by
+    # llm_client's RPM/TPM buckets. Batches are merged in batch order, so the result per domain
+    # doesn't depend on which request finished first.
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one_batch(domain, seeds, i):
+        async with semaphore:
+            print(f"  > {domain}: batch {i+1}/{BATCHES_PER_DOMAIN} started")
+            return await generate_bullets(domain, seeds, count=BATCH_SIZE)
+
+    async def one_domain(domain):
+        seeds = data_structure[domain].get('real', [])
+        batches = await asyncio.gather(*(one_batch(domain, seeds, i) for i in range(BATCHES_PER_DOMAIN)))
+        return domain, [humanize_bullet(p) for batch in batches for p in batch]
+
+    print(f"\nGenerating {len(domains)} domains x {BATCHES_PER_DOMAIN} batches (concurrency {concurrency})...")
+    tasks = [asyncio.create_task(one_domain(domain)) for domain in domains]
+
+    # Save as each domain completes so an interrupted run keeps finished domains
+    for next_done in asyncio.as_completed(tasks):
+        domain, domain_new_points = await next_done
+        record_domain(data_structure, domain, domain_new_points)
+
+async def main():
+    arg_parser = argparse.ArgumentParser(description="Generate synthetic resume bullets per domain.")
+    arg_parser.add_argument("--concurrent", action="store_true", help="Fan out all domains and batches at once")
+    arg_parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY, help="Max in-flight LLM requests in --concurrent mode")
+    arg_parser.add_argument("--domains", nargs="+", default=TARGET_DOMAINS, help="Domains to augment, or 'all'")
+    args = arg_parser.parse_args()
+
+    # 1. Load Data
+    data_structure = load_data()
+
+    domains = list(data_structure) if args.domains == ["all"] else args.domains
+
+    # 2. Iterate Domains
+    pending = pending_domains(data_structure, domains)
+    if args.concurrent:
+        await run_concurrent(data_structure, pending, args.concurrency)
+    else:
+        await run_serial(data_structure, pending)
 
-    print("\nSUCCESS: Saved all to augmented_resumes.json")
+    print(f"\nSUCCESS: Saved all to {os.path.basename(CORPUS_PATH)}")
     
     # Stats
     total_real = sum(len(v['real']) for v in data_structure.values())
@@ -134,4 +184,4 @@ def main():
     print(f"Total Database: {total_real} Real, {total_synth} Synthetic")
 
 if __name__ == "__main__":
-    main()
+    asyncio.run(main())
@@ -0,0 +1,129 @@
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+from parser import parse_resume_async
+
+# Bulk resume import.
+# Usage:
+#   python batch_parse.py resumes_dir/ -o parsed.jsonl
+#   python batch_parse.py manifest.txt -o parsed.jsonl --concurrency 16
+# Output is JSON-lines, one {"file": ..., "result": {...}} per resume, appended as each one finishes.
+# Rerunning with the same output file skips resumes that already parsed successfully,
+# so a crashed or interrupted run picks up where it stopped (failed ones are retried).
+
+DEFAULT_CONCURRENCY = 8
+
+def collect_paths(source):
+    if os.path.isdir(source):
+        paths = []
+        for root, _, files in os.walk(source):
+            for name in files:
+                if name.lower().endswith(".pdf"):
+                    paths.append(os.path.join(root, name))
+        return sorted(paths)
+
+    # Manifest: one path per line, relative paths resolved against the manifest's folder
+    base_dir = os.path.dirname(os.path.abspath(source))
+    paths = []
+    with open(source, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith("#"):
+                paths.append(os.path.join(base_dir, line))
+    return paths
+
+def load_done(output_path):
+    done = set()
+    if not os.path.exists(output_path):
+        return done
+
+    with open(output_path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                # Half-written last line from a crash
+                continue
+            if "error" not in record.get("result", {}):
+                done.add(record["file"])
+    return done
+
+def open_output(output_path):
+    # Make sure we append on a fresh line if the previous run died mid-write
+    needs_newline = False
+    if os.path.exists(output_path) and os.path.getsize(output_path) > 0:
+        with open(output_path, "rb") as f:
+            f.seek(-1, os.SEEK_END)
+            needs_newline = f.read(1) != b"\n"
+
+    out = open(output_path, "a", encoding="utf-8")
+    if needs_newline:
+        out.write("\n")
+    return out
+
+async def parse_one(path, semaphore):
+    async with semaphore:
+        stats = {}
+        start = time.perf_counter()
+        result = await parse_resume_async(path, stats=stats)
+        stats["seconds"] = round(time.perf_counter() - start, 3)
+        return path, result, stats
+
+async def run_batch(pending, output_path, concurrency):
+    parsed = failed = cached = 0
+    total_tokens = 0
+    start = time.perf_counter()
+
+    # Extraction and LLM calls share one event loop; the semaphore bounds documents in flight
+    semaphore = asyncio.Semaphore(concurrency)
+    with open_output(output_path) as out:
+        tasks = [asyncio.create_task(parse_one(path, semaphore)) for path in pending]
+
+        for next_done in asyncio.as_completed(tasks):
+            path, result, stats = await next_done
+            record = {"file": os.path.abspath(path), "result": result, "stats": stats}
+            out.write(json.dumps(record, ensure_ascii=False) + "\n")
+            out.flush()
+
+            if "error" in result:
+                failed += 1
+                print(f"  ! {path}: {result['error']}", file=sys.stderr)
+            else:
+                parsed += 1
+            cached += stats.get("cached", False)
+            total_tokens += stats.get("prompt_tokens", 0) + stats.get("completion_tokens", 0)
+
+            finished = parsed + failed
+            if finished % 50 == 0:
+                elapsed = time.perf_counter() - start
+                print(f"  > {finished}/{len(pending)} ({finished / elapsed:.2f} docs/sec)", file=sys.stderr)
+
+    elapsed = max(time.perf_counter() - start, 1e-9)
+    print("\n" + "=" * 40, file=sys.stderr)
+    print(f"Parsed:      {parsed} ({cached} from cache)", file=sys.stderr)
+    print(f"Failed:      {failed}", file=sys.stderr)
+    print(f"Elapsed:     {elapsed:.1f}s", file=sys.stderr)
+    print(f"Throughput:  {(parsed + failed) / elapsed:.2f} docs/sec", file=sys.stderr)
+    print(f"Tokens:      {total_tokens} ({total_tokens / elapsed:.0f} tokens/sec)", file=sys.stderr)
+    print("=" * 40, file=sys.stderr)
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Parse a directory or manifest of resume PDFs.")
+    arg_parser.add_argument("source", help="Directory of PDFs or a manifest file with one path per line")
+    arg_parser.add_argument("-o", "--output", default="parsed_resumes.jsonl")
+    arg_parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY)
+    args = arg_parser.parse_args()
+
+    paths = collect_paths(args.source)
+    done = load_done(args.output)
+    pending = [p for p in paths if os.path.abspath(p) not in done]
+
+    print(f"Found {len(paths)} resumes, {len(paths) - len(pending)} already parsed, {len(pending)} to go.", file=sys.stderr)
+
+    asyncio.run(run_batch(pending, args.output, args.concurrency))
+
+if __name__ == "__main__":
+    main()
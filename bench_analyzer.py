@@ -0,0 +1,122 @@
+import os
+import re
+import sys
+import json
+import time
+import random
+import argparse
+from bullet_analyzer import analyze, build_messages, BORDERLINE, SEVERITIES
+from corpus import CORPUS_PATH, iter_records
+from llm_client import estimate_tokens
+
+# What bullet_analyzer saves /api/analyze: local latency per resume, the share of bullets it settles
+# without the LLM, and prompt tokens against sending the whole resume (the route's fallback prompt,
+# read out of route.ts so the two can't drift apart).
+# Usage:
+#   python bench_analyzer.py                     (200 synthetic resumes from corpus bullets, token estimates)
+#   python bench_analyzer.py resume.json ...     (your own ResumeData files)
+#   python bench_analyzer.py --live --resumes 5  (also calls Groq with both prompts and times them)
+
+ROUTE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "web", "app", "api", "analyze", "route.ts")
+ROUTE_PROMPT_RE = re.compile(r"content: `(You are a Senior Resume Reviewer.*?)`", re.DOTALL)
+
+# The kind of bullets the analyze prompt exists to catch
+WEAK_BULLETS = [
+    "Helped with the order-tracking API and worked on caching.",
+    "Responsible for various internal tools used by the support team.",
+    "Worked on the onboarding flow for the mobile app.",
+    "Assisted senior engineers in migrating services to the cloud.",
+    "Participated in code reviews and sprint planning meetings.",
+    "Built 3 microservices for the payments team using Go and Kafka.",
+    "Managed several client accounts and handled different escalations.",
+    "Wrote documentation for the internal deployment tooling.",
+]
+
+def route_messages(resume_data):
+    with open(ROUTE_PATH, "r", encoding="utf-8") as f:
+        prompt = ROUTE_PROMPT_RE.search(f.read()).group(1)
+    return [
+        {"role": "system", "content": prompt},
+        {"role": "user", "content": f"Resume Data: {json.dumps(resume_data)}"},
+    ]
+
+def message_tokens(messages):
+    return sum(estimate_tokens(m["content"]) for m in messages or [])
+
+def synthetic_resumes(count, seed=0):
+    # Corpus bullets are stored LaTeX-escaped; the parser hands the route plain text
+    good = [re.sub(r"\\([%$&#_])", r"\1", record["text"]) for record in iter_records(CORPUS_PATH)]
+    rng = random.Random(seed)
+    resumes = []
+    for _ in range(count):
+        experience = [{
+            "company": f"Company {e}",
+            "role": "Software Engineer",
+            "bullets": [rng.choice(WEAK_BULLETS) if rng.random() < 0.35 else rng.choice(good) for _ in range(4)],
+        } for e in range(3)]
+        resumes.append({"profile": {"name": "Sample"}, "experience": experience})
+    return resumes
+
+def percentile(values, p):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * p / 100))] if ordered else 0.0
+
+def timed_completion(messages):
+    # Imported here: parser loads web/.env, which only the live run needs
+    from parser import MODEL_NAME
+    from llm_client import get_llm, run_sync
+    start = time.perf_counter()
+    run_sync(get_llm().chat(messages, model=MODEL_NAME, temperature=0))
+    return time.perf_counter() - start
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Benchmark the local bullet analyzer against the full analyze prompt.")
+    arg_parser.add_argument("files", nargs="*", help="ResumeData JSON files (default: synthetic resumes)")
+    arg_parser.add_argument("--resumes", type=int, default=200, help="Synthetic resumes to generate")
+    arg_parser.add_argument("--live", action="store_true", help="Also call the LLM with both prompts")
+    args = arg_parser.parse_args()
+
+    resumes = []
+    for path in args.files:
+        with open(path, "r", encoding="utf-8") as f:
+            resumes.append(json.load(f))
+    resumes = resumes or synthetic_resumes(args.resumes)
+
+    analyze(resumes[0])  # warm-up: NumPy and the regexes
+    latencies, rows = [], []
+    for resume in resumes:
+        start = time.perf_counter()
+        analysis = analyze(resume)
+        messages = build_messages(analysis)
+        latencies.append((time.perf_counter() - start) * 1000)
+        rows.append({
+            "bullets": sum(len(e.get("bullets") or []) for e in resume.get("experience") or []),
+            "local": sum(len(analysis[s]) for s in SEVERITIES),
+            "borderline": len(analysis[BORDERLINE]),
+            "full_tokens": message_tokens(route_messages(resume)),
+            "local_tokens": message_tokens(messages),
+            "messages": messages,
+        })
+
+    bullets = sum(r["bullets"] for r in rows)
+    borderline = sum(r["borderline"] for r in rows)
+    full_tokens = sum(r["full_tokens"] for r in rows)
+    local_tokens = sum(r["local_tokens"] for r in rows)
+    skipped = sum(1 for r in rows if not r["messages"])
+
+    print(f"{len(resumes)} resumes, {bullets} bullets\n")
+    print(f"local analysis      p50 {percentile(latencies, 50):.2f} ms   p95 {percentile(latencies, 95):.2f} ms per resume")
+    print(f"settled locally     {bullets - borderline} bullets ({1 - borderline / max(bullets, 1):.0%}), "
+          f"{sum(r['local'] for r in rows)} of them with a finding")
+    print(f"left for the LLM    {borderline} bullets; {skipped} of {len(resumes)} resumes need no LLM call")
+    print(f"prompt tokens       {full_tokens} -> {local_tokens} ({1 - local_tokens / max(full_tokens, 1):.0%} saved)")
+
+    if args.live:
+        print(f"\n{'RESUME':>6} | {'FULL':>8} | {'LOCAL+LLM':>9}")
+        for i, (resume, row) in enumerate(zip(resumes, rows)):
+            full_seconds = timed_completion(route_messages(resume))
+            local_seconds = latencies[i] / 1000 + (timed_completion(row["messages"]) if row["messages"] else 0.0)
+            print(f"{i:>6} | {full_seconds:>7.2f}s | {local_seconds:>8.2f}s")
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,117 @@
+import os
+import re
+import sys
+import time
+import random
+import argparse
+from latex_extract import extract_bullets, extract_many
+from corpus import CORPUS_PATH, iter_records
+
+# Throughput of latex_extract against the regex + clean_bullet extraction script.py used before,
+# over .tex files shaped like the scraped ones (Jake's-resume preamble, \resumeItem lists,
+# \textbf / \href inside bullets).
+# Usage:
+#   python bench_extract.py                        (2000 synthetic files built from corpus bullets)
+#   python bench_extract.py --files 20000 --workers 4
+#   python bench_extract.py path/to/tex/dir a.tex  (your own files)
+
+PREAMBLE = r"""\documentclass[letterpaper,11pt]{article}
+\usepackage[hidelinks]{hyperref}
+\newcommand{\resumeItem}[1]{
+  \item\small{
+    {#1 \vspace{-2pt}}
+  }
+}
+\newcommand{\resumeSubheading}[4]{
+  \vspace{-2pt}\item
+    \begin{tabular*}{0.97\textwidth}[t]{l@{\extracolsep{\fill}}r}
+      \textbf{#1} & #2 \\
+      \textit{\small#3} & \textit{\small #4} \\
+    \end{tabular*}\vspace{-7pt}
+}
+\newcommand{\resumeItemListStart}{\begin{itemize}}
+\newcommand{\resumeItemListEnd}{\end{itemize}\vspace{-5pt}}
+\begin{document}
+\section{Experience}
+"""
+
+NUMBER_RE = re.compile(r"\d[\d.,]*(?:\\%|\+|[KMB])?")
+# Corpus bullets aren't always escaped; a bare % would comment out the rest of the line
+LATEX_SPECIAL_RE = re.compile(r"(?<!\\)([%$&#_])")
+
+# What script.py did before latex_extract
+LEGACY_ITEM_RE = re.compile(r'\\(?:resumeItem|item)\s*\{([^}]{60,})\}', re.DOTALL)
+
+def legacy_extract(raw_text):
+    bullets = []
+    for match in LEGACY_ITEM_RE.findall(raw_text):
+        text = re.sub(r'\s+', ' ', match).strip()
+        text = text.replace('\\\\', '')
+        text = re.sub(r'\\textbf\{([^}]+)\}', r'\1', text)
+        text = re.sub(r'\\textit\{([^}]+)\}', r'\1', text)
+        bullets.append(text)
+    return bullets
+
+def decorate(bullet, rng):
+    # Bold the first number, sometimes link a word, the way real resumes format bullets
+    bullet = LATEX_SPECIAL_RE.sub(r"\\\1", bullet)
+    bullet = NUMBER_RE.sub(lambda m: "\\textbf{" + m.group(0) + "}", bullet, count=1)
+    if rng.random() < 0.3:
+        words = bullet.split(" ")
+        i = rng.randrange(len(words))
+        words[i] = "\\href{https://github.com/example/repo}{\\underline{" + words[i] + "}}"
+        bullet = " ".join(words)
+    return bullet
+
+def synthetic_files(count, seed=0):
+    bullets = [record["text"] for record in iter_records(CORPUS_PATH)]
+    rng = random.Random(seed)
+    files = []
+    for _ in range(count):
+        body = []
+        for _ in range(3):
+            body.append("\\resumeSubheading{Company}{2021 -- 2023}{Software Engineer}{Remote}\n\\resumeItemListStart")
+            for _ in range(4):
+                body.append("  \\resumeItem{" + decorate(rng.choice(bullets), rng) + "}")
+            body.append("\\resumeItemListEnd")
+        files.append(PREAMBLE + "\n".join(body) + "\n\\end{document}\n")
+    return files
+
+def read_files(paths):
+    files = []
+    for path in paths:
+        names = [os.path.join(root, n) for root, _, ns in os.walk(path) for n in ns if n.endswith(".tex")] if os.path.isdir(path) else [path]
+        for name in names:
+            with open(name, 'r', encoding='utf-8', errors='ignore') as f:
+                files.append(f.read())
+    return files
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Benchmark .tex bullet extraction.")
+    arg_parser.add_argument("paths", nargs="*", help=".tex files or directories (default: synthetic files)")
+    arg_parser.add_argument("--files", type=int, default=2000, help="Synthetic files to generate")
+    arg_parser.add_argument("--workers", type=int, default=1, help="Also time extract_many with this many processes")
+    args = arg_parser.parse_args()
+
+    files = read_files(args.paths) if args.paths else synthetic_files(args.files)
+    megabytes = sum(len(f) for f in files) / 1e6
+    print(f"{len(files)} files, {megabytes:.1f} MB\n")
+
+    runs = [
+        ("regex + clean_bullet", lambda: [legacy_extract(f) for f in files]),
+        ("latex_extract", lambda: [extract_bullets(f) for f in files]),
+    ]
+    if args.workers > 1:
+        runs.append((f"extract_many x{args.workers}", lambda: extract_many(files, workers=args.workers)))
+
+    print(f"{'extractor':<24} {'files/sec':>10} {'MB/sec':>8} {'bullets':>9} {'60+ chars':>10}")
+    for name, run in runs:
+        start = time.perf_counter()
+        results = run()
+        elapsed = max(time.perf_counter() - start, 1e-9)
+        found = sum(len(r) for r in results)
+        long_enough = sum(1 for r in results for b in r if len(b) >= 60)
+        print(f"{name:<24} {len(files) / elapsed:>10.0f} {megabytes / elapsed:>8.1f} {found:>9} {long_enough:>10}")
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,107 @@
+import sys
+import time
+import json
+from parser import SYSTEM_PROMPT, MODEL_NAME
+from llm_client import get_llm, run_sync
+from pdf_extract import extract_text
+from section_preparser import preparse, build_focused_messages, llm_fields
+
+# Compares the full-prompt parse against the pre-parsed, focused prompt.
+# Usage:
+#   python bench_preparser.py                 (built-in sample resume, token counts only)
+#   python bench_preparser.py a.pdf b.txt     (your own resumes)
+#   python bench_preparser.py --live a.pdf    (also calls Groq and times both prompts)
+
+SAMPLE_RESUME = """Priya Sharma
+priya.sharma@example.com | +91 98765 43210 | linkedin.com/in/priyasharma | github.com/priyasharma
+Product-minded engineer with 3 years of backend and data platform experience.
+WORK EXPERIENCE
+Software Engineer, Razorpay  Bengaluru  Jul 2022 - Present
+• Built a settlement reconciliation service in Go processing 4M transactions/day, cutting mismatches by 37%.
+• Migrated payout batch jobs from cron to Airflow, reducing failed runs from 12/week to 1/week.
+• Mentored 3 interns on code review and on-call practices.
+Backend Intern, Swiggy  Bengaluru  Jan 2022 - Jun 2022
+• Helped with the order-tracking API and worked on caching.
+PROJECTS
+ResumeRAG | Python, Pinecone, Next.js
+• Retrieval-augmented resume editor serving 1,200 users with p95 latency under 800ms.
+EDUCATION
+IIT Delhi  B.Tech, Computer Science  2018 - 2022  CGPA: 8.7
+TECHNICAL SKILLS
+Languages: Go, Python, TypeScript, SQL
+Tools: Kafka, Airflow, Docker, Kubernetes, PostgreSQL
+ACHIEVEMENTS
+• Winner, Smart India Hackathon 2021 (1st of 400 teams).
+• AWS Certified Solutions Architect - Associate.
+POSITIONS OF RESPONSIBILITY
+Tech Lead, Coding Club IIT Delhi  2020 - 2021
+Organised 6 workshops for 300+ students.
+"""
+
+def estimate_tokens(text):
+    # ~4 characters per token for English text on Llama tokenizers; good enough for comparisons
+    return max(1, len(text) // 4)
+
+def message_tokens(messages):
+    return sum(estimate_tokens(m["content"]) for m in messages)
+
+def load_text(path):
+    if path.lower().endswith(".pdf"):
+        with open(path, "rb") as f:
+            return extract_text(f.read())
+    with open(path, "r", encoding="utf-8") as f:
+        return f.read()
+
+def timed_completion(messages):
+    start = time.perf_counter()
+    completion = run_sync(get_llm().chat(messages, model=MODEL_NAME, temperature=0))
+    return time.perf_counter() - start, completion.prompt_tokens
+
+def bench_one(name, text, live=False):
+    full_messages = [
+        {"role": "system", "content": SYSTEM_PROMPT},
+        {"role": "user", "content": f"Resume Text:\n{text}"},
+    ]
+
+    start = time.perf_counter()
+    pre = preparse(text)
+    focused_messages = build_focused_messages(pre)
+    preparse_ms = (time.perf_counter() - start) * 1000
+
+    row = {
+        "name": name,
+        "sections": sorted(pre["sections"]),
+        "llm_sections": llm_fields(pre),
+        "local_fields": sorted(pre["profile"]) + sorted(pre["fields"]),
+        "full_tokens": message_tokens(full_messages),
+        "focused_tokens": message_tokens(focused_messages),
+        "preparse_ms": round(preparse_ms, 3),
+    }
+
+    if live:
+        row["full_seconds"], row["full_prompt_tokens"] = timed_completion(full_messages)
+        row["focused_seconds"], row["focused_prompt_tokens"] = timed_completion(focused_messages)
+
+    return row
+
+def main():
+    args = sys.argv[1:]
+    live = "--live" in args
+    paths = [a for a in args if a != "--live"]
+
+    inputs = [(p, load_text(p)) for p in paths] or [("sample", SAMPLE_RESUME)]
+    rows = [bench_one(name, text, live=live) for name, text in inputs]
+
+    print(f"{'RESUME':<24} | {'FULL TOK':>8} | {'FOCUSED':>8} | {'SAVED':>6} | {'PREPARSE':>9}")
+    print("-" * 67)
+    for r in rows:
+        saved = 1 - r["focused_tokens"] / r["full_tokens"]
+        print(f"{r['name'][:24]:<24} | {r['full_tokens']:>8} | {r['focused_tokens']:>8} | {saved:>6.0%} | {r['preparse_ms']:>7.2f}ms")
+        if live:
+            print(f"{'':<24} | {r['full_seconds']:>7.2f}s | {r['focused_seconds']:>7.2f}s | (wall time, {r['full_prompt_tokens']} -> {r['focused_prompt_tokens']} prompt tokens)")
+
+    print("\nDetails:")
+    print(json.dumps(rows, indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+import re
+import sys
+import time
+import argparse
+from quality import score_bullets, QUALITY_MIN_SCORE
+from corpus import CORPUS_PATH, iter_records
+
+# Batch quality scoring (quality.py) against the per-bullet checks it replaces, over the corpus
+# repeated up to --bullets bullets.
+# Usage:
+#   python bench_quality.py                      (1,000,000 bullets)
+#   python bench_quality.py --bullets 200000 other.jsonl
+
+def legacy_gate(texts):
+    # script.is_high_quality + clean.py's truncation check, one bullet at a time
+    keep = []
+    for text in texts:
+        ok = len(text) >= 60 and re.search(r'(\d+%|\$\d+|\d+)', text) is not None
+        ok = ok and not (text.endswith(' ') or text.count('{') > text.count('}'))
+        keep.append(ok)
+    return keep
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Benchmark batch bullet quality scoring.")
+    arg_parser.add_argument("corpus", nargs="?", default=CORPUS_PATH)
+    arg_parser.add_argument("--bullets", type=int, default=1_000_000)
+    args = arg_parser.parse_args()
+
+    base = [record["text"] for record in iter_records(args.corpus)]
+    texts = (base * (args.bullets // len(base) + 1))[:args.bullets]
+    print(f"{len(texts)} bullets ({len(base)} distinct)\n")
+
+    start = time.perf_counter()
+    legacy = legacy_gate(texts)
+    legacy_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    features = score_bullets(texts)
+    batch_seconds = time.perf_counter() - start
+
+    print(f"{'scorer':<32} {'seconds':>8} {'bullets/sec':>12} {'passing':>9}")
+    print(f"{'is_high_quality + clean check':<32} {legacy_seconds:>8.2f} {len(texts) / legacy_seconds:>12.0f} {sum(legacy):>9}")
+    print(f"{'score_bullets (12 features)':<32} {batch_seconds:>8.2f} {len(texts) / batch_seconds:>12.0f} "
+          f"{int((features['score'] >= QUALITY_MIN_SCORE).sum()):>9}")
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,104 @@
+import sys
+import time
+import json
+import argparse
+import rag_search
+from bm25 import get_bm25_index
+
+# Relevance and latency of rag_search per retrieval mode.
+# Each judged query lists terms a relevant bullet must contain; precision@k is the share of
+# returned bullets that mention at least one of them.
+# Usage:
+#   python bench_rag.py                         (all modes, top 5)
+#   EMBEDDER=fake VECTOR_BACKEND=local python bench_rag.py --modes lexical hybrid
+#   python bench_rag.py --queries judged.json   ([{"query": ..., "terms": [...]}, ...])
+
+JUDGED_QUERIES = [
+    {"query": "Jira", "terms": ["jira"]},
+    {"query": "Terraform", "terms": ["terraform"]},
+    {"query": "Docker Jenkins", "terms": ["docker", "jenkins"]},
+    {"query": "TensorFlow", "terms": ["tensorflow"]},
+    {"query": "Verilog FPGA", "terms": ["verilog", "fpga"]},
+    {"query": "GDPR HIPAA", "terms": ["gdpr", "hipaa"]},
+    {"query": "Grafana Prometheus", "terms": ["grafana", "prometheus"]},
+    {"query": "automated CI/CD deployment pipelines", "terms": ["ci/cd", "jenkins", "deploy", "pipeline"]},
+    {"query": "product roadmap and customer retention", "terms": ["roadmap", "retention"]},
+    {"query": "disaster recovery objectives for backups", "terms": ["rpo", "rto", "recovery", "backup"]},
+    {"query": "security vulnerability scanning", "terms": ["owasp", "vulnerab", "security", "zap"]},
+    {"query": "marketing campaign engagement on social media", "terms": ["campaign", "engagement", "social"]},
+]
+
+class CountingEmbedder:
+    # Pass-through wrapper so the report can show how many queries reached the embedder
+    def __init__(self, embedder):
+        self.embedder = embedder
+        self.calls = 0
+        self.texts = 0
+
+    def embed(self, texts):
+        texts = list(texts)
+        self.calls += 1
+        self.texts += len(texts)
+        return self.embedder.embed(texts)
+
+def precision(matches, terms):
+    if not matches:
+        return 0.0
+    hits = sum(1 for m in matches if any(t in m["text"].lower() for t in terms))
+    return hits / len(matches)
+
+def percentile(samples, p):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(p / 100 * (len(ordered) - 1))))]
+
+def run_mode(mode, judged, top_k, repeats):
+    counter = CountingEmbedder(rag_search.query_embedder)
+    rag_search.query_embedder = counter
+    try:
+        latencies, scores = [], []
+        for _ in range(repeats):
+            for case in judged:
+                start = time.perf_counter()
+                matches = rag_search.search_many([case["query"]], top_k=top_k, mode=mode)[0]
+                latencies.append(time.perf_counter() - start)
+                scores.append(precision(matches, [t.lower() for t in case["terms"]]))
+    finally:
+        rag_search.query_embedder = counter.embedder
+
+    return {
+        "mode": mode,
+        f"precision@{top_k}": round(sum(scores) / len(scores), 3),
+        "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 2),
+        "embedded_queries": counter.texts,
+    }
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Benchmark rag_search relevance and latency per retrieval mode.")
+    arg_parser.add_argument("--modes", nargs="+", default=["vector", "lexical", "hybrid", "auto"], choices=rag_search.SEARCH_MODES)
+    arg_parser.add_argument("--top-k", type=int, default=5)
+    arg_parser.add_argument("--repeats", type=int, default=3, help="Passes over the query set (later passes hit warm caches)")
+    arg_parser.add_argument("--queries", help="JSON file of {\"query\", \"terms\"} judgments")
+    args = arg_parser.parse_args()
+
+    judged = JUDGED_QUERIES
+    if args.queries:
+        with open(args.queries, 'r', encoding='utf-8') as f:
+            judged = json.load(f)
+
+    index = get_bm25_index()
+    keyword_like = sum(1 for case in judged if index.is_keyword_query(case["query"]))
+    print(f"{len(judged)} judged queries, {keyword_like} keyword-like; BM25 index: {len(index)} bullets, {len(index.postings)} terms")
+    print(f"Vector backend: {rag_search.VECTOR_BACKEND}\n")
+
+    print(f"{'mode':<8} {'precision@' + str(args.top_k):>12} {'p50 ms':>9} {'p95 ms':>9} {'embedded':>9}")
+    for mode in args.modes:
+        try:
+            row = run_mode(mode, judged, args.top_k, args.repeats)
+        except Exception as e:
+            print(f"{mode:<8} failed: {e}")
+            continue
+        print(f"{row['mode']:<8} {row[f'precision@{args.top_k}']:>12.3f} {row['p50_ms']:>9.2f} {row['p95_ms']:>9.2f} {row['embedded_queries']:>9}")
+
+if __name__ == "__main__":
+    sys.exit(main())
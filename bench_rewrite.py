@@ -0,0 +1,64 @@
+import sys
+import time
+import random
+import argparse
+from humanizer import humanize_bullets, TECH_REPLACEMENTS
+from humanizerPM import humanize_and_indianize_many, INDIAN_CONTEXT
+from apply_quality_filters import process_bullets
+from removeBIGnumbers import batch_process_resumes
+from corpus import CORPUS_PATH, iter_records
+
+# Per-bullet cost of every rewriter over the whole corpus (real + synthetic bullets of every domain).
+# Usage:
+#   python bench_rewrite.py                  (the corpus, 20 passes)
+#   python bench_rewrite.py --repeat 200 other.jsonl
+
+def load_bullets(path):
+    return [record["text"] for record in iter_records(path)]
+
+def per_rule_replace(mapping):
+    # What the rewriters did before: one full scan of the bullet per dictionary entry
+    def apply(texts, rng=None):
+        out = []
+        for text in texts:
+            for generic, specific in mapping.items():
+                text = text.replace(generic, specific)
+            out.append(text)
+        return out
+    return apply
+
+def time_transform(transform, bullets, repeat):
+    rng = random.Random(0)
+    start = time.perf_counter()
+    for _ in range(repeat):
+        transform(bullets, rng)
+    return time.perf_counter() - start
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Microbenchmark the bullet rewriters.")
+    arg_parser.add_argument("corpus", nargs="?", default=CORPUS_PATH)
+    arg_parser.add_argument("--repeat", type=int, default=20, help="Passes over the corpus per transform")
+    args = arg_parser.parse_args()
+
+    bullets = load_bullets(args.corpus)
+    total = len(bullets) * args.repeat
+    print(f"{len(bullets)} bullets x {args.repeat} passes\n")
+
+    transforms = [
+        ("humanize_bullet", humanize_bullets),
+        ("humanize_and_indianize", humanize_and_indianize_many),
+        ("process_bullet", process_bullets),
+        ("batch_process_resumes", batch_process_resumes),
+        ("tech table, single pass", lambda texts, rng: [TECH_REPLACEMENTS(t) for t in texts]),
+        ("tech table, per rule", per_rule_replace(TECH_REPLACEMENTS.mapping)),
+        ("PM table, single pass", lambda texts, rng: [INDIAN_CONTEXT(t) for t in texts]),
+        ("PM table, per rule", per_rule_replace(INDIAN_CONTEXT.mapping)),
+    ]
+
+    print(f"{'transform':<26} {'us/bullet':>10} {'bullets/sec':>12}")
+    for name, transform in transforms:
+        elapsed = max(time_transform(transform, bullets, args.repeat), 1e-9)
+        print(f"{name:<26} {elapsed / total * 1e6:>10.2f} {total / elapsed:>12.0f}")
+
+if __name__ == "__main__":
+    sys.exit(main())
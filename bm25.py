@@ -0,0 +1,151 @@
+import os
+import re
+import json
+import math
+import threading
+import numpy as np
+from corpus import CORPUS_PATH, iter_records, source_path
+
+# Lexical side of rag_search: an in-memory BM25 inverted index over the bullets in
+# the corpus (corpus.py). Exact tool names ("Jira", "Terraform", "CI/CD") rank poorly with
+# dense embeddings alone, so rag_search fuses these scores with the vector results (RRF)
+# and answers short keyword-like queries from this index alone, without an embedding call.
+
+DEFAULT_CORPUS = CORPUS_PATH
+
+BM25_K1 = 1.5
+BM25_B = 0.75
+KEYWORD_MAX_TERMS = int(os.getenv("KEYWORD_MAX_TERMS", "3"))
+RRF_K = 60
+
+# Keeps "c++", "c#", "node.js" and "scikit-learn" pieces intact; "\%" and other LaTeX escapes drop out
+TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#]*(?:\.[a-z0-9]+)*")
+
+STOPWORDS = frozenset("""
+a an and are as at be by for from in into is it of on or over the to via while with
+""".split())
+
+def tokenize(text):
+    return [t for t in TOKEN_RE.findall(text.lower()) if t not in STOPWORDS]
+
+def load_items(path=CORPUS_PATH):
+    # Same bullets, with the same (domain, type, text) de-duplication, as vector_db.diff_points
+    items, seen = [], set()
+    for record in iter_records(path):
+        key = (record["domain"], record["source"], record["text"])
+        if key in seen:
+            continue
+        seen.add(key)
+        items.append({"text": record["text"], "domain": record["domain"], "type": record["source"]})
+    return items
+
+class BM25Index:
+    def __init__(self, items, k1=BM25_K1, b=BM25_B):
+        self.items = items
+        self.k1 = k1
+        self.b = b
+
+        postings = {}
+        doc_lengths = np.zeros(len(items), dtype=np.float32)
+        for doc_id, item in enumerate(items):
+            tokens = tokenize(item["text"])
+            doc_lengths[doc_id] = len(tokens)
+            counts = {}
+            for token in tokens:
+                counts[token] = counts.get(token, 0) + 1
+            for token, tf in counts.items():
+                postings.setdefault(token, []).append((doc_id, tf))
+
+        # term -> (doc ids, precomputed BM25 term weight per doc), so a query is a few scatter-adds
+        avg_len = float(doc_lengths.mean()) if len(items) else 0.0
+        norm = k1 * (1 - b + b * doc_lengths / (avg_len or 1.0))
+        self.postings = {}
+        for token, entries in postings.items():
+            doc_ids = np.fromiter((d for d, _ in entries), dtype=np.int32, count=len(entries))
+            tfs = np.fromiter((tf for _, tf in entries), dtype=np.float32, count=len(entries))
+            idf = math.log(1 + (len(items) - len(entries) + 0.5) / (len(entries) + 0.5))
+            weights = idf * tfs * (k1 + 1) / (tfs + norm[doc_ids])
+            self.postings[token] = (doc_ids, weights.astype(np.float32))
+
+        self.domains = sorted({item["domain"] for item in items})
+        self.types = sorted({item["type"] for item in items})
+        self.domain_codes = np.array([self.domains.index(i["domain"]) for i in items], dtype=np.int16)
+        self.type_codes = np.array([self.types.index(i["type"]) for i in items], dtype=np.int16)
+
+    def __len__(self):
+        return len(self.items)
+
+    def is_keyword_query(self, query):
+        # Short queries made only of indexed terms ("Jira", "Docker Kubernetes") need no embedding
+        tokens = tokenize(query)
+        return 0 < len(tokens) <= KEYWORD_MAX_TERMS and all(t in self.postings for t in tokens)
+
+    def _mask(self, domain=None, bullet_type=None):
+        mask = np.ones(len(self.items), dtype=bool)
+        if domain is not None:
+            mask &= self.domain_codes == (self.domains.index(domain) if domain in self.domains else -1)
+        if bullet_type is not None:
+            mask &= self.type_codes == (self.types.index(bullet_type) if bullet_type in self.types else -1)
+        return mask
+
+    def search(self, query, top_k=5, domain=None, bullet_type=None):
+        scores = np.zeros(len(self.items), dtype=np.float32)
+        for token in set(tokenize(query)):
+            entry = self.postings.get(token)
+            if entry is not None:
+                np.add.at(scores, entry[0], entry[1])
+
+        scores[~self._mask(domain, bullet_type)] = 0
+        hits = np.flatnonzero(scores > 0)
+        if not len(hits):
+            return []
+
+        k = min(top_k, len(hits))
+        top = hits[np.argpartition(-scores[hits], k - 1)[:k]]
+        top = top[np.argsort(-scores[top], kind="stable")]
+
+        return [{
+            "text": self.items[i]["text"],
+            "score": float(scores[i]),
+            "domain": self.items[i]["domain"]
+        } for i in top]
+
+def rrf_fuse(result_lists, top_k=5, k=RRF_K):
+    # Reciprocal rank fusion: score = sum of 1 / (k + rank) over every list a bullet appears in.
+    # Rank-based, so BM25 and cosine scores never need to be put on the same scale.
+    fused = {}
+    for matches in result_lists:
+        for rank, match in enumerate(matches, start=1):
+            key = (match.get("domain"), match.get("text"))
+            if key not in fused:
+                fused[key] = {"text": match.get("text", ""), "score": 0.0, "domain": match.get("domain", "general")}
+            fused[key]["score"] += 1.0 / (k + rank)
+    return sorted(fused.values(), key=lambda m: -m["score"])[:top_k]
+
+_indexes = {}
+_indexes_lock = threading.Lock()
+
+def corpus_version(path=DEFAULT_CORPUS):
+    # Changes whenever get_bm25_index would rebuild, so callers can key cached rankings on it;
+    # None when there is no corpus file (a deployment that only searches Pinecone)
+    try:
+        return os.path.getmtime(source_path(path))
+    except FileNotFoundError:
+        return None
+
+def get_bm25_index(path=DEFAULT_CORPUS):
+    # One index per corpus file per process, rebuilt when the file changes on disk; empty without one
+    mtime = corpus_version(path)
+    with _indexes_lock:
+        cached = _indexes.get(path)
+        if cached is None or cached[0] != mtime:
+            cached = (mtime, BM25Index(load_items(path) if mtime is not None else []))
+            _indexes[path] = cached
+        return cached[1]
+
+if __name__ == "__main__":
+    import sys
+    if len(sys.argv) < 2:
+        print(json.dumps({"error": "No query provided"}))
+    else:
+        print(json.dumps(get_bm25_index().search(sys.argv[1])))
@@ -0,0 +1,156 @@
+import re
+import sys
+import json
+from quality import score_bullets, MIN_LENGTH, MAX_LENGTH, WEAK_PHRASES
+from jsonl_worker import serve
+
+# Local first pass for /api/analyze. The rules the analyze prompt spells out ("no metrics",
+# "weak action verbs") are applied to the parser's ResumeData with quality.py's features, and the
+# clear-cut bullets get their finding here in the same {"intro", "critical", "warning", "niceToHave"}
+# shape the LLM returns. Only the borderline bullets go to the LLM, with a prompt that lists just those.
+#   no digits at all                          -> critical
+#   opens with a weak verb or phrase ("helped", "worked on") -> warning
+#   metric, strong verb, nothing vague        -> no finding (niceToHave if it runs past MAX_LENGTH)
+#   anything else (a bare number, no clear verb, vague words, a weak phrase mid-sentence) -> borderline, for the LLM
+# Usage:
+#   python bullet_analyzer.py resume.json     (ResumeData from parser.py; prints the analysis and LLM messages)
+#   python bullet_analyzer.py --serve         (JSON-lines worker for the analyze route)
+
+SEVERITIES = ["critical", "warning", "niceToHave"]
+BORDERLINE = "borderline"
+
+# Only the action verb counts: "a cache that helped cut latency by 40%" leads with a strong verb
+WEAK_OPENING_RE = re.compile(r"^[^A-Za-z]*(" + "|".join(re.escape(p) for p in WEAK_PHRASES) + r")\b", re.IGNORECASE)
+
+ANALYZE_PROMPT = """You are a Senior Resume Reviewer. Each bullet below was left for you by an automatic check:
+it has numbers but no clear result, no clear action verb, vague wording, or a weak phrase ("helped",
+"worked on") after its opening verb. Decide what each one needs.
+
+OUTPUT FORMAT - You MUST output exactly this JSON (no markdown):
+{
+    "critical": [{"experienceIndex": 0, "bulletIndex": 0, "question": "...", "issue": "..."}],
+    "warning": [],
+    "niceToHave": []
+}
+
+CRITICAL: no real impact, just lists responsibilities. WARNING: has numbers but not the result they measure,
+missing the "how", vague wording. NICE-TO-HAVE: already good, minor wording or context.
+
+RULES:
+1. Use each bullet's experienceIndex and bulletIndex exactly as given; at most one entry per bullet
+2. Leave a bullet out if it needs nothing
+3. QUESTIONS are full sentences under 25 words asking for specific metrics, methods, or outcomes
+4. ISSUES are complete sentences (10-15 words) explaining what's wrong
+
+Output ONLY valid JSON, no additional text."""
+
+def resume_bullets(resume_data):
+    # [(experienceIndex, bulletIndex, role, text)] for every non-empty experience bullet
+    bullets = []
+    for e, experience in enumerate((resume_data or {}).get("experience") or []):
+        for b, text in enumerate(experience.get("bullets") or []):
+            if isinstance(text, str) and text.strip():
+                bullets.append((e, b, experience.get("role", ""), text.strip()))
+    return bullets
+
+def _finding(e, b, question, issue):
+    return {"experienceIndex": e, "bulletIndex": b, "question": question, "issue": issue}
+
+def _classify(text, f, i):
+    # -> (severity, question, issue); severity is None for a bullet that needs nothing, BORDERLINE for the LLM
+    weak = WEAK_OPENING_RE.match(text)
+    if f["numbers"][i] == 0:
+        if weak:
+            return ("critical", "What measurable result came from this work, such as a percentage, amount, or count?",
+                    f"This bullet has no numbers and leans on the weak phrase '{weak.group(1).lower()}'.")
+        return ("critical", "What measurable result came from this work, such as a percentage, amount, or count?",
+                "This bullet lacks any quantifiable results or numbers.")
+    if weak:
+        return ("warning", "What exactly did you do yourself, and what changed because of it?",
+                f"The action verb '{weak.group(1).lower()}' is weak and hides your own contribution.")
+    if f["weak_phrases"][i] > 0:
+        return BORDERLINE, None, None  # a weak phrase mid-sentence may or may not weaken the bullet
+    if f["metrics"][i] > 0 and f["strong_start"][i] and f["vague"][i] == 0 and f["length"][i] >= MIN_LENGTH:
+        if f["length"][i] > MAX_LENGTH:
+            return ("niceToHave", "Which single result matters most here, so the bullet fits on one line?",
+                    "Already strong, but it runs long and could be tightened to one line.")
+        return None, None, None
+    return BORDERLINE, None, None
+
+def analyze(resume_data):
+    """Local findings for the clear-cut bullets, plus the borderline ones left for the LLM."""
+    bullets = resume_bullets(resume_data)
+    features = score_bullets([text for _, _, _, text in bullets])
+    analysis = {"intro": "", **{severity: [] for severity in SEVERITIES}}
+    borderline = []
+    for i, (e, b, role, text) in enumerate(bullets):
+        severity, question, issue = _classify(text, features, i)
+        if severity == BORDERLINE:
+            borderline.append({"experienceIndex": e, "bulletIndex": b, "role": role, "text": text})
+        elif severity is not None:
+            analysis[severity].append(_finding(e, b, question, issue))
+
+    found = sum(len(analysis[s]) for s in SEVERITIES)
+    count = f"{len(bullets)} bullet" + ("s" if len(bullets) != 1 else "")
+    if not bullets:
+        analysis["intro"] = "I couldn't find any experience bullets to review yet."
+    elif found or borderline:
+        analysis["intro"] = f"I reviewed your {count}; let's fix the weakest first."
+    else:
+        analysis["intro"] = f"Reviewed {count}: each leads with a strong verb and a metric."
+    analysis[BORDERLINE] = borderline
+    return analysis
+
+def build_messages(analysis):
+    # Chat messages asking the LLM about the borderline bullets only, or None when there are none
+    if not analysis[BORDERLINE]:
+        return None
+    return [
+        {"role": "system", "content": ANALYZE_PROMPT},
+        {"role": "user", "content": f"Bullets: {json.dumps(analysis[BORDERLINE], ensure_ascii=False)}"},
+    ]
+
+def parse_llm_json(text):
+    # Same clean-up the chat UI applied to the raw analyze stream: code fences and trailing commas
+    text = re.sub(r"```json\n?|\n?```", "", text or "").strip()
+    text = re.sub(r",\s*([}\]])", r"\1", text)
+    try:
+        result = json.loads(text)
+    except ValueError:
+        return {}
+    return result if isinstance(result, dict) else {}
+
+def merge(analysis, llm_text):
+    """The analysis with the LLM's findings for the borderline bullets added; anything else it returns is dropped."""
+    asked = {(item["experienceIndex"], item["bulletIndex"]) for item in analysis.get(BORDERLINE, [])}
+    llm = parse_llm_json(llm_text)
+    merged = {"intro": analysis["intro"], **{severity: list(analysis[severity]) for severity in SEVERITIES}}
+    for severity in SEVERITIES:
+        for item in llm.get(severity) or []:
+            if not isinstance(item, dict):
+                continue
+            key = (item.get("experienceIndex"), item.get("bulletIndex"))
+            if key in asked and item.get("question") and item.get("issue"):
+                asked.discard(key)
+                merged[severity].append(_finding(key[0], key[1], item["question"], item["issue"]))
+        merged[severity].sort(key=lambda item: (item["experienceIndex"], item["bulletIndex"]))
+    return merged
+
+def handle_request(request):
+    # --serve mode:
+    #   {"id": ..., "resumeData": {...}}                  -> {"analysis": {...}, "messages": [...] or null}
+    #   {"id": ..., "op": "merge", "analysis": {...}, "llm": "<LLM output>"} -> {"analysis": {...}}
+    if request.get("op") == "merge":
+        return {"analysis": merge(request["analysis"], request.get("llm", ""))}
+
+    analysis = analyze(request.get("resumeData"))
+    return {"analysis": analysis, "messages": build_messages(analysis)}
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print(json.dumps({"error": "No ResumeData file provided"}))
+    elif sys.argv[1] == "--serve":
+        serve(handle_request)
+    else:
+        with open(sys.argv[1], "r", encoding="utf-8") as f:
+            print(json.dumps(handle_request({"resumeData": json.load(f)}), indent=2, ensure_ascii=False))
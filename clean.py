@@ -1,5 +1,9 @@
-import json
 import re
+from itertools import islice
+from corpus import RAW_CORPUS, CLEAN_CORPUS, iter_records, make_record, write_records
+from quality import QUALITY_MIN_SCORE, DuplicateIndex, score_bullets
+
+BATCH_SIZE = 50000  # records scored per quality.score_bullets call
 
 def clean_latex_string(text):
     if not text:
@@ -19,32 +23,40 @@ def clean_latex_string(text):
     
     return text
 
-def audit_dataset(file_path):
-    with open(file_path, 'r', encoding='utf-8') as f:
-        data = json.load(f)
-    
-    cleaned_data = {}
-    broken_lines = []
-
-    for category, lines in data.items():
-        cleaned_data[category] = []
-        for line in lines:
-            # Check for truncation (lines ending in specific ways)
-            if line.endswith(' ') or line.count('{') > line.count('}'):
-                broken_lines.append({"category": category, "text": line})
+def audit_dataset(file_path, broken_lines, min_score=0, rejected=None):
+    # Streams cleaned records; truncated ones are collected in broken_lines instead.
+    # Records are scored in batches (quality.py); below min_score they go to rejected, if given.
+    # The batches share one DuplicateIndex, so a repeat of any earlier record counts as a duplicate.
+    records = iter_records(file_path)
+    seen = DuplicateIndex()
+    while True:
+        batch = list(islice(records, BATCH_SIZE))
+        if not batch:
+            return
+        features = score_bullets((record["text"] for record in batch), seen=seen)
+        # Check for truncation (trailing space or an unclosed "{")
+        truncated, score = features["truncated"], features["score"]
+        for i, record in enumerate(batch):
+            line = record["text"]
+            if truncated[i]:
+                broken_lines.append({"category": record["domain"], "text": line})
                 continue
-            
-            cleaned_data[category].append(clean_latex_string(line))
-            
-    return cleaned_data, broken_lines
+            if score[i] < min_score:
+                if rejected is not None:
+                    rejected.append({"category": record["domain"], "text": line, "score": float(score[i])})
+                continue
+
+            yield make_record(record["domain"], clean_latex_string(line), record["source"])
 
-# EXECUTION
-data_file = 'resume_bullets.json' # Your raw JSON
-cleaned, broken = audit_dataset(data_file)
+if __name__ == "__main__":
+    # EXECUTION
+    data_file = RAW_CORPUS # Your raw bullets (falls back to resume_bullets.json)
+    broken = []
+    rejected = []
 
-print(f"Cleaned {sum(len(v) for v in cleaned.values())} lines.")
-print(f"Found {len(broken)} broken/truncated lines.")
+    # Save the clean version
+    count = write_records(audit_dataset(data_file, broken, QUALITY_MIN_SCORE, rejected), CLEAN_CORPUS)
 
-# Save the clean version
-with open('cleaned_resumes.json', 'w') as f:
-    json.dump(cleaned, f, indent=2)
\ No newline at end of file
+    print(f"Cleaned {count} lines.")
+    print(f"Found {len(broken)} broken/truncated lines.")
+    print(f"Dropped {len(rejected)} lines scoring below {QUALITY_MIN_SCORE:g} (QUALITY_MIN_SCORE).")
@@ -0,0 +1,155 @@
+import os
+import sys
+import json
+import hashlib
+import argparse
+
+# JSON-lines storage for the bullet corpus: one record per bullet,
+#   {"domain": "IT", "source": "real" | "synthetic", "text": "...", "hash": "...", "stages": ["humanize", ...]}
+# Readers stream records one line at a time and writers append or stream to a temp file that
+# replaces the original when done, so memory stays flat however large the corpus grows.
+# The old nested JSON documents (augmented_resumes.json etc.) are still readable: when a .jsonl
+# file doesn't exist yet, readers fall back to the .json file of the same name.
+# Usage:
+#   python corpus.py convert      (write .jsonl next to every legacy .json corpus)
+#   python corpus.py stats [file]
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+RAW_CORPUS = os.path.join(script_dir, "resume_bullets.jsonl")       # scraped by script.py
+CLEAN_CORPUS = os.path.join(script_dir, "cleaned_resumes.jsonl")    # clean.py output
+CORPUS_PATH = os.path.join(script_dir, "augmented_resumes.jsonl")   # real + synthetic, used everywhere else
+
+# Stage records kept by pipeline.py before stages moved into the records themselves
+LEGACY_STAGES_PATH = os.path.join(script_dir, ".cache", "pipeline_stages.json")
+
+def bullet_hash(domain, text):
+    return hashlib.sha256(f"{domain}\0{text}".encode("utf-8")).hexdigest()[:32]
+
+def make_record(domain, text, source="real", stages=None):
+    return {"domain": domain, "source": source, "text": text, "hash": bullet_hash(domain, text), "stages": list(stages or [])}
+
+def legacy_path(path):
+    return os.path.splitext(path)[0] + ".json"
+
+def source_path(path):
+    # The file a reader of `path` actually reads: the .jsonl if it exists, else the legacy .json
+    if path.endswith(".jsonl") and not os.path.exists(path) and os.path.exists(legacy_path(path)):
+        return legacy_path(path)
+    return path
+
+def _iter_legacy(path, stages=None):
+    # {"IT": [...]} (scraped/cleaned) or {"IT": {"real": [...], "synthetic": [...]}} (augmented)
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    stages = stages or {}
+    for domain, content in data.items():
+        if isinstance(content, list):
+            content = {"real": content}
+        for source in ("real", "synthetic"):
+            for text in content.get(source, []):
+                yield make_record(domain, text, source, stages.get(bullet_hash(domain, text)))
+
+def iter_records(path=CORPUS_PATH):
+    path = source_path(path)
+    if not os.path.exists(path):
+        return
+    if path.endswith(".json"):
+        yield from _iter_legacy(path)
+        return
+
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if not line.endswith("\n"):
+                break  # torn final line from an interrupted append
+            line = line.strip()
+            if line:
+                yield json.loads(line)
+
+def _drop_torn_line(path, chunk_size=65536):
+    # Cut a partial final line left by an interrupted append (the one iter_records skips), so
+    # new records don't get glued onto it
+    with open(path, 'r+b') as f:
+        end = f.seek(0, os.SEEK_END)
+        pos = end
+        while pos > 0:
+            start = max(0, pos - chunk_size)
+            f.seek(start)
+            newline = f.read(pos - start).rfind(b"\n")
+            if newline >= 0:
+                pos = start + newline + 1
+                break
+            pos = start
+        if pos < end:
+            f.truncate(pos)
+
+def append_records(records, path=CORPUS_PATH):
+    if os.path.exists(path):
+        _drop_torn_line(path)
+    count = 0
+    with open(path, 'a', encoding='utf-8') as f:
+        for record in records:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+            count += 1
+    return count
+
+def write_records(records, path=CORPUS_PATH):
+    # Streams to a temp file and swaps it in, so `records` may be a generator reading `path` itself
+    tmp_path = path + ".tmp"
+    count = 0
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        for record in records:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+            count += 1
+    os.replace(tmp_path, path)
+    return count
+
+def load_nested(path=CORPUS_PATH):
+    # {domain: {"real": [...], "synthetic": [...]}} for code that needs the whole corpus at once
+    data = {}
+    for record in iter_records(path):
+        data.setdefault(record["domain"], {"real": [], "synthetic": []})[record["source"]].append(record["text"])
+    return data
+
+def convert(json_path, jsonl_path=None, stages_path=LEGACY_STAGES_PATH):
+    jsonl_path = jsonl_path or os.path.splitext(json_path)[0] + ".jsonl"
+    stages = {}
+    if stages_path and os.path.exists(stages_path):
+        with open(stages_path, 'r', encoding='utf-8') as f:
+            stages = json.load(f).get("bullets", {})
+    count = write_records(_iter_legacy(json_path, stages), jsonl_path)
+    print(f"{json_path} -> {jsonl_path}: {count} records")
+    return count
+
+def ensure_jsonl(path=CORPUS_PATH):
+    # Writers work on the .jsonl file; the first write converts the legacy .json once
+    if not os.path.exists(path) and os.path.exists(legacy_path(path)):
+        convert(legacy_path(path), path)
+
+def stats(path=CORPUS_PATH):
+    counts = {}
+    for record in iter_records(path):
+        domain = counts.setdefault(record["domain"], {"real": 0, "synthetic": 0})
+        domain[record["source"]] += 1
+    return counts
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="JSON-lines bullet corpus tools.")
+    sub = arg_parser.add_subparsers(dest="command", required=True)
+    convert_parser = sub.add_parser("convert", help="Convert legacy nested JSON corpora to JSON lines")
+    convert_parser.add_argument("files", nargs="*", default=[legacy_path(p) for p in (RAW_CORPUS, CLEAN_CORPUS, CORPUS_PATH)])
+    stats_parser = sub.add_parser("stats", help="Count bullets per domain and source")
+    stats_parser.add_argument("file", nargs="?", default=CORPUS_PATH)
+    args = arg_parser.parse_args()
+
+    if args.command == "convert":
+        for json_path in args.files:
+            if os.path.exists(json_path):
+                convert(json_path)
+            else:
+                print(f"Skipping {json_path}: not found")
+    else:
+        for domain, counts in stats(args.file).items():
+            print(f"{domain}: {counts['real']} Real, {counts['synthetic']} Synthetic")
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,96 @@
+import os
+import math
+import threading
+from bm25 import DEFAULT_CORPUS, corpus_version, tokenize, load_items
+
+# Picks the corpus domain ("IT", "Product", ...) a query or parsed resume belongs to,
+# so rag_search can search a single partition instead of the whole index. Multinomial naive Bayes
+# over the same tokens BM25 uses; below DOMAIN_MIN_CONFIDENCE it returns None and search stays global.
+
+DOMAIN_MIN_CONFIDENCE = float(os.getenv("DOMAIN_MIN_CONFIDENCE", "0.6"))
+
+def domain_namespace(domain):
+    # Pinecone namespace / id prefix for a domain: "Core Electronics" -> "Core-Electronics"
+    return "".join(c if c.isalnum() else "-" for c in domain)
+
+def resume_text(resume):
+    # The parts of a parsed resume (parser.py schema) that say what field someone works in
+    parts = list(resume.get("skills") or [])
+    parts.append((resume.get("profile") or {}).get("summary", ""))
+    for job in resume.get("experience") or []:
+        parts.append(job.get("role", ""))
+        parts.extend(job.get("bullets") or [])
+    for project in resume.get("projects") or []:
+        parts.append(project.get("description", ""))
+        parts.extend(project.get("technologies") or [])
+        parts.extend(project.get("bullets") or [])
+    return "\n".join(p for p in parts if isinstance(p, str))
+
+class DomainRouter:
+    def __init__(self, items, alpha=1.0):
+        counts = {}
+        for item in items:
+            domain_counts = counts.setdefault(item["domain"], {})
+            for token in tokenize(item["text"]):
+                domain_counts[token] = domain_counts.get(token, 0) + 1
+
+        vocab_size = len({t for c in counts.values() for t in c})
+        total_docs = len(items)
+        self.domains = sorted(counts)
+        self.log_prior = {}
+        self.log_likelihood = {}
+        self.log_unseen = {}
+        for domain, domain_counts in counts.items():
+            docs = sum(1 for item in items if item["domain"] == domain)
+            denominator = sum(domain_counts.values()) + alpha * vocab_size
+            self.log_prior[domain] = math.log(docs / total_docs)
+            self.log_likelihood[domain] = {t: math.log((n + alpha) / denominator) for t, n in domain_counts.items()}
+            self.log_unseen[domain] = math.log(alpha / denominator)
+        self.vocab = {t for c in counts.values() for t in c}
+
+    def probabilities(self, text):
+        # Posterior per domain; tokens no domain has seen carry no signal and are skipped
+        tokens = [t for t in tokenize(text) if t in self.vocab]
+        if not tokens or not self.domains:
+            return {}
+        log_post = {
+            d: self.log_prior[d] + sum(self.log_likelihood[d].get(t, self.log_unseen[d]) for t in tokens)
+            for d in self.domains
+        }
+        top = max(log_post.values())
+        weights = {d: math.exp(v - top) for d, v in log_post.items()}
+        total = sum(weights.values())
+        return {d: w / total for d, w in weights.items()}
+
+    def detect(self, text, min_confidence=DOMAIN_MIN_CONFIDENCE):
+        probs = self.probabilities(text)
+        if not probs:
+            return None
+        domain = max(probs, key=probs.get)
+        return domain if probs[domain] >= min_confidence else None
+
+_routers = {}
+_routers_lock = threading.Lock()
+
+def get_domain_router(path=DEFAULT_CORPUS):
+    # One router per corpus file per process, rebuilt when the file changes on disk;
+    # None without a corpus file, which like an unsure detect() means no domain filter
+    mtime = corpus_version(path)
+    if mtime is None:
+        return None
+    with _routers_lock:
+        cached = _routers.get(path)
+        if cached is None or cached[0] != mtime:
+            cached = (mtime, DomainRouter(load_items(path)))
+            _routers[path] = cached
+        return cached[1]
+
+if __name__ == "__main__":
+    import sys
+    import json
+    text = " ".join(sys.argv[1:])
+    router = get_domain_router()
+    if router is None:
+        print(json.dumps({"error": f"No corpus at {DEFAULT_CORPUS}"}))
+    else:
+        print(json.dumps({"domain": router.detect(text), "probabilities": router.probabilities(text)}))
@@ -0,0 +1,146 @@
+import os
+import json
+import hashlib
+import threading
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows: single writer only
+    fcntl = None
+
+# Persistent embedding cache: (model, task_type, title, text) -> float32 vector.
+# Layout under <cache_dir>:
+#   vectors.f32   raw float32 rows, appended, read back through a memory map
+#   index.jsonl   one {"key": ..., "row": n} line per stored vector, appended
+# Both files only ever grow, so a crash can at worst leave an orphan row that is never referenced.
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_CACHE_DIR = os.path.join(script_dir, ".cache", "embeddings")
+
+def cache_key(text, model, task_type, title=None):
+    h = hashlib.sha256()
+    for part in (model, task_type, title or "", text):
+        h.update(part.encode("utf-8"))
+        h.update(b"\0")
+    return h.hexdigest()[:32]
+
+class EmbeddingCache:
+    def __init__(self, dim, cache_dir=DEFAULT_CACHE_DIR):
+        self.dim = dim
+        self.cache_dir = cache_dir
+        self.vectors_path = os.path.join(cache_dir, "vectors.f32")
+        self.index_path = os.path.join(cache_dir, "index.jsonl")
+        self.lock_path = os.path.join(cache_dir, ".lock")
+        self.row_bytes = dim * 4
+        self.rows = {}
+        self.lock = threading.Lock()
+        self._mmap = None
+        self._index_offset = 0
+        os.makedirs(cache_dir, exist_ok=True)
+        self._refresh_index()
+
+    def __len__(self):
+        return len(self.rows)
+
+    def _refresh_index(self):
+        # Picks up rows appended since we last looked (possibly by another process)
+        if not os.path.exists(self.index_path):
+            return
+        with open(self.index_path, "r", encoding="utf-8") as f:
+            f.seek(self._index_offset)
+            for line in f:
+                if not line.endswith("\n"):
+                    break  # partially written by a concurrent writer; read it next time
+                self._index_offset += len(line.encode("utf-8"))
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+                self.rows[entry["key"]] = entry["row"]
+
+    def _matrix(self):
+        num_rows = os.path.getsize(self.vectors_path) // self.row_bytes if os.path.exists(self.vectors_path) else 0
+        if self._mmap is None or self._mmap.shape[0] != num_rows:
+            self._mmap = np.memmap(self.vectors_path, dtype=np.float32, mode="r", shape=(num_rows, self.dim)) if num_rows else None
+        return self._mmap
+
+    def get_many(self, keys):
+        # Returns a list aligned with keys: float32 arrays for hits, None for misses
+        with self.lock:
+            if any(k not in self.rows for k in keys):
+                self._refresh_index()
+            matrix = self._matrix()
+            results = []
+            for k in keys:
+                row = self.rows.get(k)
+                if row is None or matrix is None or row >= matrix.shape[0]:
+                    results.append(None)
+                else:
+                    results.append(np.array(matrix[row]))
+            return results
+
+    def put_many(self, keys, vectors):
+        if not keys:
+            return
+        block = np.asarray(vectors, dtype=np.float32).reshape(len(keys), self.dim)
+
+        with self.lock, open(self.lock_path, "w") as lock_file:
+            if fcntl:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+
+            with open(self.vectors_path, "ab") as f:
+                end = f.tell()
+                if end % self.row_bytes:
+                    # Torn row from a crashed writer: drop it so rows stay aligned
+                    f.truncate(end - end % self.row_bytes)
+                    end -= end % self.row_bytes
+                first_row = end // self.row_bytes
+                f.write(block.tobytes())
+
+            with open(self.index_path, "a", encoding="utf-8") as f:
+                for i, key in enumerate(keys):
+                    f.write(json.dumps({"key": key, "row": first_row + i}) + "\n")
+
+            self._refresh_index()
+
+class CachedEmbedder:
+    # Wraps any embedder with .embed(texts); only cache misses reach the wrapped embedder
+    def __init__(self, embedder, cache):
+        self.embedder = embedder
+        self.cache = cache
+        self.model = embedder.model
+        self.task_type = embedder.task_type
+        self.title = getattr(embedder, "title", None)
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    def embed(self, texts):
+        texts = list(texts)
+        keys = [cache_key(t, self.model, self.task_type, self.title) for t in texts]
+        results = self.cache.get_many(keys)
+
+        missing = [i for i, v in enumerate(results) if v is None]
+        with self.lock:
+            self.hits += len(texts) - len(missing)
+            self.misses += len(missing)
+
+        if missing:
+            fresh = self.embedder.embed([texts[i] for i in missing])
+            self.cache.put_many([keys[i] for i in missing], fresh)
+            for i, vector in zip(missing, fresh):
+                # Same float32 precision as a later cache hit would return
+                results[i] = np.asarray(vector, dtype=np.float32)
+
+        return [list(map(float, v)) for v in results]
+
+_caches = {}
+_caches_lock = threading.Lock()
+
+def get_embedding_cache(dim, cache_dir=DEFAULT_CACHE_DIR):
+    # One cache object per directory per process
+    with _caches_lock:
+        if cache_dir not in _caches:
+            _caches[cache_dir] = EmbeddingCache(dim, cache_dir)
+        return _caches[cache_dir]
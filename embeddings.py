@@ -0,0 +1,74 @@
+import os
+import hashlib
+import random
+import time
+import math
+from embedding_cache import CachedEmbedder, get_embedding_cache
+
+# Embedding backends for vector_db.py / rag_search.py.
+# GeminiEmbedder sends whole lists per request (batchEmbedContents) instead of one call per text.
+# FakeEmbedder returns deterministic pseudo-random unit vectors for offline runs (EMBEDDER=fake).
+# get_embedder wraps either one in the persistent embedding cache unless EMBED_CACHE=0.
+
+EMBED_MODEL = "models/text-embedding-004"
+EMBED_DIM = 768  # Gemini 004 dimension
+EMBED_BATCH_SIZE = int(os.getenv("EMBED_BATCH_SIZE", "100"))  # API maximum per request
+EMBED_CONCURRENCY = int(os.getenv("EMBED_CONCURRENCY", "4"))
+USE_EMBED_CACHE = os.getenv("EMBED_CACHE", "1") != "0"
+
+class GeminiEmbedder:
+    def __init__(self, task_type="retrieval_document", title=None, model=EMBED_MODEL):
+        # Imported and configured here so the fake backend works without the Gemini SDK
+        import google.generativeai as genai
+        if os.getenv("GEMINI_API_KEY"):
+            genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
+        self.genai = genai
+        self.model = model
+        self.task_type = task_type
+        self.title = title  # only allowed for retrieval_document
+
+    def embed(self, texts):
+        kwargs = {"model": self.model, "content": list(texts), "task_type": self.task_type}
+        if self.title and self.task_type == "retrieval_document":
+            kwargs["title"] = self.title
+        result = self.genai.embed_content(**kwargs)
+        return result['embedding']
+
+class FakeEmbedder:
+    def __init__(self, task_type="retrieval_document", title=None, model="fake", dim=EMBED_DIM, latency=0.0):
+        self.model = model
+        self.task_type = task_type
+        self.dim = dim
+        self.latency = latency  # seconds per request, to mimic network round-trips
+
+    def embed(self, texts):
+        if self.latency:
+            time.sleep(self.latency)
+        vectors = []
+        for text in texts:
+            seed = int.from_bytes(hashlib.sha256(text.encode("utf-8")).digest()[:8], "little")
+            rng = random.Random(seed)
+            v = [rng.gauss(0, 1) for _ in range(self.dim)]
+            norm = math.sqrt(sum(x * x for x in v)) or 1.0
+            vectors.append([x / norm for x in v])
+        return vectors
+
+def get_embedder(task_type="retrieval_document", title=None, cached=USE_EMBED_CACHE):
+    if os.getenv("EMBEDDER", "gemini") == "fake":
+        embedder = FakeEmbedder(task_type=task_type, title=title, latency=float(os.getenv("FAKE_EMBED_LATENCY", "0")))
+    else:
+        embedder = GeminiEmbedder(task_type=task_type, title=title)
+
+    if cached:
+        embedder = CachedEmbedder(embedder, get_embedding_cache(EMBED_DIM))
+    return embedder
+
+def batched(items, size):
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
@@ -0,0 +1,191 @@
+import re
+import sys
+import json
+import time
+import base64
+import hashlib
+import argparse
+import threading
+from urllib.parse import urlencode, urlparse, parse_qs
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+# Local stand-in for the two GitHub endpoints script.py uses, so the scraper can be run and
+# timed without a token or quota:
+#   GET /search/code?q=extension:tex "Role" "Company"&per_page=N
+#   GET /repos/fake/resumes/contents/<file>.tex    (base64 content, like the real contents API)
+# Search and core requests have separate rate-limit buckets that report X-RateLimit-* headers
+# and answer 403 once drained; --secondary-every N also throttles every Nth request with Retry-After.
+# Every 200 carries an ETag, and a matching If-None-Match gets a 304 that costs no quota.
+# Usage:
+#   python fake_github.py --port 8765 --search-limit 30 --window 5 --latency 0.05
+#   GITHUB_API_URL=http://127.0.0.1:8765 python script.py
+
+QUERY_TERM_RE = re.compile(r'"([^"]+)"')
+
+# LaTeX source: %, $ and & are escaped, and formatting macros nest inside bullets
+SAMPLE_BULLETS = [
+    "Led migration of {company} {role} services to Kubernetes, cutting deploy time by \\textbf{{{n}\\%}} across 12 teams",
+    "Built a \\textbf{{real-time}} analytics pipeline at {company} processing {n}M events per day with 99.9\\% uptime",
+    "Reduced cloud spend by \\${n}K annually by right-sizing {company} clusters as {role}",
+    "Shipped {n} features as {role} at {company}, growing weekly active users by 18\\% in two quarters",
+    "Short bullet without metrics",
+]
+
+class RateBucket:
+    def __init__(self, limit, window):
+        self.limit = limit
+        self.window = window
+        self.reset_at = time.time() + window
+        self.used = 0
+        self.lock = threading.Lock()
+
+    def take(self):
+        # -> (allowed, remaining, reset epoch seconds)
+        with self.lock:
+            now = time.time()
+            if now >= self.reset_at:
+                self.reset_at = now + self.window
+                self.used = 0
+            allowed = self.used < self.limit
+            if allowed:
+                self.used += 1
+            return allowed, self.limit - self.used, int(self.reset_at) + 1
+
+    def peek(self):
+        with self.lock:
+            if time.time() >= self.reset_at:
+                return True, self.limit, int(time.time() + self.window) + 1
+            return self.used < self.limit, self.limit - self.used, int(self.reset_at) + 1
+
+def tex_file(role, company, index):
+    seed = int(hashlib.sha256(f"{role}\0{company}\0{index}".encode("utf-8")).hexdigest()[:8], 16)
+    lines = ["\\begin{itemize}"]
+    for i, template in enumerate(SAMPLE_BULLETS):
+        bullet = template.format(role=role, company=company.replace("&", "\\&"), n=(seed >> i) % 90 + 10)
+        lines.append("  \\resumeItem{" + bullet + "}")
+    lines.append("\\end{itemize}")
+    return "\n".join(lines) + "\n"
+
+def file_name(role, company, index):
+    slug = re.sub(r"[^a-z0-9]+", "-", f"{role} {company}".lower()).strip("-")
+    return f"{slug}-{index}.tex"
+
+class FakeGitHub(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, like the real API
+    search_bucket = None
+    core_bucket = None
+    latency = 0.0
+    secondary_every = 0
+    counter = 0
+    counter_lock = threading.Lock()
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status, body, headers=None):
+        payload = json.dumps(body).encode("utf-8") if body is not None else b""
+        self.send_response(status)
+        if body is not None:
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(payload)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, str(value))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        params = parse_qs(url.query)
+        is_search = url.path == "/search/code"
+        bucket = self.search_bucket if is_search else self.core_bucket
+
+        with FakeGitHub.counter_lock:
+            FakeGitHub.counter += 1
+            count = FakeGitHub.counter
+        if self.latency:
+            time.sleep(self.latency)
+
+        status, body = self._route(url, params, is_search)
+        etag = '"' + hashlib.sha1(json.dumps(body, sort_keys=True).encode("utf-8")).hexdigest() + '"'
+        if status == 200 and self.headers.get("If-None-Match") == etag:
+            # Like GitHub, a 304 answer to a conditional request doesn't count against the rate limit
+            _, remaining, reset = bucket.peek()
+            return self._send(304, None, {**self._limit_headers(bucket, remaining, reset, is_search), "ETag": etag})
+
+        allowed, remaining, reset = bucket.take()
+        headers = self._limit_headers(bucket, remaining, reset, is_search)
+        if not allowed:
+            return self._send(403, {"message": "API rate limit exceeded"}, headers)
+        if self.secondary_every and count % self.secondary_every == 0:
+            return self._send(403, {"message": "You have exceeded a secondary rate limit."}, {**headers, "Retry-After": 1})
+        if status == 200:
+            headers["ETag"] = etag
+        return self._send(status, body, headers)
+
+    @staticmethod
+    def _limit_headers(bucket, remaining, reset, is_search):
+        return {
+            "X-RateLimit-Limit": bucket.limit,
+            "X-RateLimit-Remaining": max(remaining, 0),
+            "X-RateLimit-Reset": reset,
+            "X-RateLimit-Resource": "search" if is_search else "core",
+        }
+
+    def _route(self, url, params, is_search):
+        if is_search:
+            terms = QUERY_TERM_RE.findall(params.get("q", [""])[0])
+            if len(terms) < 2:
+                return 422, {"message": "Validation Failed"}
+            role, company = terms[0], terms[1]
+            per_page = int(params.get("per_page", ["30"])[0])
+            host = f"http://{self.headers.get('Host')}"
+            items = [{
+                "name": file_name(role, company, i),
+                "path": file_name(role, company, i),
+                "sha": hashlib.sha1(tex_file(role, company, i).encode("utf-8")).hexdigest(),
+                # The slug in the file name is lossy, so the contents URL carries role/company in its query string
+                "url": f"{host}/repos/fake/resumes/contents/{file_name(role, company, i)}?" + urlencode({"role": role, "company": company, "i": i}),
+            } for i in range(per_page)]
+            return 200, {"total_count": len(items), "incomplete_results": False, "items": items}
+
+        if url.path.startswith("/repos/fake/resumes/contents/"):
+            role, company, index = params.get("role", [""])[0], params.get("company", [""])[0], int(params.get("i", ["0"])[0])
+            text = tex_file(role, company, index)
+            encoded = base64.encodebytes(text.encode("utf-8")).decode("ascii")  # wrapped at 76 chars, like GitHub
+            return 200, {
+                "name": url.path.rsplit("/", 1)[-1],
+                "sha": hashlib.sha1(text.encode("utf-8")).hexdigest(),
+                "encoding": "base64",
+                "content": encoded,
+            }
+
+        return 404, {"message": "Not Found"}
+
+def make_server(port=8765, search_limit=30, core_limit=5000, window=60.0, latency=0.0, secondary_every=0):
+    handler = type("Handler", (FakeGitHub,), {
+        "search_bucket": RateBucket(search_limit, window),
+        "core_bucket": RateBucket(core_limit, window),
+        "latency": latency,
+        "secondary_every": secondary_every,
+    })
+    return ThreadingHTTPServer(("127.0.0.1", port), handler)
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Fake GitHub search/contents API for exercising script.py.")
+    arg_parser.add_argument("--port", type=int, default=8765)
+    arg_parser.add_argument("--search-limit", type=int, default=30, help="Search requests per window")
+    arg_parser.add_argument("--core-limit", type=int, default=5000, help="Contents requests per window")
+    arg_parser.add_argument("--window", type=float, default=60.0, help="Rate-limit window in seconds")
+    arg_parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every response")
+    arg_parser.add_argument("--secondary-every", type=int, default=0, help="Throttle every Nth request with Retry-After: 1")
+    args = arg_parser.parse_args()
+
+    server = make_server(args.port, args.search_limit, args.core_limit, args.window, args.latency, args.secondary_every)
+    print(f"Fake GitHub API on http://127.0.0.1:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    sys.exit(main())
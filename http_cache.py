@@ -0,0 +1,52 @@
+import os
+import json
+from parse_cache import ParseCache, content_hash
+
+# On-disk cache for script.py's GitHub traffic, on top of ParseCache's file-per-entry layout:
+#   responses/<sha256(url)>.json   JSON body + ETag / Last-Modified of a GET, replayed when the
+#                                  server answers a conditional request with 304 Not Modified
+#   blobs/<git blob sha>.json      decoded .tex files; a blob sha names its content, so these
+#                                  are served without any request at all
+# Entries unused for HTTP_CACHE_MAX_AGE_DAYS expire, and the least recently used go first once
+# the cache outgrows HTTP_CACHE_MAX_MB.
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_CACHE_DIR = os.path.join(script_dir, ".cache", "http")
+DEFAULT_MAX_BYTES = int(float(os.getenv("HTTP_CACHE_MAX_MB", "500")) * 1024 * 1024)
+DEFAULT_MAX_AGE = float(os.getenv("HTTP_CACHE_MAX_AGE_DAYS", "30")) * 86400
+
+class HTTPCache:
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES, max_age=DEFAULT_MAX_AGE):
+        self.store = ParseCache(cache_dir, max_bytes=max_bytes, max_age=max_age)
+
+    def get_response(self, url):
+        return self.store.get("responses", content_hash(url))
+
+    def put_response(self, url, headers, body):
+        # Only worth keeping when the server gave us something to revalidate with
+        etag, last_modified = headers.get("etag"), headers.get("last-modified")
+        if etag or last_modified:
+            self.store.put("responses", content_hash(url), {"url": url, "etag": etag, "last_modified": last_modified, "body": body})
+
+    def get_blob(self, sha):
+        entry = self.store.get("blobs", sha)
+        return entry["text"] if entry is not None else None
+
+    def put_blob(self, sha, text):
+        self.store.put("blobs", sha, {"text": text})
+
+    def stats(self):
+        return self.store.stats()
+
+def conditional_headers(entry):
+    headers = {}
+    if entry is not None:
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+    return headers
+
+if __name__ == "__main__":
+    # Quick inspection (also applies the age limit): python http_cache.py
+    print(json.dumps(HTTPCache().stats(), indent=2))
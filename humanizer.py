@@ -1,42 +1,33 @@
-import re
-import random
+from rewrite_engine import RewriteEngine, Replacements, PERCENT_RE, PLUS_COUNT_RE, jitter
 
-def humanize_bullet(text):
-    # 1. Jitter Percentages: Change "70%" to something like "72%"
-    def jitter_percent(match):
-        val = int(match.group(1))
-        # Add/subtract a small random amount to avoid "round number" syndrome
-        jittered = val + random.randint(-4, 3) 
-        return f"{jittered}%"
-    
-    text = re.sub(r'(\d+)%', jitter_percent, text)
+# This dictionary maps generic AI words to specific, high-value tech stacks
+TECH_REPLACEMENTS = Replacements({
+    "monitoring tools": "Prometheus and Grafana stack",
+    "CI/CD pipelines": "GitLab CI/CD and Jenkins pipelines",
+    "automated patching solution": "Ansible-driven automated patching workflow",
+    "cloud infrastructure on AWS": "multi-region AWS architecture using Terraform",
+    "Linux servers": "RHEL and Ubuntu instances",
+    "vulnerability assessments": "OWASP ZAP vulnerability scans",
+    "network routing and switching": "BGP routing and Cisco Nexus switching"
+})
 
+ENGINE = RewriteEngine([
+    # 1. Jitter Percentages: Change "70%" to something like "72%" to avoid "round number" syndrome
+    jitter(PERCENT_RE, -4, 3, "{}%"),
     # 2. Jitter Large Numbers: Change "150+" to "164"
-    def jitter_count(match):
-        val = int(match.group(1))
-        jittered = val + random.randint(3, 17)
-        return str(jittered)
-    
-    text = re.sub(r'(\d+)\+', jitter_count, text)
-
+    jitter(PLUS_COUNT_RE, 3, 17, "{}"),
     # 3. Inject Technical Friction/Context
-    # This dictionary maps generic AI words to specific, high-value tech stacks
-    replacements = {
-        "monitoring tools": "Prometheus and Grafana stack",
-        "CI/CD pipelines": "GitLab CI/CD and Jenkins pipelines",
-        "automated patching solution": "Ansible-driven automated patching workflow",
-        "cloud infrastructure on AWS": "multi-region AWS architecture using Terraform",
-        "Linux servers": "RHEL and Ubuntu instances",
-        "vulnerability assessments": "OWASP ZAP vulnerability scans",
-        "network routing and switching": "BGP routing and Cisco Nexus switching"
-    }
-    
-    for generic, specific in replacements.items():
-        text = text.replace(generic, specific)
-        
-    return text
+    TECH_REPLACEMENTS,
+])
+
+def humanize_bullet(text, rng=None):
+    return ENGINE.rewrite(text, rng)
+
+def humanize_bullets(texts, rng=None):
+    return ENGINE.rewrite_many(texts, rng)
 
-# Example Test
-raw_point = "Implemented an automated patching solution across 150+ Linux servers, reducing manual effort by 70%."
-print(f"Before: {raw_point}")
-print(f"After:  {humanize_bullet(raw_point)}")
\ No newline at end of file
+if __name__ == "__main__":
+    # Example Test
+    raw_point = "Implemented an automated patching solution across 150+ Linux servers, reducing manual effort by 70%."
+    print(f"Before: {raw_point}")
+    print(f"After:  {humanize_bullet(raw_point)}")
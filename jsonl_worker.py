@@ -0,0 +1,95 @@
+import sys
+import json
+import asyncio
+import threading
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+
+# Long-lived JSON-lines service loop shared by the Python scripts the web app calls.
+# Protocol: one JSON request per line on stdin, one JSON response per line on stdout:
+#   -> {"id": "abc", ...request fields...}
+#   <- {"id": "abc", "result": {...}}
+# Requests run concurrently, so responses may come back out of order; callers match on "id".
+# Plain handlers run on a thread pool; coroutine handlers run as tasks on a single event loop.
+
+DEFAULT_WORKERS = 8
+
+def _parse_request(line, respond):
+    line = line.strip()
+    if not line:
+        return None
+
+    try:
+        request = json.loads(line)
+    except ValueError as e:
+        respond(None, {"error": f"Invalid request: {e}"})
+        return None
+
+    if not isinstance(request, dict):
+        respond(None, {"error": "Request must be a JSON object"})
+        return None
+
+    return request
+
+def serve(handler, max_workers=DEFAULT_WORKERS, stdin=None, stdout=None):
+    if asyncio.iscoroutinefunction(handler):
+        asyncio.run(serve_async(handler, max_workers, stdin, stdout))
+        return
+
+    stdin = stdin or sys.stdin
+    stdout = stdout or sys.stdout
+    write_lock = threading.Lock()
+
+    def respond(request_id, result):
+        line = json.dumps({"id": request_id, "result": result})
+        with write_lock:
+            stdout.write(line + "\n")
+            stdout.flush()
+
+    def run(request):
+        request_id = request.get("id")
+        try:
+            result = handler(request)
+        except Exception as e:
+            result = {"error": str(e), "trace": traceback.format_exc()}
+        respond(request_id, result)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        for line in stdin:
+            request = _parse_request(line, respond)
+            if request is not None:
+                pool.submit(run, request)
+
+async def serve_async(handler, max_concurrency=DEFAULT_WORKERS, stdin=None, stdout=None):
+    stdin = stdin or sys.stdin
+    stdout = stdout or sys.stdout
+    loop = asyncio.get_running_loop()
+    semaphore = asyncio.Semaphore(max_concurrency)
+    tasks = set()
+
+    def respond(request_id, result):
+        # Only ever called from the loop thread, so writes can't interleave
+        stdout.write(json.dumps({"id": request_id, "result": result}) + "\n")
+        stdout.flush()
+
+    async def run(request):
+        async with semaphore:
+            try:
+                result = await handler(request)
+            except Exception as e:
+                result = {"error": str(e), "trace": traceback.format_exc()}
+        respond(request.get("id"), result)
+
+    while True:
+        # Blocking stdin read happens off-loop so in-flight requests keep progressing
+        line = await loop.run_in_executor(None, stdin.readline)
+        if not line:
+            break
+        request = _parse_request(line, respond)
+        if request is not None:
+            task = asyncio.create_task(run(request))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+
+    if tasks:
+        await asyncio.gather(*tasks)
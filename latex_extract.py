@@ -0,0 +1,193 @@
+import re
+import sys
+import json
+import argparse
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+# Bullet extraction for scraped .tex resumes: one linear pass over a token stream that tracks
+# brace depth, so \resumeItem{Cut costs by \textbf{20\%} using \href{...}{Spark}} comes out whole
+# instead of being cut at the first "}" the way a [^}]+ regex cuts it.
+# - \resumeItem{...}-style macros (BULLET_MACROS, or your own) yield their argument; a second
+#   argument right after it (the older \resumeItem{Title}{Description} templates) is joined as "Title: Description"
+# - a bare \item runs until the next \item, \begin/\end or list macro, or the end of its group
+# - formatting macros are stripped as they are read, keeping their text (\textbf, \emph, \href's label, ...);
+#   arguments that aren't text (\vspace, \href's URL, \newcommand bodies in the preamble) are skipped
+# - LaTeX escapes (\%, \&, \$) stay escaped: the corpus stores bullets ready to drop back into a .tex file
+# Usage:
+#   python latex_extract.py resume.tex [more.tex ...]     (one JSON list of bullets per file)
+
+BULLET_MACROS = frozenset({"resumeItem", "resumeSubItem", "cvitem", "cvitemwithcomment", "itembullet"})
+
+# Bare \item bodies end at any of these (or at a bullet macro)
+ITEM_BREAKS = frozenset({
+    "item", "begin", "end", "section", "subsection", "resumeItemListStart", "resumeItemListEnd",
+    "resumeSubHeadingListStart", "resumeSubHeadingListEnd", "resumeSubheading", "resumeProjectHeading",
+})
+
+# Macros whose brace arguments aren't plain text: "drop" skips one argument, "keep" reads it as text.
+# Anything not listed just loses its name, so \textbf{x}, \emph{x}, {\bf x} all read as x.
+ARG_SPECS = {
+    "begin": ("drop",), "end": ("drop",),
+    "href": ("drop", "keep"), "textcolor": ("drop", "keep"), "color": ("drop",),
+    "vspace": ("drop",), "hspace": ("drop",), "label": ("drop",), "cite": ("drop",), "footnote": ("drop",),
+    "fontsize": ("drop", "drop"), "setlength": ("drop", "drop"), "includegraphics": ("drop",),
+    "newcommand": ("drop", "drop"), "renewcommand": ("drop", "drop"), "providecommand": ("drop", "drop"),
+    "newenvironment": ("drop", "drop", "drop"), "renewenvironment": ("drop", "drop", "drop"),
+    "usepackage": ("drop",), "documentclass": ("drop",), "input": ("drop",), "include": ("drop",),
+}
+
+# Argument-less macros that stand for text
+SYMBOLS = {
+    "sim": "~", "approx": "~", "textasciitilde": "~", "times": "x", "ldots": "...", "dots": "...",
+    "textendash": "--", "textemdash": "---", "newline": " ", "linebreak": " ", "LaTeX": "LaTeX", "TeX": "TeX",
+}
+
+# \<char> escapes: the ones a bullet needs in LaTeX stay escaped, spacing commands become spaces
+KEEP_ESCAPED = frozenset("%$&#_{}")
+SPACE_ESCAPES = frozenset("\\ ,;:!\n")
+
+TOKEN_RE = re.compile(r"""
+    \\[A-Za-z@]+\*?     # control word: \textbf, \item, \section*
+  | \\.                 # control symbol: \% \& \\ \,
+  | [{}]
+  | %[^\n]*             # comment
+  | [^\\{}%]+           # text
+""", re.VERBOSE | re.DOTALL)
+
+# "~" is a non-breaking space and "$" only switches math mode on and off
+TEXT_MAP = str.maketrans({"~": " ", "$": None})
+
+GROUP, DROP, BULLET, ITEM = range(4)
+
+def _finish(parts):
+    return " ".join("".join(parts).split())
+
+def extract_bullets(tex, macros=BULLET_MACROS):
+    """Every bullet in a .tex document, in document order, as single-line LaTeX-escaped text."""
+    bullets = []
+    # Frames: [kind, sink, after]; sink is the list the frame's text goes to (None outside bullets),
+    # after is what the macro's remaining arguments are once this one closes
+    stack = [[GROUP, None, []]]
+    sink = None         # stack[-1][1]
+    dropping = 0        # open DROP frames; nothing inside them starts a bullet
+    pending = []        # what the next brace groups after a macro are ("drop" / "keep" / "bullet" / "more")
+    held = None         # a finished macro bullet that may still get a "more" argument
+    optional = False    # a known macro was just read; an [optional] argument after it (or between its arguments) is skipped
+
+    # Nothing before \begin{document} is typeset, so the preamble's macro definitions are skipped outright.
+    # Tokens are plain strings told apart by their first character, which is much cheaper than match objects.
+    for token in TOKEN_RE.findall(tex, max(tex.find("\\begin{document}"), 0)):
+        first = token[0]
+        if first == "%":
+            continue
+        is_text = first != "\\" and first != "{" and first != "}"
+
+        if pending or optional or held is not None:
+            if is_text:
+                if token.lstrip().startswith("["):
+                    close = token.find("]")
+                    if close >= 0:
+                        token = token[close + 1:]
+                if not token.strip():
+                    optional = False
+                    continue  # whitespace between a macro and its arguments
+            if pending and first != "{":
+                pending = []
+            if held is not None and not (first == "{" and pending == ["more"]):
+                bullets.append(_finish(held))
+                held = None
+            optional = False
+
+        if is_text:
+            if sink is not None:
+                sink.append(token.translate(TEXT_MAP))
+
+        elif first == "{":
+            action, after = (pending[0], pending[1:]) if pending else ("keep", [])
+            pending = []
+            if action == "drop" or dropping:
+                stack.append([DROP, None, after])
+                dropping += 1
+                sink = None
+            elif action == "bullet":
+                sink = []
+                stack.append([BULLET, sink, ["more"]])
+            elif action == "more":
+                held.append(": ")
+                sink, held = held, None
+                stack.append([BULLET, sink, []])
+            else:
+                stack.append([GROUP, sink, after])
+
+        elif first == "}":
+            if stack[-1][0] == ITEM:
+                bullets.append(_finish(stack.pop()[1]))
+            if len(stack) == 1:
+                sink = None
+                continue  # unbalanced "}"
+            frame_kind, frame_sink, pending = stack.pop()
+            sink = stack[-1][1]
+            if frame_kind == DROP:
+                dropping -= 1
+            elif frame_kind == BULLET:
+                if pending:
+                    held = frame_sink
+                else:
+                    bullets.append(_finish(frame_sink))
+
+        elif len(token) == 2 and not (token[1].isalpha() or token[1] == "@"):
+            # \<char>
+            if sink is not None:
+                if token[1] in KEEP_ESCAPED:
+                    sink.append(token)
+                elif token[1] in SPACE_ESCAPES:
+                    sink.append(" ")
+
+        else:
+            name = token[1:-1] if token[-1] == "*" else token[1:]
+            if stack[-1][0] == ITEM and (name in ITEM_BREAKS or name in macros):
+                bullets.append(_finish(stack.pop()[1]))
+                sink = stack[-1][1]
+            if dropping:
+                continue
+            if name in macros:
+                if sink is None:
+                    pending = ["bullet"]
+                optional = True
+            elif name == "item":
+                if sink is None:
+                    sink = []
+                    stack.append([ITEM, sink, []])
+                optional = True
+            elif name in ARG_SPECS:
+                pending = list(ARG_SPECS[name])
+                optional = True
+            elif name in SYMBOLS and sink is not None:
+                sink.append(SYMBOLS[name])
+
+    if held is not None:
+        bullets.append(_finish(held))
+    # A bare \item still open at the end of the file is complete; an unclosed \resumeItem{ is truncated
+    bullets.extend(_finish(frame_sink) for frame_kind, frame_sink, _ in stack if frame_kind == ITEM)
+    return [b for b in bullets if b]
+
+def extract_many(texts, workers=1, chunksize=64):
+    # Lists of bullets for a batch of documents, in input order; workers > 1 spreads them over processes
+    if workers <= 1:
+        return [extract_bullets(text) for text in texts]
+    # spawn, not fork, for the same reason as pdf_extract.get_pool
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+        return list(pool.map(extract_bullets, texts, chunksize=chunksize))
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Extract resume bullets from .tex files.")
+    arg_parser.add_argument("files", nargs="+")
+    args = arg_parser.parse_args()
+
+    for path in args.files:
+        with open(path, 'r', encoding='utf-8', errors='ignore') as f:
+            print(json.dumps({"file": path, "bullets": extract_bullets(f.read())}, ensure_ascii=False))
+
+if __name__ == "__main__":
+    sys.exit(main())
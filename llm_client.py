@@ -0,0 +1,228 @@
+import os
+import json
+import time
+import random
+import asyncio
+import threading
+from collections import namedtuple
+from email.utils import parsedate_to_datetime
+import httpx
+
+# Shared async LLM client for parser.py, augment.py and friends.
+# - One pooled HTTP connection per event loop (keep-alive instead of a new TLS handshake per call)
+# - Token-bucket limits on requests/minute and tokens/minute, shared by every caller in the process
+# - Retries with jittered exponential backoff on 429 / 5xx / connection errors, honouring Retry-After
+#   up to RETRY_MAX_DELAY (a longer one fails fast with the LLMError)
+# - Pluggable backend: Groq's OpenAI-compatible endpoint by default, LLM_BASE_URL to point at a local
+#   fake server, or FakeBackend for fully in-process runs
+
+DEFAULT_BASE_URL = "https://api.groq.com/openai/v1"
+DEFAULT_MODEL = "llama-3.3-70b-versatile"
+
+# Groq free-tier limits for llama-3.3-70b-versatile; raise them via env on paid plans
+LLM_RPM = int(os.getenv("LLM_RPM", "30"))
+LLM_TPM = int(os.getenv("LLM_TPM", "12000"))
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "5"))
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "8"))
+LLM_TIMEOUT = float(os.getenv("LLM_TIMEOUT", "120"))
+
+RETRY_BASE_DELAY = 1.0
+RETRY_MAX_DELAY = 30.0
+
+Completion = namedtuple("Completion", ["text", "prompt_tokens", "completion_tokens"])
+
+def parse_retry_after(value):
+    # Retry-After is either delay-seconds or an HTTP-date; seconds to wait, or None if it's neither
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+class LLMError(Exception):
+    def __init__(self, message, status=None, retry_after=None):
+        super().__init__(message)
+        self.status = status
+        self.retry_after = retry_after
+
+    @property
+    def retryable(self):
+        return self.status is None or self.status == 429 or self.status >= 500
+
+class TokenBucket:
+    # Reservation-style bucket: the balance may go negative and callers sleep off the debt.
+    # Uses a threading lock rather than an asyncio one so it can be shared across event loops.
+    def __init__(self, per_minute):
+        self.rate = per_minute / 60.0
+        self.capacity = float(per_minute)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def reserve(self, amount):
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= min(amount, self.capacity)
+            return max(0.0, -self.tokens / self.rate)
+
+class RateLimiter:
+    def __init__(self, rpm=LLM_RPM, tpm=LLM_TPM):
+        self.requests = TokenBucket(rpm)
+        self.tokens = TokenBucket(tpm)
+
+    async def acquire(self, estimated_tokens):
+        wait = max(self.requests.reserve(1), self.tokens.reserve(estimated_tokens))
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+class OpenAICompatBackend:
+    # Works for Groq and any OpenAI-compatible server (including a local fake for tests)
+    def __init__(self, base_url=DEFAULT_BASE_URL, api_key=None, timeout=LLM_TIMEOUT):
+        self.base_url = base_url.rstrip("/")
+        self.api_key = api_key
+        self.timeout = timeout
+        self._session = None
+        self._session_loop = None
+
+    def _get_session(self):
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._session_loop is not loop:
+            headers = {"Authorization": f"Bearer {self.api_key}"} if self.api_key else {}
+            self._session = httpx.AsyncClient(
+                base_url=self.base_url,
+                headers=headers,
+                timeout=self.timeout,
+                limits=httpx.Limits(max_connections=LLM_MAX_CONCURRENCY, max_keepalive_connections=LLM_MAX_CONCURRENCY),
+            )
+            self._session_loop = loop
+        return self._session
+
+    async def complete(self, payload):
+        try:
+            response = await self._get_session().post("/chat/completions", json=payload)
+        except httpx.TransportError as e:
+            raise LLMError(f"Connection error: {e}")
+
+        if response.status_code != 200:
+            raise LLMError(
+                f"LLM request failed with {response.status_code}: {response.text[:200]}",
+                status=response.status_code,
+                retry_after=parse_retry_after(response.headers.get("retry-after")),
+            )
+
+        data = response.json()
+        usage = data.get("usage") or {}
+        return Completion(
+            text=data["choices"][0]["message"]["content"],
+            prompt_tokens=usage.get("prompt_tokens", 0),
+            completion_tokens=usage.get("completion_tokens", 0),
+        )
+
+    async def aclose(self):
+        # Only the running loop's pool can be closed from here; another loop's is left to that loop
+        if self._session is not None and self._session_loop is asyncio.get_running_loop():
+            await self._session.aclose()
+            self._session = None
+            self._session_loop = None
+
+class FakeBackend:
+    # In-process stand-in: responder(payload) returns the completion text (or raises LLMError)
+    def __init__(self, responder):
+        self.responder = responder
+        self.calls = []
+
+    async def complete(self, payload):
+        self.calls.append(payload)
+        text = self.responder(payload)
+        prompt_tokens = estimate_tokens(json.dumps(payload["messages"]))
+        return Completion(text=text, prompt_tokens=prompt_tokens, completion_tokens=estimate_tokens(text))
+
+    async def aclose(self):
+        pass
+
+def estimate_tokens(text):
+    return max(1, len(text) // 4)
+
+class LLMClient:
+    def __init__(self, backend, limiter=None, max_retries=LLM_MAX_RETRIES, max_concurrency=LLM_MAX_CONCURRENCY):
+        self.backend = backend
+        self.limiter = limiter or RateLimiter()
+        self.max_retries = max_retries
+        # Caps in-flight requests per process; a threading semaphore would block the loop
+        self.max_concurrency = max_concurrency
+        self._semaphores = {}
+
+    def _semaphore(self):
+        loop = asyncio.get_running_loop()
+        if loop not in self._semaphores:
+            self._semaphores = {loop: asyncio.Semaphore(self.max_concurrency)}
+        return self._semaphores[loop]
+
+    async def chat(self, messages, model=DEFAULT_MODEL, max_tokens=None, **params):
+        payload = {"model": model, "messages": messages, "stream": False, **params}
+        if max_tokens is not None:
+            payload["max_tokens"] = max_tokens
+
+        # Budget for prompt + expected output so long prompts can't blow through TPM
+        estimated = estimate_tokens("".join(m["content"] for m in messages)) + (max_tokens or 1024)
+
+        async with self._semaphore():
+            for attempt in range(self.max_retries + 1):
+                await self.limiter.acquire(estimated)
+                try:
+                    return await self.backend.complete(payload)
+                except LLMError as e:
+                    if not e.retryable or attempt == self.max_retries:
+                        raise
+                    # A longer Retry-After would hold this concurrency slot for all of it; fail fast instead
+                    if e.retry_after is not None and e.retry_after > RETRY_MAX_DELAY:
+                        raise
+                    if e.retry_after is not None:
+                        delay = e.retry_after
+                    else:
+                        delay = random.uniform(0, min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2 ** attempt))
+                    await asyncio.sleep(delay)
+
+    async def aclose(self):
+        await self.backend.aclose()
+
+_client = None
+_client_lock = threading.Lock()
+
+def is_configured():
+    return bool(os.getenv("LLM_BASE_URL") or os.getenv("GROQ_API_KEY"))
+
+def get_llm():
+    # Process-wide client; the caller is responsible for loading .env first
+    global _client
+    with _client_lock:
+        if _client is None:
+            backend = OpenAICompatBackend(
+                base_url=os.getenv("LLM_BASE_URL", DEFAULT_BASE_URL),
+                api_key=os.getenv("GROQ_API_KEY"),
+            )
+            _client = LLMClient(backend)
+    return _client
+
+def run_sync(coroutine):
+    # asyncio.run for one-off sync callers. Each call gets a new loop and with it a new pooled
+    # connection, so the pool is closed before the loop is rather than left open behind it.
+    async def main():
+        try:
+            return await coroutine
+        finally:
+            await get_llm().aclose()
+    return asyncio.run(main())
+
+def set_llm(client):
+    # Swap in a client (e.g. LLMClient(FakeBackend(...))) for offline runs
+    global _client
+    with _client_lock:
+        _client = client
@@ -0,0 +1,177 @@
+import os
+import json
+import time
+import numpy as np
+
+# In-process vector store, an alternative to Pinecone for small/medium corpora (VECTOR_BACKEND=local).
+# Layout under <index_dir>:
+#   vectors-<n>.f32  N x dim float32 matrix of L2-normalised vectors (memory-mapped at query time)
+#   meta.json        {"dim", "vectors_file", "partitions", "items": [{"id", "text", "domain", "type"}, ...]} in row order
+#                    rows are grouped by domain; partitions maps each domain to its [start, end) row range
+#   ivf-<n>.npz      optional coarse quantiser (centroids + row assignments) for large corpora
+# Cosine similarity == dot product on normalised vectors, so exact search is one mat-vec.
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_INDEX_DIR = os.path.join(script_dir, ".cache", "local_index")
+
+IVF_MIN_ROWS = int(os.getenv("LOCAL_INDEX_IVF_MIN_ROWS", "50000"))  # exact search below this
+IVF_NPROBE = int(os.getenv("LOCAL_INDEX_NPROBE", "8"))
+IVF_ITERATIONS = 10
+
+def normalize_rows(matrix):
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+def train_ivf(matrix, nlist, iterations=IVF_ITERATIONS, seed=0):
+    # Spherical k-means: returns (centroids, assignment per row)
+    rng = np.random.default_rng(seed)
+    centroids = matrix[rng.choice(matrix.shape[0], nlist, replace=False)].copy()
+    for _ in range(iterations):
+        assignments = np.argmax(matrix @ centroids.T, axis=1)
+        for c in range(nlist):
+            members = matrix[assignments == c]
+            if len(members):
+                centroids[c] = members.mean(axis=0)
+        centroids = normalize_rows(centroids)
+    assignments = np.argmax(matrix @ centroids.T, axis=1)
+    return centroids.astype(np.float32), assignments.astype(np.int32)
+
+class LocalIndexBuilder:
+    # Collects (id, vector, metadata) tuples through the same upsert() call Pinecone uses,
+    # so vector_db.embed_and_upsert can feed either backend.
+    def __init__(self, index_dir=DEFAULT_INDEX_DIR):
+        self.index_dir = index_dir
+        self.ids = []
+        self.vectors = []
+        self.items = []
+
+    def upsert(self, vectors):
+        for vector_id, vector, metadata in vectors:
+            self.ids.append(vector_id)
+            self.vectors.append(vector)
+            self.items.append({"id": vector_id, **metadata})
+
+    def save(self):
+        os.makedirs(self.index_dir, exist_ok=True)
+
+        # Group rows by domain so a domain-filtered query reads one contiguous slice of the memory map
+        order = sorted(range(len(self.items)), key=lambda i: self.items[i]["domain"])
+        self.vectors = [self.vectors[i] for i in order]
+        self.items = [self.items[i] for i in order]
+        partitions = {}
+        for row, item in enumerate(self.items):
+            partitions.setdefault(item["domain"], [row, row])[1] = row + 1
+
+        matrix = normalize_rows(np.asarray(self.vectors, dtype=np.float32)) if self.vectors else np.zeros((0, 0), dtype=np.float32)
+        dim = matrix.shape[1] if matrix.size else 0
+
+        # New vectors go to a fresh file and meta.json is swapped in last, so a reader always sees
+        # a matching (meta, vectors) pair even while a rebuild is running
+        vectors_file = f"vectors-{time.time_ns()}.f32"
+        matrix.astype(np.float32).tofile(os.path.join(self.index_dir, vectors_file))
+
+        ivf_file = None
+        if matrix.shape[0] >= IVF_MIN_ROWS:
+            ivf_file = f"ivf-{time.time_ns()}.npz"
+            centroids, assignments = train_ivf(matrix, nlist=int(np.sqrt(matrix.shape[0])))
+            np.savez(os.path.join(self.index_dir, ivf_file), centroids=centroids, assignments=assignments)
+
+        meta_tmp = os.path.join(self.index_dir, "meta.json.tmp")
+        with open(meta_tmp, 'w', encoding='utf-8') as f:
+            json.dump({"dim": dim, "vectors_file": vectors_file, "ivf_file": ivf_file, "partitions": partitions, "items": self.items}, f, ensure_ascii=False)
+        os.replace(meta_tmp, os.path.join(self.index_dir, "meta.json"))
+
+        # Old generations can go; open memory maps keep working on POSIX until they're closed
+        for name in os.listdir(self.index_dir):
+            if name.startswith(("vectors-", "ivf-")) and name not in (vectors_file, ivf_file):
+                try:
+                    os.remove(os.path.join(self.index_dir, name))
+                except OSError:
+                    pass
+        return len(self.items)
+
+class LocalVectorIndex:
+    def __init__(self, index_dir=DEFAULT_INDEX_DIR):
+        self.index_dir = index_dir
+        meta_path = os.path.join(index_dir, "meta.json")
+        if not os.path.exists(meta_path):
+            raise FileNotFoundError(f"No local index at {index_dir}. Run: VECTOR_BACKEND=local python vector_db.py")
+
+        with open(meta_path, 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+        self.items = meta["items"]
+        self.dim = meta["dim"]
+        # Indexes written before partitioning have none; domain filters then fall back to a full mask
+        self.partitions = {d: tuple(r) for d, r in (meta.get("partitions") or {}).items()}
+
+        vectors_path = os.path.join(index_dir, meta["vectors_file"])
+        if self.items:
+            self.matrix = np.memmap(vectors_path, dtype=np.float32, mode="r", shape=(len(self.items), self.dim))
+        else:
+            self.matrix = np.zeros((0, self.dim), dtype=np.float32)
+
+        # Integer codes per row make metadata filters a vectorised comparison
+        self.domains = sorted({item["domain"] for item in self.items})
+        self.types = sorted({item["type"] for item in self.items})
+        self.domain_codes = np.array([self.domains.index(i["domain"]) for i in self.items], dtype=np.int16)
+        self.type_codes = np.array([self.types.index(i["type"]) for i in self.items], dtype=np.int16)
+
+        self.centroids = None
+        if meta.get("ivf_file"):
+            ivf = np.load(os.path.join(index_dir, meta["ivf_file"]))
+            self.centroids = ivf["centroids"]
+            self.assignments = ivf["assignments"]
+
+    def __len__(self):
+        return len(self.items)
+
+    def _rows(self, domain):
+        # [start, end) row range to scan: the domain's partition, or everything
+        if domain is not None and self.partitions:
+            return self.partitions.get(domain, (0, 0))
+        return 0, len(self.items)
+
+    def _mask(self, start, end, domain=None, bullet_type=None):
+        mask = np.ones(end - start, dtype=bool)
+        if domain is not None and not self.partitions:
+            mask &= self.domain_codes[start:end] == (self.domains.index(domain) if domain in self.domains else -1)
+        if bullet_type is not None:
+            mask &= self.type_codes[start:end] == (self.types.index(bullet_type) if bullet_type in self.types else -1)
+        return mask
+
+    def _candidates(self, query, start, mask, nprobe):
+        # Returns row offsets relative to start
+        if self.centroids is None:
+            return np.flatnonzero(mask)
+        # IVF: only scan rows assigned to the closest centroids
+        probe = np.argsort(-(self.centroids @ query))[:nprobe]
+        return np.flatnonzero(mask & np.isin(self.assignments[start:start + len(mask)], probe))
+
+    def search(self, vector, top_k=5, domain=None, bullet_type=None, nprobe=IVF_NPROBE):
+        query = np.asarray(vector, dtype=np.float32)
+        norm = np.linalg.norm(query)
+        if norm:
+            query = query / norm
+
+        start, end = self._rows(domain)
+        rows = self._candidates(query, start, self._mask(start, end, domain, bullet_type), nprobe)
+        if not len(rows):
+            return []
+
+        # Whole-partition scans read a slice of the memory map directly instead of gathering a copy
+        block = self.matrix[start:end]
+        scores = block @ query if len(rows) == end - start else block[rows] @ query
+        k = min(top_k, len(rows))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+
+        matches = []
+        for i in top:
+            item = self.items[start + rows[i]]
+            matches.append({
+                "text": item.get("text", ""),
+                "score": float(scores[i]),
+                "domain": item.get("domain", "general")
+            })
+        return matches
@@ -0,0 +1,159 @@
+import os
+import re
+import random
+import hashlib
+import argparse
+from collections import defaultdict
+from corpus import CORPUS_PATH, ensure_jsonl, iter_records, write_records
+
+# MinHash + LSH index for catching paraphrased near-copies among resume bullets.
+# Each bullet becomes a set of character shingles; a MinHash signature estimates Jaccard similarity,
+# and banding the signature means a lookup only compares against bullets sharing at least one band
+# bucket instead of the whole corpus.
+
+DEFAULT_THRESHOLD = float(os.getenv("NEAR_DUP_THRESHOLD", "0.65"))
+NUM_PERM = 64
+SHINGLE_SIZE = 5
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+
+def normalize(text):
+    # Numbers are jittered by the humanizers, so "reduced costs by 27%" and "by 31%" should collide
+    text = text.lower().replace("\\%", "%").replace("\\$", "$")
+    text = re.sub(r'\d+', '0', text)
+    return re.sub(r'\s+', ' ', text).strip()
+
+def shingles(text, size=SHINGLE_SIZE):
+    text = normalize(text)
+    if len(text) <= size:
+        return {text}
+    return {text[i:i + size] for i in range(len(text) - size + 1)}
+
+def _hash32(shingle):
+    return int.from_bytes(hashlib.blake2b(shingle.encode("utf-8"), digest_size=4).digest(), "little")
+
+def choose_bands(threshold, num_perm):
+    # Pick bands*rows == num_perm whose S-curve midpoint (1/b)^(1/r) sits closest to the threshold
+    best = None
+    for rows in range(1, num_perm + 1):
+        if num_perm % rows:
+            continue
+        bands = num_perm // rows
+        error = abs((1 / bands) ** (1 / rows) - threshold)
+        if best is None or error < best[0]:
+            best = (error, bands, rows)
+    return best[1], best[2]
+
+class NearDupIndex:
+    def __init__(self, threshold=DEFAULT_THRESHOLD, num_perm=NUM_PERM, seed=1):
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands, self.rows = choose_bands(threshold, num_perm)
+
+        rng = random.Random(seed)
+        self.perms = [
+            (rng.randrange(1, _MERSENNE_PRIME), rng.randrange(0, _MERSENNE_PRIME))
+            for _ in range(num_perm)
+        ]
+
+        self.buckets = [defaultdict(list) for _ in range(self.bands)]
+        self.signatures = {}
+
+    def __len__(self):
+        return len(self.signatures)
+
+    def signature(self, text):
+        hashes = [_hash32(s) for s in shingles(text)]
+        return tuple(
+            min(((a * h + b) % _MERSENNE_PRIME) & _MAX_HASH for h in hashes)
+            for a, b in self.perms
+        )
+
+    def _band_keys(self, sig):
+        r = self.rows
+        return [sig[i * r:(i + 1) * r] for i in range(self.bands)]
+
+    def similarity(self, sig_a, sig_b):
+        return sum(x == y for x, y in zip(sig_a, sig_b)) / self.num_perm
+
+    def query(self, text, sig=None):
+        # Returns [(key, estimated_jaccard)] for stored bullets at or above the threshold
+        sig = sig or self.signature(text)
+        candidates = set()
+        for band, key in enumerate(self._band_keys(sig)):
+            candidates.update(self.buckets[band].get(key, ()))
+
+        matches = []
+        for key in candidates:
+            score = self.similarity(sig, self.signatures[key])
+            if score >= self.threshold:
+                matches.append((key, score))
+        return sorted(matches, key=lambda m: -m[1])
+
+    def add(self, text, key=None, check=True):
+        # Returns False (and stores nothing) when check=True and a near-duplicate already exists
+        key = text if key is None else key
+        sig = self.signature(text)
+        if check and (key in self.signatures or self.query(text, sig=sig)):
+            return False
+
+        self.signatures[key] = sig
+        for band, band_key in enumerate(self._band_keys(sig)):
+            self.buckets[band][band_key].append(key)
+        return True
+
+def filter_new(existing, new_points, threshold=DEFAULT_THRESHOLD):
+    # Keeps only the new points that aren't near-copies of existing ones (or of each other)
+    index = NearDupIndex(threshold=threshold)
+    for text in existing:
+        index.add(text, check=False)
+    return [p for p in new_points if index.add(p)]
+
+def dedup_file(file_path=CORPUS_PATH, threshold=DEFAULT_THRESHOLD, dry_run=False):
+    # Real bullets are never dropped; synthetic ones must differ from real and from each other.
+    # Pass 1 indexes the real bullets per domain, pass 2 streams the corpus and filters synthetic ones.
+    if not dry_run:
+        ensure_jsonl(file_path)
+    indexes = {}
+    for record in iter_records(file_path):
+        if record["source"] == "real":
+            indexes.setdefault(record["domain"], NearDupIndex(threshold=threshold)).add(record["text"], check=False)
+
+    counts = {}
+    def kept_records():
+        for record in iter_records(file_path):
+            if record["source"] == "synthetic":
+                domain = counts.setdefault(record["domain"], {"synthetic": 0, "kept": 0})
+                domain["synthetic"] += 1
+                if not indexes.setdefault(record["domain"], NearDupIndex(threshold=threshold)).add(record["text"]):
+                    continue
+                domain["kept"] += 1
+            yield record
+
+    if dry_run:
+        for _ in kept_records():
+            pass
+    else:
+        write_records(kept_records(), file_path)
+
+    removed_total = 0
+    for domain, c in counts.items():
+        removed = c["synthetic"] - c["kept"]
+        removed_total += removed
+        print(f"{domain}: {c['synthetic']} synthetic -> {c['kept']} kept ({removed} near-duplicates)")
+    return removed_total
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Remove near-duplicate synthetic bullets.")
+    arg_parser.add_argument("file", nargs="?", default=CORPUS_PATH)
+    arg_parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="Estimated Jaccard similarity above which bullets count as duplicates")
+    arg_parser.add_argument("--dry-run", action="store_true")
+    args = arg_parser.parse_args()
+
+    removed = dedup_file(args.file, threshold=args.threshold, dry_run=args.dry_run)
+    action = "Would remove" if args.dry_run else "Removed"
+    print(f"\n{action} {removed} near-duplicate synthetic bullets.")
+
+if __name__ == "__main__":
+    main()
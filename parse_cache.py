@@ -0,0 +1,132 @@
+import os
+import json
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+
+# Content-addressed on-disk cache for parser results.
+# Layout: <cache_dir>/<namespace>/<sha256>.json, one file per entry.
+# File mtimes double as the LRU clock, so recency survives restarts without an index file.
+# With max_age set, entries unused for that many seconds expire as well.
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_CACHE_DIR = os.path.join(script_dir, ".cache", "parser")
+DEFAULT_MAX_BYTES = int(float(os.getenv("PARSE_CACHE_MAX_MB", "200")) * 1024 * 1024)
+
+def content_hash(*parts):
+    h = hashlib.sha256()
+    for part in parts:
+        if isinstance(part, str):
+            part = part.encode("utf-8")
+        h.update(part)
+        h.update(b"\0")
+    return h.hexdigest()
+
+class ParseCache:
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES, max_age=None):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.lock = threading.Lock()
+        self.entries = OrderedDict()  # relative path -> size, least recently used first
+        self.total_bytes = 0
+        self.hits = {}
+        self.misses = {}
+        self.evictions = 0
+        self._load()
+
+    def _load(self):
+        found = []
+        expire_before = time.time() - self.max_age if self.max_age is not None else None
+        if os.path.isdir(self.cache_dir):
+            for namespace in os.listdir(self.cache_dir):
+                ns_dir = os.path.join(self.cache_dir, namespace)
+                if not os.path.isdir(ns_dir):
+                    continue
+                for name in os.listdir(ns_dir):
+                    if not name.endswith(".json"):
+                        continue
+                    st = os.stat(os.path.join(ns_dir, name))
+                    if expire_before is not None and st.st_mtime < expire_before:
+                        os.remove(os.path.join(ns_dir, name))
+                        self.evictions += 1
+                        continue
+                    found.append((st.st_mtime, os.path.join(namespace, name), st.st_size))
+
+        for _, rel_path, size in sorted(found):
+            self.entries[rel_path] = size
+            self.total_bytes += size
+
+    def _path(self, rel_path):
+        return os.path.join(self.cache_dir, rel_path)
+
+    def get(self, namespace, key):
+        rel_path = os.path.join(namespace, key + ".json")
+        with self.lock:
+            if rel_path not in self.entries:
+                self.misses[namespace] = self.misses.get(namespace, 0) + 1
+                return None
+            self.entries.move_to_end(rel_path)
+
+        try:
+            if self.max_age is not None and time.time() - os.path.getmtime(self._path(rel_path)) > self.max_age:
+                os.remove(self._path(rel_path))
+                raise OSError("expired")
+            with open(self._path(rel_path), "r", encoding="utf-8") as f:
+                value = json.load(f)
+            os.utime(self._path(rel_path))
+        except (OSError, ValueError):
+            # Expired, or deleted or corrupted behind our back: treat as a miss and forget it
+            with self.lock:
+                self.total_bytes -= self.entries.pop(rel_path, 0)
+                self.misses[namespace] = self.misses.get(namespace, 0) + 1
+            return None
+
+        with self.lock:
+            self.hits[namespace] = self.hits.get(namespace, 0) + 1
+        return value
+
+    def put(self, namespace, key, value):
+        rel_path = os.path.join(namespace, key + ".json")
+        path = self._path(rel_path)
+        data = json.dumps(value, ensure_ascii=False).encode("utf-8")
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+        with self.lock:
+            self.total_bytes -= self.entries.pop(rel_path, 0)
+            self.entries[rel_path] = len(data)
+            self.total_bytes += len(data)
+            self._evict()
+
+    def _evict(self):
+        # Caller holds the lock. Never evicts the entry that was just written.
+        while self.total_bytes > self.max_bytes and len(self.entries) > 1:
+            rel_path, size = self.entries.popitem(last=False)
+            self.total_bytes -= size
+            self.evictions += 1
+            try:
+                os.remove(self._path(rel_path))
+            except OSError:
+                pass
+
+    def stats(self):
+        with self.lock:
+            return {
+                "entries": len(self.entries),
+                "bytes": self.total_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": dict(self.hits),
+                "misses": dict(self.misses),
+                "evictions": self.evictions,
+            }
+
+if __name__ == "__main__":
+    # Quick inspection: python parse_cache.py
+    cache = ParseCache()
+    print(json.dumps(cache.stats(), indent=2))
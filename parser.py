@@ -1,118 +1,189 @@
 import os
 import sys
 import json
+import asyncio
 import traceback
-from pypdf import PdfReader
-from groq import Groq
 from dotenv import load_dotenv
+from jsonl_worker import serve
+from llm_client import get_llm, is_configured, run_sync
+from parse_cache import ParseCache, content_hash
+from pdf_extract import extract_text
+from section_preparser import PREPARSER_VERSION, preparse, build_focused_messages, merge
 
 # Load environment variables
 script_dir = os.path.dirname(os.path.abspath(__file__))
 env_path = os.path.join(script_dir, "web", ".env")
 load_dotenv(dotenv_path=env_path)
 
-def parse_resume(file_path):
+MODEL_NAME = "llama-3.3-70b-versatile"
+PARSER_WORKERS = int(os.getenv("PARSER_WORKERS", "8"))
+USE_CACHE = os.getenv("PARSE_CACHE", "1") != "0"
+USE_PREPARSER = os.getenv("PARSE_PREPARSER", "1") != "0"
+
+SYSTEM_PROMPT = """
+You are an expert Resume Parser. 
+Extract the resume data from the text provided below into the following strict JSON format:
+{
+    "profile": { "name": "", "email": "", "phone": "", "linkedin": "", "github": "", "website": "", "summary": "" },
+    "experience": [ { "id": "uuid", "company": "", "role": "", "startDate": "", "endDate": "", "location": "", "bullets": [] } ],
+    "projects": [ { "id": "uuid", "name": "", "description": "", "technologies": [], "link": "", "bullets": [] } ],
+    "education": [ { "id": "uuid", "school": "", "degree": "", "field": "", "startDate": "", "endDate": "", "grade": "" } ],
+    "responsibilities": [ { "id": "uuid", "title": "", "organization": "", "location": "", "startDate": "", "endDate": "", "description": "" } ],
+    "achievements": [ "Achievement 1 with details", "Achievement 2 with details" ],
+    "skills": []
+}
+
+SECTION HEADER MAPPINGS - Map these variations to our fields:
+
+EXPERIENCE (put in "experience"):
+- "Work Experience", "Professional Experience", "Employment History", "Career History"
+- "Work History", "Professional Background", "Experience", "Internships"
+- "Relevant Experience", "Industry Experience"
+
+EDUCATION (put in "education"):
+- "Education", "Academic Background", "Educational Qualifications", "Academic History"
+- "Degrees", "Schooling", "Academic Credentials"
+
+PROJECTS (put in "projects"):
+- "Projects", "Personal Projects", "Academic Projects", "Key Projects"
+- "Technical Projects", "Portfolio", "Side Projects"
+
+SKILLS (put in "skills"):
+- "Skills", "Technical Skills", "Core Competencies", "Key Skills"
+- "Expertise", "Proficiencies", "Technologies", "Tools & Technologies"
+
+ACHIEVEMENTS (put in "achievements"):
+- "Achievements", "Certifications", "Awards", "Honors"
+- "Accomplishments", "Courses", "Licenses", "Publications"
+- "Achievements & Certifications", "Awards & Honors"
+
+RESPONSIBILITIES (put in "responsibilities"):
+- "Positions of Responsibility", "Leadership", "Extracurriculars"
+- "Volunteer Work", "Community Involvement", "Activities"
+- "Leadership Experience", "Organizational Roles"
+
+Rules:
+- If a field is missing, use empty string or empty list. 
+- Do not invent data.
+- IMPORTANT for experience:
+  * "role" = the job title (e.g. "Founders Office Intern", "Software Engineer", "Marketing Manager")
+  * "company" = the company/startup name (e.g. "Pinch", "Google", "StampMyVisa")
+  * Do NOT swap these - role is what you DO, company is WHERE you work
+- Return ONLY the raw JSON string. No markdown formatting.
+"""
+
+
+# Any change to the prompt or model invalidates cached LLM output
+PROMPT_VERSION = content_hash(MODEL_NAME, SYSTEM_PROMPT, PREPARSER_VERSION, str(USE_PREPARSER))[:16]
+
+_cache = None
+
+def get_cache():
+    global _cache
+    if _cache is None and USE_CACHE:
+        _cache = ParseCache()
+    return _cache
+
+def build_messages(text):
+    # Returns (messages, preparse result or None when falling back to the full prompt)
+    if USE_PREPARSER:
+        pre = preparse(text)
+        # No recognisable headers: the rule-based split has nothing to offer
+        if pre["sections"]:
+            return build_focused_messages(pre), pre
+
+    return [
+        { "role": "system", "content": SYSTEM_PROMPT },
+        { "role": "user", "content": f"Resume Text:\n{text}" }
+    ], None
+
+async def parse_resume_async(file_path, stats=None):
+    # stats: optional dict filled with token usage and cache info (used by batch_parse.py)
+    if stats is None:
+        stats = {}
+    stats.update({"cached": False, "prompt_tokens": 0, "completion_tokens": 0})
+
     try:
+        cache = get_cache()
+
+        # 0. Identical upload? (keyed by the raw PDF bytes)
+        with open(file_path, "rb") as f:
+            pdf_bytes = f.read()
+        pdf_key = content_hash(pdf_bytes, PROMPT_VERSION)
+        if cache:
+            cached = cache.get("pdf", pdf_key)
+            if cached is not None:
+                stats["cached"] = True
+                return cached
+
         # 1. Extract Text
-        reader = PdfReader(file_path)
-        text = ""
-        for page in reader.pages:
-            text += page.extract_text() + "\n"
+        text = await asyncio.to_thread(extract_text, pdf_bytes)
         
         if not text.strip():
-            print(json.dumps({"error": "No text extracted from PDF"}))
-            return
+            return {"error": "No text extracted from PDF"}
 
-        # 2. Call Groq
-        api_key = os.getenv("GROQ_API_KEY")
-        if not api_key:
-             print(json.dumps({"error": "GROQ_API_KEY missing"}))
-             return
+        # Same text from a different file (re-export, metadata change): reuse the LLM output
+        text_key = content_hash(text, PROMPT_VERSION)
+        if cache:
+            cached = cache.get("text", text_key)
+            if cached is not None:
+                stats["cached"] = True
+                cache.put("pdf", pdf_key, cached)
+                return cached
 
-        client = Groq(api_key=api_key)
-        
-        system_prompt = """
-        You are an expert Resume Parser. 
-        Extract the resume data from the text provided below into the following strict JSON format:
-        {
-            "profile": { "name": "", "email": "", "phone": "", "linkedin": "", "github": "", "website": "", "summary": "" },
-            "experience": [ { "id": "uuid", "company": "", "role": "", "startDate": "", "endDate": "", "location": "", "bullets": [] } ],
-            "projects": [ { "id": "uuid", "name": "", "description": "", "technologies": [], "link": "", "bullets": [] } ],
-            "education": [ { "id": "uuid", "school": "", "degree": "", "field": "", "startDate": "", "endDate": "", "grade": "" } ],
-            "responsibilities": [ { "id": "uuid", "title": "", "organization": "", "location": "", "startDate": "", "endDate": "", "description": "" } ],
-            "achievements": [ "Achievement 1 with details", "Achievement 2 with details" ],
-            "skills": []
-        }
-        
-        SECTION HEADER MAPPINGS - Map these variations to our fields:
-        
-        EXPERIENCE (put in "experience"):
-        - "Work Experience", "Professional Experience", "Employment History", "Career History"
-        - "Work History", "Professional Background", "Experience", "Internships"
-        - "Relevant Experience", "Industry Experience"
-        
-        EDUCATION (put in "education"):
-        - "Education", "Academic Background", "Educational Qualifications", "Academic History"
-        - "Degrees", "Schooling", "Academic Credentials"
-        
-        PROJECTS (put in "projects"):
-        - "Projects", "Personal Projects", "Academic Projects", "Key Projects"
-        - "Technical Projects", "Portfolio", "Side Projects"
-        
-        SKILLS (put in "skills"):
-        - "Skills", "Technical Skills", "Core Competencies", "Key Skills"
-        - "Expertise", "Proficiencies", "Technologies", "Tools & Technologies"
-        
-        ACHIEVEMENTS (put in "achievements"):
-        - "Achievements", "Certifications", "Awards", "Honors"
-        - "Accomplishments", "Courses", "Licenses", "Publications"
-        - "Achievements & Certifications", "Awards & Honors"
-        
-        RESPONSIBILITIES (put in "responsibilities"):
-        - "Positions of Responsibility", "Leadership", "Extracurriculars"
-        - "Volunteer Work", "Community Involvement", "Activities"
-        - "Leadership Experience", "Organizational Roles"
-        
-        Rules:
-        - If a field is missing, use empty string or empty list. 
-        - Do not invent data.
-        - IMPORTANT for experience:
-          * "role" = the job title (e.g. "Founders Office Intern", "Software Engineer", "Marketing Manager")
-          * "company" = the company/startup name (e.g. "Pinch", "Google", "StampMyVisa")
-          * Do NOT swap these - role is what you DO, company is WHERE you work
-        - Return ONLY the raw JSON string. No markdown formatting.
-        """
-
-        completion = client.chat.completions.create(
-            messages=[
-                { "role": "system", "content": system_prompt },
-                { "role": "user", "content": f"Resume Text:\n{text}" }
-            ],
-            model="llama-3.3-70b-versatile",
-            temperature=0,
-            stream=False,
-        )
-
-        result = completion.choices[0].message.content
+        # 2. Call Groq (shared client: pooled connection, rate limits, retries)
+        if not is_configured():
+            return {"error": "GROQ_API_KEY missing"}
+
+        messages, pre = build_messages(text)
+
+        completion = await get_llm().chat(messages, model=MODEL_NAME, temperature=0)
+
+        stats["prompt_tokens"] = completion.prompt_tokens
+        stats["completion_tokens"] = completion.completion_tokens
+
+        result = completion.text
         
         # Clean result
         result = result.replace("```json", "").replace("```", "").strip()
         
         # Validate JSON
         parsed_json = json.loads(result)
-        
-        # Output to stdout
-        print(json.dumps(parsed_json))
+        if pre:
+            parsed_json = merge(pre, parsed_json)
+
+        # temperature=0, so the output is deterministic for this text + prompt version
+        if cache:
+            cache.put("text", text_key, parsed_json)
+            cache.put("pdf", pdf_key, parsed_json)
+
+        return parsed_json
 
     except Exception as e:
-        error_info = {
+        return {
             "error": str(e),
             "trace": traceback.format_exc()
         }
-        print(json.dumps(error_info))
+
+def parse_resume(file_path, stats=None):
+    return run_sync(parse_resume_async(file_path, stats=stats))
+
+async def handle_request(request):
+    # --serve mode: {"id": ..., "file": "/path/to/resume.pdf"} or {"id": ..., "op": "cache_stats"}
+    if request.get("op") == "cache_stats":
+        cache = get_cache()
+        return cache.stats() if cache else {"error": "Parse cache disabled"}
+
+    file_path = request.get("file")
+    if not file_path:
+        return {"error": "No file path provided"}
+    return await parse_resume_async(file_path)
 
 if __name__ == "__main__":
     if len(sys.argv) < 2:
         print(json.dumps({"error": "No file path provided"}))
+    elif sys.argv[1] == "--serve":
+        # Long-lived worker: imports, .env and the Groq client are loaded once for many uploads
+        serve(handle_request, max_workers=PARSER_WORKERS)
     else:
-        parse_resume(sys.argv[1])
+        print(json.dumps(parse_resume(sys.argv[1])))
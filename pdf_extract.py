@@ -0,0 +1,75 @@
+import os
+import atexit
+import threading
+import multiprocessing
+from io import BytesIO
+from concurrent.futures import ProcessPoolExecutor
+from pypdf import PdfReader
+
+# PDF text extraction stage for parser.py.
+# Short resumes are extracted inline; long CVs/portfolios are split into page ranges that
+# run on a shared process pool. Pages are yielded in order as soon as they are ready.
+
+MAX_PAGES = int(os.getenv("PDF_MAX_PAGES", "40"))
+MAX_CHARS = int(os.getenv("PDF_MAX_CHARS", "100000"))
+EXTRACT_WORKERS = int(os.getenv("PDF_EXTRACT_WORKERS", str(min(4, os.cpu_count() or 1))))
+PARALLEL_MIN_PAGES = 4  # below this, pool overhead costs more than it saves
+PAGES_PER_TASK = 2
+
+_pool = None
+_pool_lock = threading.Lock()
+
+def get_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # spawn, not fork: the parser service forks from a multi-threaded process
+            _pool = ProcessPoolExecutor(
+                max_workers=EXTRACT_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+            atexit.register(_pool.shutdown, cancel_futures=True)
+    return _pool
+
+def _extract_range(pdf_bytes, start, stop):
+    reader = PdfReader(BytesIO(pdf_bytes))
+    return [reader.pages[i].extract_text() or "" for i in range(start, stop)]
+
+def _page_batches(pdf_bytes, num_pages):
+    # Yields lists of page texts in page order
+    if num_pages < PARALLEL_MIN_PAGES or EXTRACT_WORKERS <= 1:
+        reader = PdfReader(BytesIO(pdf_bytes))
+        for i in range(num_pages):
+            yield [reader.pages[i].extract_text() or ""]
+        return
+
+    pool = get_pool()
+    futures = [
+        pool.submit(_extract_range, pdf_bytes, start, min(start + PAGES_PER_TASK, num_pages))
+        for start in range(0, num_pages, PAGES_PER_TASK)
+    ]
+    try:
+        for future in futures:
+            yield future.result()
+    finally:
+        # Stopped early (char cap hit or consumer gave up): drop work that hasn't started
+        for future in futures:
+            future.cancel()
+
+def iter_page_text(pdf_bytes, max_pages=MAX_PAGES, max_chars=MAX_CHARS):
+    reader = PdfReader(BytesIO(pdf_bytes))
+    num_pages = min(len(reader.pages), max_pages)
+
+    remaining = max_chars
+    for batch in _page_batches(pdf_bytes, num_pages):
+        for page_text in batch:
+            if len(page_text) >= remaining:
+                yield page_text[:remaining]
+                return
+            remaining -= len(page_text)
+            yield page_text
+
+def extract_text(pdf_bytes, max_pages=MAX_PAGES, max_chars=MAX_CHARS):
+    pages = list(iter_page_text(pdf_bytes, max_pages=max_pages, max_chars=max_chars))
+    # Same layout as the old serial loop: every page followed by a newline
+    return "".join(page + "\n" for page in pages)
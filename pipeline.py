@@ -0,0 +1,163 @@
+import os
+import sys
+import time
+import random
+import hashlib
+import argparse
+import multiprocessing
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from humanizer import humanize_bullet
+from humanizerPM import humanize_and_indianize
+from apply_quality_filters import process_bullet
+from corpus import CORPUS_PATH, bullet_hash, ensure_jsonl, iter_records, source_path, write_records
+
+# Post-processing runner for the synthetic bullets in the corpus (see corpus.py).
+# The rewriters jitter numbers and escape LaTeX, so applying one twice changes a bullet again.
+# Every record lists the stages it has been through; a run only applies the stages a bullet is
+# missing, composes all requested stages in one streaming pass, and rewrites the corpus once
+# at the end (or not at all when nothing is pending).
+# Usage:
+#   python pipeline.py                          (every stage, in order)
+#   python pipeline.py indianize quality
+#   python pipeline.py --mark-applied humanize  (record stages already applied to today's corpus)
+#   python pipeline.py --workers 8 --seed 7     (bulk mode: process pool, same output for any worker count)
+
+# Stage name -> transform(text, rng) and the domains whose synthetic bullets it applies to (None = all)
+STAGES = {
+    "humanize": {"transform": humanize_bullet, "domains": None},
+    "indianize": {"transform": humanize_and_indianize, "domains": {"Product"}},
+    "quality": {"transform": process_bullet, "domains": {"Product", "IT"}},
+}
+STAGE_ORDER = ["humanize", "indianize", "quality"]
+
+PIPELINE_WORKERS = int(os.getenv("PIPELINE_WORKERS", "1"))
+CHUNK_SIZE = 2000  # bullets per process-pool task
+
+def pending_stages(stage_names, record):
+    if record["source"] != "synthetic":
+        return []
+    done = record.get("stages", [])
+    return [
+        name for name in stage_names
+        if name not in done and (STAGES[name]["domains"] is None or record["domain"] in STAGES[name]["domains"])
+    ]
+
+def bullet_rng(seed, domain, text):
+    # Each bullet's RNG depends only on the run seed and the bullet itself, not on which worker
+    # (or in what order) it is processed, so a seeded run is reproducible for any worker count
+    digest = hashlib.sha256(f"{seed}\0{domain}\0{text}".encode("utf-8")).digest()
+    return random.Random(int.from_bytes(digest[:8], "little"))
+
+def rewrite_chunk(chunk, seed=None):
+    # chunk: [(domain, text, stage names)] -> rewritten texts; top-level so worker processes can import it
+    out = []
+    for domain, text, todo in chunk:
+        rng = bullet_rng(seed, domain, text) if seed is not None else None
+        for name in todo:
+            text = STAGES[name]["transform"](text, rng)
+        out.append(text)
+    return out
+
+def chunked(items, size):
+    chunk = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+def bulk_rewrite(tasks, workers=PIPELINE_WORKERS, seed=None, chunk_size=CHUNK_SIZE):
+    # Streams (domain, text, stage names) tasks through a process pool in chunks and yields the
+    # rewritten texts in input order; at most 2 chunks per worker are in flight at once
+    if workers <= 1:
+        for chunk in chunked(tasks, chunk_size):
+            yield from rewrite_chunk(chunk, seed)
+        return
+
+    # spawn, not fork, for the same reason as pdf_extract.get_pool
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+        in_flight = []
+        for chunk in chunked(tasks, chunk_size):
+            in_flight.append(pool.submit(rewrite_chunk, chunk, seed))
+            if len(in_flight) >= workers * 2:
+                yield from in_flight.pop(0).result()
+        for future in in_flight:
+            yield from future.result()
+
+def rewrite_records(records, stage_names, workers=PIPELINE_WORKERS, seed=None, mark_only=False, stats=None):
+    # Yields every record in input order, with its pending stages applied and recorded.
+    # Records with nothing pending ride along as no-op tasks, so only the in-flight window is buffered.
+    buffered = deque()
+
+    def tasks():
+        for record in records:
+            todo = pending_stages(stage_names, record)
+            buffered.append((record, todo))
+            yield record["domain"], record["text"], [] if mark_only else todo
+
+    for new_text in bulk_rewrite(tasks(), workers=workers, seed=seed):
+        record, todo = buffered.popleft()
+        if todo:
+            if stats is not None:
+                stats["processed"] += 1
+            if new_text != record["text"]:
+                if stats is not None:
+                    stats["changed"] += 1
+                record = {**record, "text": new_text, "hash": bullet_hash(record["domain"], new_text)}
+            record = {**record, "stages": record.get("stages", []) + todo}
+        yield record
+
+def run_pipeline(stage_names=STAGE_ORDER, path=CORPUS_PATH, mark_only=False, dry_run=False, workers=PIPELINE_WORKERS, seed=None):
+    if not os.path.exists(source_path(path)):
+        print(f"Error: {path} not found.")
+        return None
+
+    start = time.perf_counter()
+    if not dry_run:
+        ensure_jsonl(path)
+    pending = sum(1 for record in iter_records(path) if pending_stages(stage_names, record))
+    action = "Would mark" if mark_only else "Would process"
+    if not pending or dry_run:
+        print(f"{action if dry_run else 'Nothing to do:'} {pending} synthetic bullets pending [{', '.join(stage_names)}] "
+              f"({(time.perf_counter() - start) * 1000:.0f} ms).")
+        return {"processed": 0, "changed": 0, "pending": pending}
+
+    stats = {"processed": 0, "changed": 0, "pending": pending}
+    rewrite_start = time.perf_counter()
+    total = write_records(rewrite_records(iter_records(path), stage_names, workers=workers, seed=seed, mark_only=mark_only, stats=stats), path)
+    rewrite_seconds = max(time.perf_counter() - rewrite_start, 1e-9)
+
+    stats["seconds"] = time.perf_counter() - start
+    action = "Marked" if mark_only else "Processed"
+    print(f"{action} {stats['processed']}/{total} bullets with [{', '.join(stage_names)}], "
+          f"{stats['changed']} changed in {stats['seconds'] * 1000:.0f} ms.")
+    if not mark_only:
+        print(f"Throughput: {total / rewrite_seconds:.0f} bullets/sec streamed, {stats['processed']} rewritten, with {workers} worker(s).")
+    return stats
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Apply post-processing stages to synthetic bullets, once per bullet.")
+    arg_parser.add_argument("stages", nargs="*", help=f"Stages to apply (default: all); they always run in the order {', '.join(STAGE_ORDER)}")
+    arg_parser.add_argument("--mark-applied", action="store_true", help="Record the stages as applied without transforming anything")
+    arg_parser.add_argument("--dry-run", action="store_true", help="Report what would change, write nothing")
+    arg_parser.add_argument("--seed", type=int, help="Seed the per-bullet jitter RNG for a reproducible run")
+    arg_parser.add_argument("--workers", type=int, default=PIPELINE_WORKERS, help="Worker processes for the rewrite (bulk mode when > 1)")
+    args = arg_parser.parse_args()
+
+    unknown = [name for name in args.stages if name not in STAGES]
+    if unknown:
+        arg_parser.error(f"unknown stage(s): {', '.join(unknown)}")
+
+    stage_names = [name for name in STAGE_ORDER if name in (args.stages or STAGE_ORDER)]
+    seed = args.seed
+    if seed is None and args.workers > 1:
+        # Worker processes don't share the global RNG; pick a seed and say so, so the run can be repeated
+        seed = random.randrange(2 ** 32)
+        print(f"Using seed {seed}")
+    run_pipeline(stage_names, mark_only=args.mark_applied, dry_run=args.dry_run, workers=args.workers, seed=seed)
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,267 @@
+import os
+import sys
+import json
+import itertools
+import numpy as np
+from corpus import CORPUS_PATH, iter_records
+
+# Batch quality scoring for bullets. Instead of running checks bullet by bullet, a batch is joined
+# into one newline-separated byte string: character-class features (digits, braces, LaTeX specials,
+# trailing spaces, numbers and their units) are NumPy operations over its bytes, words are packed
+# into integers so verb and phrase lists are np.isin lookups, and positions are mapped back to
+# bullets with searchsorted/bincount. Nothing loops over bullets in Python except the duplicate keys.
+# A stream scored in several calls (clean.py's batches) shares one DuplicateIndex between them.
+# Features per bullet (all NumPy arrays, in input order):
+#   length, metrics (numbers with a unit: 40%, $2M, 3x, 500 users), numbers (any digit run),
+#   strong_start / weak_start (first word, same verb lists as the editor's ResumePreview),
+#   weak_phrases ("helped", "worked on", "responsible for" anywhere), vague ("various", "several"),
+#   brace_balance ("{" minus "}"), unescaped (bare %, $, &, #), truncated (clean.py's check:
+#   trailing space or an unclosed "{"), duplicates (other bullets equal up to case, digits and
+#   punctuation), first_copy, and score (0-100).
+# Usage:
+#   python quality.py [corpus.jsonl]      (score distribution and the weakest bullets)
+
+QUALITY_MIN_SCORE = float(os.getenv("QUALITY_MIN_SCORE", "50"))
+MIN_LENGTH = 60     # script.is_high_quality's threshold
+MAX_LENGTH = 300
+SCORE_BATCH = 100_000  # bullets per vectorized pass, so temporaries stay around 100 MB
+
+STRONG_VERBS = [
+    "led", "built", "designed", "increased", "reduced", "launched", "managed", "created", "developed",
+    "implemented", "achieved", "grew", "generated", "drove", "spearheaded", "optimized", "secured",
+    "negotiated", "architected", "automated", "engineered", "shipped", "migrated", "scaled", "streamlined",
+    "delivered", "owned", "cut", "improved", "accelerated", "mentored",
+]
+WEAK_VERBS = [
+    "helped", "assisted", "worked", "participated", "supported", "contributed", "involved", "attended",
+    "learned", "observed", "handled", "tasked", "responsible",
+]
+WEAK_PHRASES = [
+    "helped", "assisted", "worked on", "worked with", "participated in", "responsible for", "tasked with",
+    "involved in", "contributed to", "was part of",
+]
+VAGUE_WORDS = ["various", "multiple", "different", "several", "many", "some", "etc"]
+
+UNIT_WORDS = [
+    "x", "k", "m", "b", "users", "customers", "clients", "people", "teams", "members", "employees", "engineers",
+    "hours", "days", "weeks", "months", "projects", "requests", "transactions", "events",
+]
+
+FEATURES = ["length", "metrics", "numbers", "strong_start", "weak_start", "weak_phrases", "vague",
+            "brace_balance", "unescaped", "truncated"]
+
+NEWLINE, SPACE, BACKSLASH, OPEN, CLOSE = 10, 32, 92, 123, 125
+DOLLAR, PERCENT, PLUS, COMMA, PERIOD = 36, 37, 43, 44, 46
+LOWER_A, LOWER_Z, DIGIT_0, DIGIT_9 = ord("a"), ord("z"), ord("0"), ord("9")
+LATEX_SPECIALS = ord("#"), ord("&")  # "#$%&", consecutive bytes
+NOT_LETTERS = bytes(b for b in range(256) if not (LOWER_A <= b <= LOWER_Z or b == NEWLINE))
+
+# Words are compared as integers, 5 bits a letter, so a word list is one np.isin over the candidates.
+# No listed word is longer than CODE_LETTERS letters.
+CODE_LETTERS = 12
+
+def _code(word):
+    return sum((ord(c) - LOWER_A + 1) << (5 * i) for i, c in enumerate(word))
+
+def _codes(words):
+    return np.array(sorted({_code(w) for w in words}), dtype=np.int64)
+
+def _phrase_codes(phrases):
+    # Multi-word phrases are matched word by word: one code array per position in the phrase
+    return [[_code(w) for w in phrase.split()] for phrase in phrases]
+
+STRONG_CODES = _codes(STRONG_VERBS)
+WEAK_CODES = _codes(WEAK_VERBS)
+VAGUE_CODES = _codes(VAGUE_WORDS)
+UNIT_CODES = _codes(UNIT_WORDS)
+WEAK_PHRASE_CODES = _phrase_codes(WEAK_PHRASES)
+
+# First two letters and length of every listed word; other words are never packed into codes
+SHAPES = np.zeros((1 << 16, CODE_LETTERS + 2), dtype=bool)
+for _word in STRONG_VERBS + WEAK_VERBS + VAGUE_WORDS + [w for p in WEAK_PHRASES for w in p.split()]:
+    SHAPES[ord(_word[0]) << 8 | ord(_word[1]), len(_word)] = True
+
+def _word_codes(padded, positions, lengths):
+    codes = np.zeros(len(positions), dtype=np.int64)
+    for i in range(CODE_LETTERS):
+        letter = padded[positions + i].astype(np.int64) - (LOWER_A - 1)
+        codes |= np.where(i < lengths, letter, 0) << (5 * i)
+    codes[lengths > CODE_LETTERS] = -1
+    return codes
+
+def _between(data, low, high):
+    # low <= byte <= high in two passes: below low wraps around past high
+    return (data - np.uint8(low)) <= high - low
+
+def _run_starts(mask):
+    # True where a run of True begins
+    edge = np.empty_like(mask)
+    edge[0] = mask[0]
+    np.greater(mask[1:], mask[:-1], out=edge[1:])
+    return edge
+
+def _run_ends(mask):
+    # Positions one past the end of each run of True; mask must end in False
+    return np.flatnonzero(mask[:-1] > mask[1:]) + 1
+
+class DuplicateIndex:
+    """Duplicate keys seen so far, for scoring one stream of bullets over several score_bullets calls."""
+
+    def __init__(self):
+        self.ids = {}  # letters of a bullet -> stream position of its first copy
+        self.counts = np.zeros(0, dtype=np.int64)  # copies seen, by first-copy position
+        self.seen = 0
+
+def _score_batch(texts, seen):
+    blob = "\n".join(texts)
+    if blob.count("\n") != len(texts) - 1:
+        texts = [t.replace("\n", " ") for t in texts]
+        blob = "\n".join(texts)
+    encoded = blob.lower().encode("utf-8")
+    # Padded so a fixed-width look ahead from any byte stays in bounds. data keeps one zero byte past the
+    # text, so every run of a mask over it ends inside it and data[-1] (the byte "before" position 0) is 0.
+    padded = np.frombuffer(encoded + bytes(CODE_LETTERS + 1), dtype=np.uint8)
+    data = padded[:len(encoded) + 1]
+    newline = data == NEWLINE
+    letters = _between(data, LOWER_A, LOWER_Z)
+    digits = _between(data, DIGIT_0, DIGIT_9)
+
+    # Words are runs of a-z. Word starts and newlines in one pass give each word its bullet by a running
+    # count of the newlines before it.
+    events = np.flatnonzero(_run_starts(letters) | newline)
+    is_newline = newline[events]
+    word_starts = events[~is_newline]
+    word_line = np.cumsum(is_newline)[~is_newline]
+    word_ends = _run_ends(letters)
+    newlines = events[is_newline]
+    starts = np.concatenate(([0], newlines + 1))
+    ends = np.append(newlines, len(encoded))
+    def per_line(positions):
+        return np.bincount(np.searchsorted(starts, positions, side="right") - 1, minlength=len(texts))
+    def unescaped(positions):
+        # "\%" and "\{" are escapes, not specials or braces
+        return positions[data[positions - 1] != BACKSLASH]
+
+    # Only words shaped like a listed word get a code; the rest stay 0
+    word_lengths = np.minimum(word_ends - word_starts, CODE_LETTERS + 1)
+    codes = np.zeros(len(word_starts), dtype=np.int64)
+    bigrams = padded[word_starts].astype(np.int64) << 8 | padded[word_starts + 1]
+    candidates = np.flatnonzero(SHAPES[bigrams, word_lengths])
+    codes[candidates] = _word_codes(padded, word_starts[candidates], word_lengths[candidates])
+
+    # Phrases match word by word, within one bullet; every listed word is a candidate, so only those are looked at
+    candidate_codes = codes[candidates]
+    phrase_lines = []
+    for phrase in WEAK_PHRASE_CODES:
+        hit = candidates[candidate_codes == phrase[0]]
+        for offset, code in enumerate(phrase[1:], 1):
+            hit = hit[hit + offset < len(codes)]
+            hit = hit[(codes[hit + offset] == code) & (word_line[hit + offset] == word_line[hit])]
+        phrase_lines.append(word_line[hit])
+
+    # Code of each bullet's first word (its first run of letters); -1 for a bullet without one
+    words_per_line = np.bincount(word_line, minlength=len(texts))
+    first_word = np.cumsum(words_per_line) - words_per_line
+    first_code = np.where(words_per_line > 0, np.append(codes, -1)[first_word], -1)
+
+    # Metrics: a run of digits, "," and "." followed by an optional space and a unit (%, +, x, k, M, B, users, ...),
+    # or with a "$" in front
+    digit_runs = np.flatnonzero(_run_starts(digits))
+    numeric = digits | (data == COMMA) | (data == PERIOD)
+    run_starts = np.flatnonzero(_run_starts(numeric))
+    run_ends = _run_ends(numeric)
+    has_digit = np.searchsorted(digit_runs, run_starts) < np.searchsorted(digit_runs, run_ends)
+    run_starts, run_ends = run_starts[has_digit], run_ends[has_digit]
+    unit_at = run_ends + (padded[run_ends] == SPACE)
+    after = padded[unit_at]
+    unit_word = np.zeros(len(unit_at), dtype=bool)
+    at_word = np.flatnonzero(_between(after, LOWER_A, LOWER_Z))
+    word_index = np.searchsorted(word_starts, unit_at[at_word])
+    unit_lengths = word_ends[word_index] - word_starts[word_index]
+    unit_word[at_word] = np.isin(_word_codes(padded, unit_at[at_word], unit_lengths), UNIT_CODES)
+    unit = (unit_word | (after == PERCENT) | (after == PLUS)
+            | ((after == BACKSLASH) & (padded[unit_at + 1] == PERCENT)))
+    before = data[np.maximum(run_starts - 1, 0)]
+    dollar = (run_starts > 0) & ((before == DOLLAR)
+                                 | ((before == SPACE) & (data[np.maximum(run_starts - 2, 0)] == DOLLAR)))
+
+    features = {
+        "length": np.fromiter(map(len, texts), dtype=np.int64, count=len(texts)),
+        "metrics": per_line(run_starts[unit | dollar]),
+        "numbers": per_line(digit_runs),
+        "strong_start": np.isin(first_code, STRONG_CODES),
+        "weak_start": np.isin(first_code, WEAK_CODES),
+        "weak_phrases": np.bincount(np.concatenate(phrase_lines), minlength=len(texts)),
+        "vague": np.bincount(word_line[candidates[np.isin(candidate_codes, VAGUE_CODES)]], minlength=len(texts)),
+        "brace_balance": (per_line(unescaped(np.flatnonzero(data == OPEN)))
+                          - per_line(unescaped(np.flatnonzero(data == CLOSE)))),
+        "unescaped": per_line(unescaped(np.flatnonzero(_between(data, *LATEX_SPECIALS)))),
+    }
+    trailing_space = (ends > starts) & (data[np.maximum(ends - 1, 0)] == SPACE)
+    features["truncated"] = trailing_space | (features["brace_balance"] > 0)
+
+    # Duplicate keys: the letters of each bullet, so case, digits and punctuation don't count. A key is the
+    # stream position of the bullet's first copy, so it is the same however the stream is batched.
+    letter_bytes = encoded.translate(None, NOT_LETTERS).split(b"\n")
+    key = np.fromiter(map(seen.ids.setdefault, letter_bytes, itertools.count(seen.seen)),
+                      dtype=np.int64, count=len(texts))
+    seen.seen += len(texts)
+    return features, key
+
+def score_bullets(texts, batch_size=SCORE_BATCH, seen=None):
+    """Features and score per bullet. Pass the same DuplicateIndex to calls that score one stream in
+    parts: duplicates and first_copy then count every bullet of the earlier calls too."""
+    texts = texts if isinstance(texts, list) else list(texts)
+    seen = seen if seen is not None else DuplicateIndex()
+    if not texts:
+        empty = {name: np.zeros(0, dtype=np.int64) for name in FEATURES + ["duplicates"]}
+        return {**empty, "first_copy": np.zeros(0, dtype=bool), "score": np.zeros(0, dtype=np.float32)}
+
+    offset = seen.seen
+    batches = [_score_batch(texts[i:i + batch_size], seen) for i in range(0, len(texts), batch_size)]
+    features = {name: np.concatenate([b[0][name] for b in batches]) for name in FEATURES}
+    key = np.concatenate([b[1] for b in batches])
+
+    counts = np.bincount(key, minlength=seen.seen)
+    counts[:len(seen.counts)] += seen.counts
+    seen.counts = counts
+    features["duplicates"] = counts[key] - 1
+    features["first_copy"] = key == np.arange(offset, seen.seen)
+
+    features["score"] = _score(features)
+    return features
+
+def _score(f):
+    score = np.full(len(f["length"]), 40.0, dtype=np.float32)
+    # Impact: a number with a unit beats a bare number
+    score += np.where(f["metrics"] > 0, 30, np.where(f["numbers"] > 0, 15, 0))
+    score += np.where(f["strong_start"], 15, 0)
+    score -= np.where(f["weak_start"], 20, 0)
+    score -= 5 * np.minimum(f["weak_phrases"] - f["weak_start"], 2).clip(0)
+    score -= 5 * np.minimum(f["vague"], 3)
+    score += np.where(f["length"] < MIN_LENGTH, -20, np.where(f["length"] > MAX_LENGTH, -10, 10))
+    # Bullets go straight into LaTeX: unbalanced braces or bare specials break the build
+    score -= np.where(f["truncated"], 40, np.where(f["brace_balance"] < 0, 20, 0))
+    score -= np.where(f["unescaped"] > 0, 10, 0)
+    score -= np.where(f["first_copy"], 0, 30)
+    return score.clip(0, 100)
+
+def quality_mask(texts, min_score=QUALITY_MIN_SCORE):
+    return score_bullets(texts)["score"] >= min_score
+
+def main():
+    path = sys.argv[1] if len(sys.argv) > 1 else CORPUS_PATH
+    texts = [record["text"] for record in iter_records(path)]
+    features = score_bullets(texts)
+    score = features["score"]
+    weakest = np.argsort(score, kind="stable")[:5]
+    print(json.dumps({
+        "bullets": len(texts),
+        "passing": int((score >= QUALITY_MIN_SCORE).sum()),
+        "min_score": QUALITY_MIN_SCORE,
+        "score_percentiles": {p: float(np.percentile(score, p)) for p in (10, 50, 90)} if len(texts) else {},
+        "weakest": [{"score": float(score[i]), "text": texts[i]} for i in weakest],
+    }, indent=2, ensure_ascii=False))
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,9 +1,16 @@
 import os
 import sys
 import json
-import google.generativeai as genai
-from pinecone import Pinecone
+import time
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
+from embeddings import get_embedder
+from jsonl_worker import serve
+from bm25 import corpus_version, get_bm25_index, rrf_fuse
+from domain_router import get_domain_router, domain_namespace, resume_text
+from search_cache import TTLCache, USE_SEARCH_CACHE, normalize_query, current_index_version
 
 # Load Env
 script_dir = os.path.dirname(os.path.abspath(__file__))
@@ -13,33 +20,47 @@ load_dotenv(dotenv_path=env_path)
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
 PINECONE_API_KEY = os.getenv("PINECONE_API_KEY")
 
-if not GEMINI_API_KEY or not PINECONE_API_KEY:
+# "pinecone" or "local" (in-process NumPy index built by `VECTOR_BACKEND=local python vector_db.py`)
+VECTOR_BACKEND = os.getenv("VECTOR_BACKEND", "pinecone")
+# Must match the setting vector_db.py indexed with
+USE_NAMESPACES = os.getenv("PINECONE_NAMESPACES", "0") == "1"
+INDEX_NAME = "resume-bullets"
+SEARCH_WORKERS = int(os.getenv("SEARCH_WORKERS", "8"))
+# "auto" (lexical for keyword-like queries, hybrid otherwise), "hybrid", "vector" or "lexical"
+SEARCH_MODE = os.getenv("SEARCH_MODE", "auto")
+SEARCH_MODES = ("auto", "hybrid", "vector", "lexical")
+# Each side of a hybrid query contributes this many times top_k candidates to the fusion
+HYBRID_CANDIDATES = 4
+
+missing_keys = (not GEMINI_API_KEY and os.getenv("EMBEDDER") != "fake") or (VECTOR_BACKEND == "pinecone" and not PINECONE_API_KEY)
+if missing_keys:
     print(json.dumps({"error": "Missing API Keys"}))
     sys.exit(1)
 
-genai.configure(api_key=GEMINI_API_KEY)
-pc = Pinecone(api_key=PINECONE_API_KEY)
-INDEX_NAME = "resume-bullets"
+# Query embeddings go through the persistent cache, so repeated queries skip the Gemini call
+query_embedder = get_embedder(task_type="retrieval_query")
 
-def search(query, top_k=5):
-    try:
-        # 1. Embed Query
-        embedding_result = genai.embed_content(
-            model="models/text-embedding-004",
-            content=query,
-            task_type="retrieval_query"
-        )
-        vector = embedding_result['embedding']
+class PineconeBackend:
+    def __init__(self):
+        from pinecone import Pinecone
+        self.index = Pinecone(api_key=PINECONE_API_KEY).Index(INDEX_NAME)
+        self.namespaces = []
+        if USE_NAMESPACES:
+            stats = self.index.describe_index_stats()
+            namespaces = getattr(stats, "namespaces", None)
+            self.namespaces = list(namespaces if namespaces is not None else stats.get("namespaces", {}))
+            self.pool = ThreadPoolExecutor(max_workers=max(1, len(self.namespaces)))
 
-        # 2. Query Pinecone
-        index = pc.Index(INDEX_NAME)
-        results = index.query(
+    def query(self, vector, top_k, metadata_filter, namespace=None):
+        kwargs = {"namespace": namespace} if namespace is not None else {}
+        results = self.index.query(
             vector=vector,
             top_k=top_k,
-            include_metadata=True
+            include_metadata=True,
+            filter=metadata_filter or None,
+            **kwargs
         )
 
-        # 3. Format Results
         matches = []
         for match in results.matches:
             matches.append({
@@ -47,15 +68,200 @@ def search(query, top_k=5):
                 "score": match.score,
                 "domain": match.metadata.get("domain", "general")
             })
+        return matches
+
+    def search(self, vector, top_k=5, domain=None, bullet_type=None):
+        metadata_filter = {}
+        if bullet_type:
+            metadata_filter["type"] = {"$eq": bullet_type}
+
+        if not USE_NAMESPACES:
+            if domain:
+                metadata_filter["domain"] = {"$eq": domain}
+            return self.query(vector, top_k, metadata_filter)
+
+        # Namespaced index: a domain query searches only its partition; a global one fans out and merges
+        if domain:
+            return self.query(vector, top_k, metadata_filter, namespace=domain_namespace(domain))
+        per_namespace = self.pool.map(lambda ns: self.query(vector, top_k, metadata_filter, namespace=ns), self.namespaces)
+        merged = [m for matches in per_namespace for m in matches]
+        return sorted(merged, key=lambda m: -m["score"])[:top_k]
+
+def get_backend(name=VECTOR_BACKEND):
+    if name == "local":
+        from local_index import LocalVectorIndex
+        return LocalVectorIndex()
+    return PineconeBackend()
+
+_backend = None
+_backend_version = None
+_backend_lock = threading.Lock()
+
+# In front of the persistent embedding cache and the index; results are dropped when the vector index
+# version changes and keyed by the BM25 corpus version when BM25 ranked them
+embedding_cache = TTLCache()
+result_cache = TTLCache()
+
+def backend():
+    # Opened once per process and shared by every request in --serve mode;
+    # reopened (and cached results dropped) after vector_db.py bumps the index version
+    global _backend, _backend_version
+    version = current_index_version()
+    with _backend_lock:
+        if _backend is None or version != _backend_version:
+            if _backend is not None:
+                result_cache.clear()
+            _backend = get_backend()
+            _backend_version = version
+        return _backend
+
+def embed_queries(queries):
+    vectors = [embedding_cache.get(q) if USE_SEARCH_CACHE else None for q in queries]
+    missing = [i for i, v in enumerate(vectors) if v is None]
+    if missing:
+        fresh = query_embedder.embed([queries[i] for i in missing])
+        for i, vector in zip(missing, fresh):
+            vectors[i] = vector
+            if USE_SEARCH_CACHE:
+                embedding_cache.put(queries[i], vector)
+    return vectors
+
+def resolve_mode(query, mode=SEARCH_MODE):
+    if mode not in SEARCH_MODES:
+        raise ValueError(f"Unknown search mode: {mode}")
+    if mode in ("auto", "hybrid") and corpus_version() is None:
+        return "vector"  # no local corpus, so nothing for BM25 to rank
+    if mode == "auto":
+        return "lexical" if get_bm25_index().is_keyword_query(query) else "hybrid"
+    return mode
+
+def resolve_domain(query, domain=None, resume=None):
+    # domain="auto" picks one from the query (and parsed resume, if given); None when unsure
+    if domain != "auto":
+        return domain
+    router = get_domain_router()
+    if router is None:
+        return None
+    text = query if not resume else f"{query}\n{resume_text(resume)}"
+    return router.detect(text)
 
-        print(json.dumps(matches))
+def search_many(queries, top_k=5, domain=None, bullet_type=None, mode=SEARCH_MODE, resume=None):
+    modes = [resolve_mode(q, mode) for q in queries]
+    domains = [resolve_domain(q, domain, resume) for q in queries]
+    store = backend()  # also drops stale cached results if the index changed
 
+    # get_bm25_index rebuilds when the corpus file changes; results it ranked must not outlive that
+    lexical_version = corpus_version() if any(m != "vector" for m in modes) else None
+    # Normalized for the cache key only; the query as typed is what gets embedded and ranked
+    keys = [(normalize_query(q), top_k, d, bullet_type, m, lexical_version if m != "vector" else None)
+            for q, d, m in zip(queries, domains, modes)]
+    results = [result_cache.get(k) if USE_SEARCH_CACHE else None for k in keys]
+    pending = [i for i, r in enumerate(results) if r is None]
+
+    # One embedding call for every uncached query in the batch that needs a vector; lexical ones need none
+    needs_vector = [i for i in pending if modes[i] != "lexical"]
+    vectors = {}
+    if needs_vector:
+        vectors = dict(zip(needs_vector, embed_queries([queries[i] for i in needs_vector])))
+
+    for i in pending:
+        query, query_mode = queries[i], modes[i]
+        filters = {"domain": domains[i], "bullet_type": bullet_type}
+        if query_mode == "lexical":
+            matches = get_bm25_index().search(query, top_k=top_k, **filters)
+        elif query_mode == "vector":
+            matches = store.search(vectors[i], top_k=top_k, **filters)
+        else:
+            candidates = top_k * HYBRID_CANDIDATES
+            dense = store.search(vectors[i], top_k=candidates, **filters)
+            lexical = get_bm25_index().search(query, top_k=candidates, **filters)
+            matches = rrf_fuse([dense, lexical], top_k=top_k)
+        results[i] = matches
+        if USE_SEARCH_CACHE:
+            result_cache.put(keys[i], matches)
+
+    # Copies, so a caller editing its matches can't change what later queries get from the cache
+    return [[dict(m) for m in matches] for matches in results]
+
+def search(query, top_k=5, domain=None, bullet_type=None, mode=SEARCH_MODE, resume=None):
+    # Returns the list of {"text", "score", "domain"} matches (or {"error": ...})
+    try:
+        return search_many([query], top_k=top_k, domain=domain, bullet_type=bullet_type, mode=mode, resume=resume)[0]
     except Exception as e:
-        print(json.dumps({"error": str(e)}))
+        return {"error": str(e)}
+
+class LatencyStats:
+    # Rolling window of request latencies for the --serve metrics op
+    def __init__(self, window=1000):
+        self.samples = deque(maxlen=window)
+        self.total = 0
+        self.errors = 0
+        self.lock = threading.Lock()
+
+    def record(self, seconds, error=False):
+        with self.lock:
+            self.samples.append(seconds)
+            self.total += 1
+            self.errors += error
+
+    def percentile(self, ordered, p):
+        if not ordered:
+            return 0.0
+        return ordered[min(len(ordered) - 1, int(round(p / 100 * (len(ordered) - 1))))]
+
+    def snapshot(self):
+        with self.lock:
+            ordered = sorted(self.samples)
+            total, errors = self.total, self.errors
+        return {
+            "requests": total,
+            "errors": errors,
+            "window": len(ordered),
+            "p50_ms": round(self.percentile(ordered, 50) * 1000, 2),
+            "p95_ms": round(self.percentile(ordered, 95) * 1000, 2),
+            "max_ms": round(ordered[-1] * 1000, 2) if ordered else 0.0,
+        }
+
+latency = LatencyStats()
+
+def handle_request(request):
+    # --serve mode requests:
+    #   {"id", "query": "...", "top_k"?, "domain"?, "type"?, "mode"?} -> [matches]
+    #   {"id", "queries": ["...", ...], "top_k"?, ...}                -> [[matches], ...]
+    #   {"id", "op": "metrics"}                                       -> latency percentiles, cache hit counts
+    # "domain" may be "auto" (detected per query; pass the parsed resume as "resume" to help),
+    # "type" is "real" or "synthetic".
+    if request.get("op") == "metrics":
+        return {**latency.snapshot(), "embedding_cache": embedding_cache.stats(), "result_cache": result_cache.stats()}
+
+    start = time.perf_counter()
+    options = {
+        "top_k": int(request.get("top_k", 5)),
+        "domain": request.get("domain"),
+        "bullet_type": request.get("type"),
+        "mode": request.get("mode") or SEARCH_MODE,
+        "resume": request.get("resume"),
+    }
+    try:
+        if "queries" in request:
+            result = search_many(list(request["queries"]), **options)
+        elif "query" in request:
+            result = search_many([request["query"]], **options)[0]
+        else:
+            result = {"error": "No query provided"}
+    except Exception as e:
+        result = {"error": str(e)}
+
+    latency.record(time.perf_counter() - start, error=isinstance(result, dict))
+    return result
 
 if __name__ == "__main__":
     if len(sys.argv) < 2:
         print(json.dumps({"error": "No query provided"}))
+    elif sys.argv[1] == "--serve":
+        # Resident service: clients, index handles and caches stay open across queries
+        backend()
+        serve(handle_request, max_workers=SEARCH_WORKERS)
     else:
         query_text = sys.argv[1]
-        search(query_text)
+        print(json.dumps(search(query_text)))
@@ -1,5 +1,5 @@
 import re
-import random
+from rewrite_engine import RewriteEngine, Replacements, PERCENT_RE, jitter, convert_currency, vary_phrase
 
 # PASTE YOUR FULL 100+ LIST HERE
 raw_bullets = [
@@ -8,61 +8,49 @@ raw_bullets = [
     # ... add all 100 lines here ...
 ]
 
-def batch_process_resumes(bullets):
-    processed = []
-    
-    # Synonyms to break repetitive sentence structures
-    connectors = ["yielding", "driving", "leading to", "facilitating", "contributing to"]
-    
-    for text in bullets:
-        # 1. JITTER NUMBERS (Avoid round numbers)
-        text = re.sub(r'(\d+)%', lambda m: f"{int(m.group(1)) + random.randint(-3, 3)}%", text)
-        
-        # 2. REVENUE BALANCER (The "Anti-Unicorn" Logic)
-        # We only want ~40% of bullets to have money. 
-        # For the rest, we strip the money part to focus on the operational win.
-        has_money = re.search(r'(totaling|resulting in|generating) (an additional )?\$[\d,]+( million)?( in revenue)?', text)
-        
-        if has_money:
-            if random.random() > 0.4: # 60% chance to REMOVE money
-                # Strip the money phrase from the end
-                # e.g., ", totaling $500,000." -> "."
-                text = re.sub(r', (totaling|resulting in|generating) (an additional )?\$[\d,]+( million)?( in revenue( growth)?)?', '', text)
-            else:
-                # 40% chance to KEEP money, but Indianize it
-                def convert_to_rs(match):
-                    raw_str = match.group(0)
-                    if "million" in raw_str:
-                        base = float(re.search(r'[\d\.]+', raw_str).group()) * 1_000_000
-                    else:
-                        base = int(re.sub(r'[$,]', '', raw_str))
-                    
-                    # Convert to INR (approx 85)
-                    val = base * 85
-                    if val >= 10_000_000:
-                        return f"Rs. {val/10_000_000:.2f} Cr"
-                    else:
-                        return f"Rs. {int(val/100_000)} Lakhs"
-
-                text = re.sub(r'\$[\d,]+(\s?million)?', convert_to_rs, text)
-
-        # 3. VARIETY INJECTION
-        # Replace "resulting in" with synonyms so it doesn't sound robotic
-        if "resulting in" in text:
-            text = text.replace("resulting in", random.choice(connectors), 1)
-
-        # 4. TECH INJECTION (Simple mapping)
-        text = text.replace("market trends", "market signals (Google Trends/Nielsen)")
-        text = text.replace("product roadmap", "strategic roadmap (Jira)")
-        
-        processed.append(text)
-
-    return processed
-
-# RUN IT
-fixed_list = batch_process_resumes(raw_bullets)
-
-print(f"--- PROCESSED {len(fixed_list)} BULLETS ---")
-for line in fixed_list[:5]: # Print first 5 to check
-    print(f"\\item {{{line}}}")
-    print("---")
\ No newline at end of file
+# Synonyms to break repetitive sentence structures
+CONNECTORS = ["yielding", "driving", "leading to", "facilitating", "contributing to"]
+
+MONEY_RE = re.compile(r'(totaling|resulting in|generating) (an additional )?\$[\d,]+( million)?( in revenue)?')
+# e.g., ", totaling $500,000." -> "."
+MONEY_PHRASE_RE = re.compile(r', (totaling|resulting in|generating) (an additional )?\$[\d,]+( million)?( in revenue( growth)?)?')
+
+indianize_currency = convert_currency()
+
+def balance_revenue(text, rng):
+    # The "Anti-Unicorn" Logic
+    # We only want ~40% of bullets to have money.
+    # For the rest, we strip the money part to focus on the operational win.
+    if not MONEY_RE.search(text):
+        return text
+    if rng.random() > 0.4: # 60% chance to REMOVE money
+        return MONEY_PHRASE_RE.sub('', text)
+    # 40% chance to KEEP money, but Indianize it (approx 85 INR per USD)
+    return indianize_currency(text, rng)
+
+ENGINE = RewriteEngine([
+    # 1. JITTER NUMBERS (Avoid round numbers)
+    jitter(PERCENT_RE, -3, 3, "{}%"),
+    # 2. REVENUE BALANCER
+    balance_revenue,
+    # 3. VARIETY INJECTION
+    # Replace "resulting in" with synonyms so it doesn't sound robotic
+    vary_phrase("resulting in", CONNECTORS),
+    # 4. TECH INJECTION (Simple mapping)
+    Replacements({
+        "market trends": "market signals (Google Trends/Nielsen)",
+        "product roadmap": "strategic roadmap (Jira)"
+    }),
+])
+
+def batch_process_resumes(bullets, rng=None):
+    return ENGINE.rewrite_many(bullets, rng)
+
+if __name__ == "__main__":
+    # RUN IT
+    fixed_list = batch_process_resumes(raw_bullets)
+
+    print(f"--- PROCESSED {len(fixed_list)} BULLETS ---")
+    for line in fixed_list[:5]: # Print first 5 to check
+        print(f"\\item {{{line}}}")
+        print("---")
@@ -0,0 +1,97 @@
+import re
+import random
+
+# Shared machinery for the bullet rewriters (humanizer.py, humanizerPM.py, apply_quality_filters.py,
+# removeBIGnumbers.py). Patterns are compiled once at import, phrase tables are applied in a
+# single pass, and a RewriteEngine runs a fixed list of steps over one bullet or a whole batch.
+# Every step takes (text, rng); rng defaults to the module-level `random` so unseeded runs behave
+# as before, and passing random.Random(seed) makes a run reproducible.
+
+PERCENT_RE = re.compile(r'(\d+)%')
+PLUS_COUNT_RE = re.compile(r'(\d+)\+')
+# "$1 million", "$500,000"
+USD_RE = re.compile(r'\$[\d,]+(\s?million)?')
+USD_DIGITS_RE = re.compile(r'[\d\.]+')
+# "%" or "$" not already escaped, so escaping twice is a no-op
+LATEX_SPECIAL_RE = re.compile(r'(?<!\\)([%$])')
+
+USD_TO_INR = 85
+
+class Replacements:
+    # Phrase table compiled into one alternation regex (longest phrase first, so overlapping
+    # keys resolve the way the longer one intends) and applied in a single pass, so a replacement
+    # is never rewritten again by a later entry. Python's re has no literal-set prefilter, and for
+    # tables this small a C-level `in` check per phrase is cheaper than running the alternation
+    # over every bullet, so the regex only runs on bullets that contain two or more phrases.
+    def __init__(self, mapping):
+        self.mapping = dict(mapping)
+        self.keys = sorted(self.mapping, key=len, reverse=True)
+        self.pattern = re.compile("|".join(re.escape(k) for k in self.keys)) if self.keys else None
+
+    def __call__(self, text, rng=None):
+        present = [k for k in self.keys if k in text]
+        if not present:
+            return text
+        if len(present) == 1:
+            return text.replace(present[0], self.mapping[present[0]])
+        return self.pattern.sub(lambda m: self.mapping[m.group(0)], text)
+
+def jitter(pattern, low, high, template):
+    # Step that nudges the integer in group 1 of every match by rng.randint(low, high)
+    def step(text, rng):
+        return pattern.sub(lambda m: template.format(int(m.group(1)) + rng.randint(low, high)), text)
+    return step
+
+def usd_to_inr(raw, rate=USD_TO_INR):
+    # "$500,000" -> "Rs. 4 Cr" style: Crores above 1 Cr, whole Lakhs below
+    if "million" in raw:
+        base = float(USD_DIGITS_RE.search(raw).group()) * 1_000_000
+    else:
+        base = int(raw.replace("$", "").replace(",", ""))
+
+    value = base * rate
+    if value >= 10_000_000:
+        return f"Rs. {value / 10_000_000:.2f} Cr"
+    return f"Rs. {int(value / 100_000)} Lakhs"
+
+def convert_currency(rate_jitter=0):
+    # Step that rewrites every USD amount as INR; with rate_jitter the rate varies per amount
+    def step(text, rng):
+        def convert(m):
+            rate = USD_TO_INR + rng.randint(-rate_jitter, rate_jitter) if rate_jitter else USD_TO_INR
+            return usd_to_inr(m.group(0), rate)
+        return USD_RE.sub(convert, text)
+    return step
+
+def vary_phrase(phrase, choices):
+    # Step that swaps the first occurrence of a stock phrase for a random synonym
+    def step(text, rng):
+        if phrase in text:
+            return text.replace(phrase, rng.choice(choices), 1)
+        return text
+    return step
+
+def latex_escape(text, rng=None):
+    if "%" not in text and "$" not in text:
+        return text
+    return LATEX_SPECIAL_RE.sub(r'\\\1', text)
+
+class RewriteEngine:
+    def __init__(self, steps):
+        self.steps = list(steps)
+
+    def rewrite(self, text, rng=None):
+        rng = rng or random
+        for step in self.steps:
+            text = step(text, rng)
+        return text
+
+    def rewrite_many(self, texts, rng=None):
+        rng = rng or random
+        steps = self.steps
+        out = []
+        for text in texts:
+            for step in steps:
+                text = step(text, rng)
+            out.append(text)
+        return out
@@ -1,15 +1,47 @@
-import requests
+import os
 import re
+import sys
 import time
 import base64
-import json
+import random
+import asyncio
+import argparse
+import httpx
+from corpus import RAW_CORPUS, append_records, iter_records, make_record, write_records
+from http_cache import HTTPCache, conditional_headers
+from latex_extract import extract_bullets
+from llm_client import parse_retry_after
 
-# CONFIGURATION
-# GITHUB_TOKEN = os.getenv('GITHUB_TOKEN') # Use env var in production
-GITHUB_TOKEN = '' # Placeholder - DO NOT COMMIT SECRETS
-HEADERS = {}
+# Scrapes resume bullets from public .tex files on GitHub into RAW_CORPUS (see corpus.py).
+# - One search per (domain, role, company), every role x every company, run concurrently
+#   over one pooled HTTP connection set
+# - No fixed sleeps: each rate-limit bucket (search / core) is paced from GitHub's
+#   X-RateLimit-Remaining / X-RateLimit-Reset headers, and 403/429 responses wait out Retry-After
+# - Every finished query is appended to a checkpoint file, so an interrupted run resumes where it stopped
+# - Responses are cached on disk (http_cache.py): search results are revalidated with If-None-Match,
+#   which costs no quota when they haven't changed, and files are reused by blob sha without a request
+# Usage:
+#   python script.py
+#   python script.py --fresh                  (ignore the checkpoint and scrape everything again)
+#   python script.py --fresh --no-cache       (and re-download everything)
+#   GITHUB_API_URL=http://127.0.0.1:8765 python script.py   (against fake_github.py)
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+CHECKPOINT_PATH = os.path.join(script_dir, ".cache", "scrape_checkpoint.jsonl")
+
+GITHUB_API_URL = os.getenv("GITHUB_API_URL", "https://api.github.com").rstrip("/")
+GITHUB_TOKEN = os.getenv("GITHUB_TOKEN", "")  # never hard-code it here
+SCRAPE_CONCURRENCY = int(os.getenv("SCRAPE_CONCURRENCY", "8"))
+SCRAPE_MAX_RETRIES = int(os.getenv("SCRAPE_MAX_RETRIES", "5"))
+SCRAPE_TIMEOUT = float(os.getenv("SCRAPE_TIMEOUT", "30"))
+FILES_PER_QUERY = 5
+
+RETRY_BASE_DELAY = 1.0
+RETRY_MAX_DELAY = 30.0
+
+HEADERS = {"Accept": "application/vnd.github+json", "User-Agent": "resume-bullet-scraper"}
 if GITHUB_TOKEN:
-    HEADERS = {'Authorization': f'token {GITHUB_TOKEN}'}
+    HEADERS["Authorization"] = f"token {GITHUB_TOKEN}"
 
 # DOMAIN DEFINITIONS
 # (Domain Name, Job Titles, Top Companies)
@@ -36,6 +68,8 @@ DOMAINS = {
     )
 }
 
+METRIC_RE = re.compile(r'(\d+%|\$\d+|\d+)')
+
 def is_high_quality(text):
     """
     Heuristics for a 'perfect' bullet point:
@@ -45,98 +79,254 @@ def is_high_quality(text):
     """
     if len(text) < 60:
         return False
-    
+
     # Must contain a number or percentage or dollar sign (metrics)
-    if not re.search(r'(\d+%|\$\d+|\d+)', text):
+    if not METRIC_RE.search(text):
         return False
-        
+
     return True
 
-def clean_bullet(text):
-    # Remove LaTeX commands, extra spaces, etc.
-    text = re.sub(r'\s+', ' ', text).strip()
-    text = text.replace('\\\\', '')
-    text = re.sub(r'\\textbf\{([^}]+)\}', r'\1', text) # remove bold latex
-    text = re.sub(r'\\textit\{([^}]+)\}', r'\1', text) # remove italic latex
-    return text
-
-def scrape_domain(domain_name, roles, companies):
-    print(f"\n--- SCRAPING DOMAIN: {domain_name} ---")
-    
-    unique_bullets = set()
-    
-    # SIMPLE STRATEGY: 
-    # Query 1 Role + 1 Company at a time to avoid GitHub 256 char limit and 422 errors.
-    # We will limit to the first 1 Role and top 3 Companies to ensure this runs in reasonable time.
-    
-    target_role = roles[0] 
-    target_companies = companies[:3] 
-    
-    for company in target_companies:
-        # Query: extension:tex "Software Engineer" "Google"
-        query = f'extension:tex "{target_role}" "{company}"'
-        print(f"  > Querying: {query}")
-        
-        url = f"https://api.github.com/search/code?q={query}&per_page=5" # Get top 5 files
-        response = requests.get(url, headers=HEADERS)
-        
-        if response.status_code != 200:
-            print(f"    ! Error {response.status_code} - {response.text[:50]}")
-            time.sleep(2)
-            continue
-            
-        items = response.json().get('items', [])
-        print(f"    Found {len(items)} files.")
-        
-        # Regex to find \item {...}
-        pattern = r'\\(?:resumeItem|item)\s*\{([^}]{60,})\}'
-        
-        for item in items: 
+def high_quality_bullets(raw_text):
+    # latex_extract strips the formatting in the same pass that finds \item / \resumeItem bodies
+    return [bullet for bullet in extract_bullets(raw_text) if is_high_quality(bullet)]
+
+def query_tasks(domains=DOMAINS):
+    # Query 1 Role + 1 Company at a time to stay under GitHub's 256 char query limit (and its 422s)
+    return [(domain, role, company) for domain, (roles, companies) in domains.items() for role in roles for company in companies]
+
+class RateGate:
+    # One GitHub rate-limit bucket ("search" or "core"), paced from response headers.
+    # While the budget is unknown (first request, or a new window) a single probe request goes
+    # out to learn it; after that a request starts only while Remaining exceeds the requests
+    # already in flight, otherwise it sleeps until the bucket resets.
+    def __init__(self):
+        self.remaining = None
+        self.reset_at = 0.0
+        self.in_flight = 0
+
+    async def acquire(self):
+        while True:
+            now = time.time()
+            if self.reset_at and now >= self.reset_at:
+                # Window rolled over; the next response reports the new budget
+                self.remaining = None
+                self.reset_at = 0.0
+            if (self.in_flight == 0) if self.remaining is None else self.remaining > self.in_flight:
+                self.in_flight += 1
+                return
+            await asyncio.sleep(max(self.reset_at - now, 0.05))
+
+    def release(self, response=None):
+        self.in_flight -= 1
+        if response is None:
+            return
+        remaining = response.headers.get("x-ratelimit-remaining")
+        reset = response.headers.get("x-ratelimit-reset")
+        if remaining is None or reset is None:
+            return
+        remaining, reset_at = int(remaining), float(reset)
+        # Responses can arrive out of order: within one window the lowest count is the freshest
+        if reset_at > self.reset_at or self.remaining is None:
+            self.remaining, self.reset_at = remaining, reset_at
+        elif reset_at == self.reset_at:
+            self.remaining = min(self.remaining, remaining)
+
+    def block(self, seconds):
+        # Retry-After / exhausted bucket: nobody starts a request on this bucket for `seconds`
+        self.remaining = 0
+        self.reset_at = max(self.reset_at, time.time() + seconds)
+
+def is_rate_limited(response):
+    return response.status_code == 429 or (
+        response.status_code == 403
+        and ("retry-after" in response.headers or response.headers.get("x-ratelimit-remaining") == "0")
+    )
+
+def rate_limit_delay(response):
+    retry_after = parse_retry_after(response.headers.get("retry-after"))
+    if retry_after is not None:
+        return retry_after
+    reset = response.headers.get("x-ratelimit-reset")
+    if reset:
+        return max(float(reset) - time.time(), 0.0) + 1.0
+    return 60.0  # secondary limit without a hint: GitHub asks for at least a minute
+
+class GitHubClient:
+    def __init__(self, base_url=GITHUB_API_URL, concurrency=SCRAPE_CONCURRENCY, max_retries=SCRAPE_MAX_RETRIES, cache=None):
+        self.base_url = base_url
+        self.max_retries = max_retries
+        self.cache = cache
+        self.session = httpx.AsyncClient(
+            headers=HEADERS,
+            timeout=SCRAPE_TIMEOUT,
+            limits=httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency),
+        )
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.gates = {"search": RateGate(), "core": RateGate()}
+        self.requests = 0
+        self.not_modified = 0
+        self.blob_hits = 0
+
+    async def get_json(self, url, params=None, revalidate=True):
+        # revalidate: keep the body in the response cache and send If-None-Match for it next time
+        gate = self.gates["search" if "/search/" in url else "core"]
+        cache_key = str(httpx.URL(url, params=params))
+        cached = self.cache.get_response(cache_key) if self.cache and revalidate else None
+        headers = conditional_headers(cached)
+        for attempt in range(self.max_retries + 1):
+            # Wait on the bucket before taking a slot, so a drained search bucket doesn't stall file fetches
+            await gate.acquire()
+            response = None
             try:
-                file_url = item['url']
-                file_resp = requests.get(file_url, headers=HEADERS)
-                if file_resp.status_code == 200:
-                    content_b64 = file_resp.json().get('content', '')
-                    raw_text = base64.b64decode(content_b64).decode('utf-8', errors='ignore')
-                    
-                    found_matches = re.findall(pattern, raw_text, re.DOTALL)
-                    for match in found_matches:
-                        clean = clean_bullet(match)
-                        if is_high_quality(clean):
-                            unique_bullets.add(clean)
-                
-                time.sleep(0.5) 
-            except Exception as e:
-                print(f"    ! Failed to parse file: {e}")
-                
-        time.sleep(2) # Be kind to API
-        
-    return list(unique_bullets)
-
-# MAIN EXECUTION
-all_results = {}
-stats = {}
-
-print("Starting Multi-Domain Scrape...")
-for domain, (roles, companies) in DOMAINS.items():
-    bullets = scrape_domain(domain, roles, companies)
-    all_results[domain] = bullets
-    stats[domain] = len(bullets)
-    print(f"  >>> Extracted {len(bullets)} high-quality bullets for {domain}")
-
-# REPORTING
-print("\n" + "="*40)
-print("FINAL STATISTICS (Top 3 Companies/Domain)")
-print("="*40)
-print(f"{'DOMAIN':<20} | {'COUNT':<10}")
-print("-" * 33)
-for d, c in stats.items():
-    print(f"{d:<20} | {c:<10}")
-print("="*40)
-
-# SAVING
-output_file = 'resume_bullets.json'
-with open(output_file, 'w', encoding='utf-8') as f:
-    json.dump(all_results, f, indent=2, ensure_ascii=False)
-
-print(f"\nSaved all data to {output_file}")
+                async with self.semaphore:
+                    response = await self.session.get(url, params=params, headers=headers)
+                self.requests += 1
+            except httpx.TransportError as e:
+                error = e
+            finally:
+                gate.release(response)
+
+            if response is not None:
+                if response.status_code == 304 and cached is not None:
+                    self.not_modified += 1
+                    return cached["body"]
+                if response.status_code == 200:
+                    body = response.json()
+                    if self.cache and revalidate:
+                        self.cache.put_response(cache_key, response.headers, body)
+                    return body
+                if is_rate_limited(response):
+                    gate.block(rate_limit_delay(response))
+                    error = httpx.HTTPStatusError(f"Rate limited ({response.status_code})", request=response.request, response=response)
+                    if attempt < self.max_retries:
+                        continue
+                elif response.status_code < 500:
+                    response.raise_for_status()
+                else:
+                    error = httpx.HTTPStatusError(f"Error {response.status_code} - {response.text[:50]}", request=response.request, response=response)
+
+            if attempt == self.max_retries:
+                raise error
+            await asyncio.sleep(random.uniform(0, min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2 ** attempt)))
+
+    async def search_code(self, query, per_page=FILES_PER_QUERY):
+        data = await self.get_json(f"{self.base_url}/search/code", {"q": query, "per_page": per_page})
+        return data.get("items", [])
+
+    async def file_text(self, item):
+        # Search results carry each file's blob sha, so a file seen before needs no request at all
+        sha = item.get('sha')
+        if self.cache and sha:
+            text = self.cache.get_blob(sha)
+            if text is not None:
+                self.blob_hits += 1
+                return text
+
+        # Already keyed by sha in the blob cache; no need to keep the base64 response as well
+        data = await self.get_json(item['url'], revalidate=not (self.cache and sha))
+        text = base64.b64decode(data.get('content', '')).decode('utf-8', errors='ignore')
+        if self.cache and (data.get('sha') or sha):
+            self.cache.put_blob(data.get('sha') or sha, text)
+        return text
+
+    async def aclose(self):
+        await self.session.aclose()
+
+async def scrape_query(client, domain, role, company):
+    # Query: extension:tex "Software Engineer" "Google"
+    query = f'extension:tex "{role}" "{company}"'
+    items = await client.search_code(query)
+    texts = await asyncio.gather(*(client.file_text(item) for item in items), return_exceptions=True)
+
+    bullets = []
+    for item, raw_text in zip(items, texts):
+        if isinstance(raw_text, Exception):
+            print(f"    ! Failed to fetch {item.get('path', item['url'])}: {raw_text}")
+            continue
+        bullets.extend(high_quality_bullets(raw_text))
+    print(f"  > {query}: {len(items)} files, {len(bullets)} bullets")
+    return bullets
+
+def load_checkpoint(path=CHECKPOINT_PATH):
+    # (domain, role, company) -> bullets for every query an earlier run finished
+    return {(entry["domain"], entry["role"], entry["company"]): entry["bullets"] for entry in iter_records(path)}
+
+async def scrape(tasks, checkpoint_path=CHECKPOINT_PATH, concurrency=SCRAPE_CONCURRENCY, cache=None, base_url=GITHUB_API_URL):
+    done = load_checkpoint(checkpoint_path)
+    todo = [task for task in tasks if task not in done]
+    print(f"{len(tasks)} queries: {len(tasks) - len(todo)} done in an earlier run, {len(todo)} to go "
+          f"(concurrency {concurrency}, {base_url}).")
+
+    os.makedirs(os.path.dirname(checkpoint_path), exist_ok=True)
+    client = GitHubClient(base_url=base_url, concurrency=concurrency, cache=cache)
+    failed = []
+
+    async def run(task):
+        try:
+            bullets = await scrape_query(client, *task)
+        except Exception as e:
+            print(f"  ! {task[0]} / {task[1]} / {task[2]}: {e}")
+            failed.append(task)
+            return
+        # One event loop, so appends never interleave
+        append_records([{"domain": task[0], "role": task[1], "company": task[2], "bullets": bullets}], checkpoint_path)
+        done[task] = bullets
+
+    start = time.perf_counter()
+    try:
+        await asyncio.gather(*(run(task) for task in todo))
+    finally:
+        await client.aclose()
+    elapsed = time.perf_counter() - start
+    print(f"{client.requests} requests in {elapsed:.1f}s ({client.requests / max(elapsed, 1e-9):.1f} req/s), "
+          f"{client.not_modified} not modified, {client.blob_hits} files from the cache.")
+    return done, failed
+
+def collect(tasks, done):
+    # Unique bullets per domain, in query order (not completion order) so reruns produce the same file
+    results = {}
+    for task in tasks:
+        unique = results.setdefault(task[0], {})
+        for bullet in done.get(task, []):
+            unique.setdefault(bullet)
+    return {domain: list(unique) for domain, unique in results.items()}
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Scrape resume bullets from .tex files on GitHub.")
+    arg_parser.add_argument("--concurrency", type=int, default=SCRAPE_CONCURRENCY, help="Requests in flight at once")
+    arg_parser.add_argument("--fresh", action="store_true", help="Discard the checkpoint and scrape every query again")
+    arg_parser.add_argument("--no-cache", action="store_true", help="Neither read nor write the HTTP response cache")
+    arg_parser.add_argument("--output", default=RAW_CORPUS)
+    args = arg_parser.parse_args()
+
+    if args.fresh and os.path.exists(CHECKPOINT_PATH):
+        os.remove(CHECKPOINT_PATH)
+
+    print("Starting Multi-Domain Scrape...")
+    tasks = query_tasks()
+    cache = None if args.no_cache else HTTPCache()
+    done, failed = asyncio.run(scrape(tasks, concurrency=args.concurrency, cache=cache))
+    all_results = collect(tasks, done)
+
+    # REPORTING
+    print("\n" + "="*40)
+    print("FINAL STATISTICS (All Roles x Companies)")
+    print("="*40)
+    print(f"{'DOMAIN':<20} | {'COUNT':<10}")
+    print("-" * 33)
+    for d, bullets in all_results.items():
+        print(f"{d:<20} | {len(bullets):<10}")
+    print("="*40)
+
+    # SAVING
+    count = write_records((make_record(domain, text) for domain, bullets in all_results.items() for text in bullets), args.output)
+    print(f"\nSaved {count} bullets to {args.output}")
+
+    if failed:
+        print(f"{len(failed)} queries failed; run again to retry just those (checkpoint: {CHECKPOINT_PATH}).")
+        return 1
+    if os.path.exists(CHECKPOINT_PATH):
+        os.remove(CHECKPOINT_PATH)
+
+if __name__ == "__main__":
+    sys.exit(main())
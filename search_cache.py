@@ -0,0 +1,75 @@
+import os
+import time
+import threading
+from collections import OrderedDict
+
+# In-memory caches for rag_search's resident mode.
+#   query embeddings: normalised query -> vector (never stale: embeddings don't depend on the index)
+#   results:          (normalised query, top_k, filters, mode) -> matches, dropped whenever the index version changes
+# vector_db.py bumps the index version file after every sync/rebuild; readers only stat() it.
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+INDEX_VERSION_PATH = os.path.join(script_dir, ".cache", "index_version")
+
+SEARCH_CACHE_SIZE = int(os.getenv("SEARCH_CACHE_SIZE", "1024"))
+SEARCH_CACHE_TTL = float(os.getenv("SEARCH_CACHE_TTL", "600"))  # seconds
+USE_SEARCH_CACHE = os.getenv("SEARCH_CACHE", "1") != "0"
+
+def normalize_query(query):
+    return " ".join(query.casefold().split())
+
+class TTLCache:
+    # LRU with a per-entry time-to-live; thread-safe for the --serve thread pool
+    def __init__(self, max_size=SEARCH_CACHE_SIZE, ttl=SEARCH_CACHE_TTL):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    del self.entries[key]
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key, value):
+        with self.lock:
+            self.entries[key] = (time.monotonic() + self.ttl, value)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+    def stats(self):
+        with self.lock:
+            return {"size": len(self.entries), "hits": self.hits, "misses": self.misses}
+
+def bump_index_version(backend, path=INDEX_VERSION_PATH):
+    # Called by vector_db.py after the index changed; running searchers notice on their next query
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(f"{backend} {time.time_ns()}\n")
+    os.replace(tmp_path, path)
+
+def current_index_version(path=INDEX_VERSION_PATH):
+    # A stat per query is cheap; the file contents are only informational
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (st.st_mtime_ns, st.st_ino)
@@ -0,0 +1,238 @@
+import re
+
+# Deterministic pre-pass over extracted resume text.
+# Splits the text into sections using the SECTION HEADER MAPPINGS from parser.py's SYSTEM_PROMPT,
+# pulls out contact fields, skills and bulleted achievements with regexes, and builds a much
+# smaller prompt that only asks the LLM for the sections that actually need it.
+
+# Bump when the splitting/prompt logic changes (part of the parse cache key)
+PREPARSER_VERSION = "2"
+
+# Keep in sync with SYSTEM_PROMPT in parser.py
+SECTION_HEADERS = {
+    "experience": [
+        "Work Experience", "Professional Experience", "Employment History", "Career History",
+        "Work History", "Professional Background", "Experience", "Internships",
+        "Relevant Experience", "Industry Experience",
+    ],
+    "education": [
+        "Education", "Academic Background", "Educational Qualifications", "Academic History",
+        "Degrees", "Schooling", "Academic Credentials",
+    ],
+    "projects": [
+        "Projects", "Personal Projects", "Academic Projects", "Key Projects",
+        "Technical Projects", "Portfolio", "Side Projects",
+    ],
+    "skills": [
+        "Skills", "Technical Skills", "Core Competencies", "Key Skills",
+        "Expertise", "Proficiencies", "Technologies", "Tools & Technologies",
+    ],
+    "achievements": [
+        "Achievements", "Certifications", "Awards", "Honors",
+        "Accomplishments", "Courses", "Licenses", "Publications",
+        "Achievements & Certifications", "Awards & Honors",
+    ],
+    "responsibilities": [
+        "Positions of Responsibility", "Leadership", "Extracurriculars",
+        "Volunteer Work", "Community Involvement", "Activities",
+        "Leadership Experience", "Organizational Roles",
+    ],
+}
+
+# Per-field JSON shapes, same as the full SYSTEM_PROMPT
+SECTION_SCHEMAS = {
+    "experience": '"experience": [ { "company": "", "role": "", "startDate": "", "endDate": "", "location": "", "bullets": [] } ]',
+    "projects": '"projects": [ { "name": "", "description": "", "technologies": [], "link": "", "bullets": [] } ]',
+    "education": '"education": [ { "school": "", "degree": "", "field": "", "startDate": "", "endDate": "", "grade": "" } ]',
+    "responsibilities": '"responsibilities": [ { "title": "", "organization": "", "location": "", "startDate": "", "endDate": "", "description": "" } ]',
+    "achievements": '"achievements": [ "Achievement 1 with details" ]',
+    "skills": '"skills": []',
+}
+
+# Profile fields extract_contact looks for; any it misses are left for the LLM
+CONTACT_FIELDS = ["email", "phone", "linkedin", "github", "website"]
+
+EMPTY_RESUME = {
+    "profile": {"name": "", "email": "", "phone": "", "linkedin": "", "github": "", "website": "", "summary": ""},
+    "experience": [],
+    "projects": [],
+    "education": [],
+    "responsibilities": [],
+    "achievements": [],
+    "skills": [],
+}
+
+def _header_key(line):
+    # "TOOLS & TECHNOLOGIES:" and small-caps artefacts like "E XPERIENCE" both normalise cleanly
+    return re.sub(r'[^a-z]', '', line.lower().replace("&", "and"))
+
+HEADER_LOOKUP = {
+    _header_key(variant): field
+    for field, variants in SECTION_HEADERS.items()
+    for variant in variants
+}
+MAX_HEADER_LEN = 45
+
+EMAIL_RE = re.compile(r'[\w.+-]+@[\w-]+(?:\.[\w-]+)+')
+PHONE_RE = re.compile(r'(?<![\w/])\+?\d[\d\s().-]{7,}\d(?![\w/])')
+LINKEDIN_RE = re.compile(r'(?:https?://)?(?:[a-z]{2,3}\.)?linkedin\.com/in/[\w%-]+/?', re.IGNORECASE)
+GITHUB_RE = re.compile(r'(?:https?://)?(?:www\.)?github\.com/[\w-]+(?:/[\w.-]+)?/?', re.IGNORECASE)
+URL_RE = re.compile(r'https?://[^\s|,;]+', re.IGNORECASE)
+
+SKILL_SPLIT_RE = re.compile(r'[,;|\n•·▪●]')
+SKILL_LABEL_RE = re.compile(r'^[A-Za-z /&]{2,30}:\s*')
+MAX_SKILL_LEN = 40
+BULLET_RE = re.compile(r'^\s*[•·▪●◦\-*]\s+')
+
+def split_sections(text):
+    # Returns (header_text, {field: block_text}); repeated headers for a field are concatenated
+    header_lines = []
+    sections = {}
+    current = None
+
+    for line in text.splitlines():
+        stripped = line.strip()
+        field = None
+        if stripped and len(stripped) <= MAX_HEADER_LEN:
+            field = HEADER_LOOKUP.get(_header_key(stripped))
+
+        if field:
+            current = field
+            sections.setdefault(field, [])
+        elif current is None:
+            header_lines.append(line)
+        else:
+            sections[current].append(line)
+
+    blocks = {field: "\n".join(lines).strip() for field, lines in sections.items()}
+    return "\n".join(header_lines).strip(), blocks
+
+def extract_contact(text):
+    profile = {}
+
+    email = EMAIL_RE.search(text)
+    if email:
+        profile["email"] = email.group(0)
+
+    linkedin = LINKEDIN_RE.search(text)
+    if linkedin:
+        profile["linkedin"] = linkedin.group(0)
+
+    github = GITHUB_RE.search(text)
+    if github:
+        profile["github"] = github.group(0)
+
+    for match in PHONE_RE.finditer(text):
+        digits = re.sub(r'\D', '', match.group(0))
+        # Skip date ranges like 2019 - 2023 and other digit runs that aren't phone numbers
+        if 10 <= len(digits) <= 15:
+            profile["phone"] = match.group(0).strip()
+            break
+
+    for match in URL_RE.finditer(text):
+        url = match.group(0).rstrip(".)")
+        if "linkedin.com" not in url.lower() and "github.com" not in url.lower():
+            profile["website"] = url
+            break
+
+    return profile
+
+def split_skills(block):
+    # None means "not clear-cut, let the LLM handle it"
+    skills = []
+    for line in block.splitlines():
+        line = SKILL_LABEL_RE.sub("", line.strip())
+        for item in SKILL_SPLIT_RE.split(line):
+            item = item.strip(" -\t.")
+            if not item:
+                continue
+            if len(item) > MAX_SKILL_LEN:
+                return None
+            skills.append(item)
+    return skills
+
+def split_bullets(block):
+    # Only clear-cut when every item starts with a bullet marker; wrapped lines are re-joined
+    items = []
+    for line in block.splitlines():
+        if not line.strip():
+            continue
+        if BULLET_RE.match(line):
+            items.append(BULLET_RE.sub("", line).strip())
+        elif items:
+            items[-1] += " " + line.strip()
+        else:
+            return None
+    return items
+
+def preparse(text):
+    header, sections = split_sections(text)
+
+    result = {
+        "header": header,
+        "sections": sections,
+        "profile": extract_contact(header or text),
+        "fields": {},
+    }
+
+    if "skills" in sections:
+        skills = split_skills(sections["skills"])
+        if skills is not None:
+            result["fields"]["skills"] = skills
+
+    if "achievements" in sections:
+        achievements = split_bullets(sections["achievements"])
+        if achievements is not None:
+            result["fields"]["achievements"] = achievements
+
+    return result
+
+def llm_fields(pre):
+    # Sections found in the text that still need the LLM
+    return [field for field in SECTION_SCHEMAS if field in pre["sections"] and field not in pre["fields"]]
+
+def build_focused_messages(pre):
+    fields = llm_fields(pre)
+    # Contact details the regexes missed (obfuscated emails, unusual phone formats) still need the LLM
+    profile_fields = ["name"] + [f for f in CONTACT_FIELDS if f not in pre["profile"]] + ["summary"]
+    profile_schema = '"profile": { ' + ", ".join(f'"{f}": ""' for f in profile_fields) + ' }'
+    schema = ",\n    ".join([profile_schema] + [SECTION_SCHEMAS[f] for f in fields])
+
+    system_prompt = f"""You are an expert Resume Parser.
+The resume text has already been split into labelled sections (### EXPERIENCE, ### EDUCATION, ...).
+Extract it into this strict JSON format:
+{{
+    {schema}
+}}
+
+Rules:
+- If a field is missing, use empty string or empty list.
+- Do not invent data.
+- "profile" comes from the text before the first section.
+- For experience, "role" is the job title (what you DO) and "company" is the employer (WHERE you work). Do NOT swap these.
+- Return ONLY the raw JSON string. No markdown formatting."""
+
+    parts = [pre["header"]]
+    for field in fields:
+        parts.append(f"### {field.upper()}\n{pre['sections'][field]}")
+    user_prompt = "Resume Text:\n" + "\n\n".join(parts)
+
+    return [
+        {"role": "system", "content": system_prompt},
+        {"role": "user", "content": user_prompt},
+    ]
+
+def merge(pre, llm_json):
+    # Start from the full schema so the output shape never depends on which sections were found
+    result = {key: (dict(value) if isinstance(value, dict) else list(value)) for key, value in EMPTY_RESUME.items()}
+
+    for key, value in llm_json.items():
+        if key == "profile" and isinstance(value, dict):
+            result["profile"].update({k: v for k, v in value.items() if v})
+        elif key in result:
+            result[key] = value
+
+    # Regex hits are more reliable than the model for contact details
+    result["profile"].update(pre["profile"])
+    result.update(pre["fields"])
+    return result
@@ -1,43 +1,43 @@
-import json
-import os
+from corpus import CORPUS_PATH, CLEAN_CORPUS, bullet_hash, ensure_jsonl, iter_records, make_record, write_records
+
+def separated_records(real_hashes, real_domains):
+    # Real bullets come from the cleaned corpus
+    yield from iter_records(CLEAN_CORPUS)
+
+    # Identify Synthetic (points in Mixed but not in Real), exact string matching per domain.
+    # No augmented corpus yet means no synthetic points.
+    seen = set(real_hashes)
+    for record in iter_records(CORPUS_PATH):
+        key = bullet_hash(record["domain"], record["text"])
+        if record["domain"] not in real_domains or key in seen:
+            continue
+        seen.add(key)
+        yield make_record(record["domain"], record["text"], "synthetic", record.get("stages"))
 
 def main():
-    # Load Real Data
-    with open('cleaned_resumes.json', 'r', encoding='utf-8') as f:
-        real_data = json.load(f)
-
-    # Load Mixed Data (Real + Synthetic)
-    if os.path.exists('augmented_resumes.json'):
-        with open('augmented_resumes.json', 'r', encoding='utf-8') as f:
-            mixed_data = json.load(f)
-    else:
-        mixed_data = real_data # Fallback if no specific augmented file yet
-
-    structured_data = {}
-
-    for domain in real_data.keys():
-        real_points = real_data.get(domain, [])
-        mixed_points = mixed_data.get(domain, [])
-        
-        # Identify Synthetic (points in Mixed but not in Real)
-        # Using sets for easy subtraction, but need to be careful with exact string matching
-        real_set = set(real_points)
-        synthetic_points = [p for p in mixed_points if p not in real_set]
-        
-        structured_data[domain] = {
-            "real": real_points,
-            "synthetic": synthetic_points
-        }
+    ensure_jsonl(CORPUS_PATH)
+
+    # Only hashes of the real bullets are held in memory, not the bullets themselves
+    real_hashes, real_domains = set(), set()
+    for record in iter_records(CLEAN_CORPUS):
+        real_hashes.add(bullet_hash(record["domain"], record["text"]))
+        real_domains.add(record["domain"])
+
+    counts = {}
+    def counted(records):
+        for record in records:
+            domain = counts.setdefault(record["domain"], {"real": 0, "synthetic": 0})
+            domain[record["source"]] += 1
+            yield record
 
     # Save new structure
-    with open('augmented_resumes.json', 'w', encoding='utf-8') as f:
-        json.dump(structured_data, f, indent=2, ensure_ascii=False)
+    write_records(counted(separated_records(real_hashes, real_domains)), CORPUS_PATH)
 
-    print("Successfully separated Real vs Synthetic data in augmented_resumes.json")
+    print(f"Successfully separated Real vs Synthetic data in {CORPUS_PATH}")
     
     # Stats
-    for d, counts in structured_data.items():
-        print(f"{d}: {len(counts['real'])} Real, {len(counts['synthetic'])} Synthetic")
+    for d, c in counts.items():
+        print(f"{d}: {c['real']} Real, {c['synthetic']} Synthetic")
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,93 @@
+import time
+import asyncio
+import threading
+import pytest
+import fake_github
+from script import scrape, query_tasks, load_checkpoint
+
+# script.py's scraper against fake_github.py on an ephemeral port: full role x company coverage,
+# 403 / Retry-After responses waited out and retried, and resuming an interrupted run from its checkpoint.
+# Usage:
+#   python -m pytest test_script.py
+
+@pytest.fixture
+def github():
+    servers = []
+
+    def start(**options):
+        server = fake_github.make_server(port=0, **options)
+        responses = []
+
+        class Recording(server.RequestHandlerClass):
+            # (path, status) of every response, in the order they were sent
+            def _send(self, status, body, headers=None):
+                responses.append((self.path, status))
+                return super()._send(status, body, headers)
+
+        server.RequestHandlerClass = Recording
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        return f"http://127.0.0.1:{server.server_address[1]}", responses
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+def searches(responses):
+    return [path for path, status in responses if path.startswith("/search/") and status == 200]
+
+def test_scrape_covers_every_role_and_company(github, tmp_path):
+    base_url, responses = github(search_limit=60, window=1)
+    tasks = query_tasks()
+
+    done, failed = asyncio.run(scrape(tasks, str(tmp_path / "checkpoint.jsonl"), concurrency=8, base_url=base_url))
+
+    assert failed == []
+    assert set(done) == set(tasks)
+    assert all(done[task] for task in tasks)  # every fake file has bullets that pass is_high_quality
+    assert len(searches(responses)) == len(tasks)
+    assert set(load_checkpoint(str(tmp_path / "checkpoint.jsonl"))) == set(tasks)
+
+def test_rate_limits_are_waited_out_and_retried(github, tmp_path):
+    # 3 searches per 1s window and a Retry-After: 1 on every 10th request
+    base_url, responses = github(search_limit=3, window=1, secondary_every=10)
+    tasks = query_tasks()[:8]
+
+    start = time.perf_counter()
+    done, failed = asyncio.run(scrape(tasks, str(tmp_path / "checkpoint.jsonl"), concurrency=4, base_url=base_url))
+    elapsed = time.perf_counter() - start
+
+    assert failed == []
+    assert set(done) == set(tasks)
+    assert any(status == 403 for _, status in responses)
+    # 8 searches at 3 per window can't finish inside the first two windows
+    assert elapsed >= 2.0
+    # Every throttled search was retried until it succeeded, once per query
+    assert len(searches(responses)) == len(tasks)
+
+def test_interrupted_run_resumes_from_checkpoint(github, tmp_path):
+    base_url, responses = github(search_limit=1000, latency=0.01)
+    checkpoint = str(tmp_path / "checkpoint.jsonl")
+    tasks = query_tasks()[:20]
+
+    async def interrupted():
+        run = asyncio.create_task(scrape(tasks, checkpoint, concurrency=2, base_url=base_url))
+        while len(load_checkpoint(checkpoint)) < 5:
+            await asyncio.sleep(0.01)
+        run.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await run
+
+    asyncio.run(interrupted())
+    finished = load_checkpoint(checkpoint)
+    assert 5 <= len(finished) < len(tasks)
+
+    responses.clear()
+    done, failed = asyncio.run(scrape(tasks, checkpoint, concurrency=2, base_url=base_url))
+
+    assert failed == []
+    assert set(done) == set(tasks)
+    # Only the queries the first run didn't finish are searched again
+    assert len(searches(responses)) == len(tasks) - len(finished)
+    assert {task: done[task] for task in finished} == finished
@@ -1,133 +1,334 @@
 import os
+import sys
 import json
 import time
-import google.generativeai as genai
-from pinecone import Pinecone, ServerlessSpec
+import queue
+import hashlib
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
+from embeddings import EMBED_DIM, EMBED_BATCH_SIZE, EMBED_CONCURRENCY, get_embedder, batched
+from local_index import LocalIndexBuilder
+from domain_router import domain_namespace
+from search_cache import bump_index_version
+from corpus import CORPUS_PATH, iter_records
 
 # Load Env
 load_dotenv()
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
 PINECONE_API_KEY = os.getenv("PINECONE_API_KEY")
 
-if not GEMINI_API_KEY:
-    print("Error: GEMINI_API_KEY missing.")
-    exit(1)
-if not PINECONE_API_KEY:
-    print("Error: PINECONE_API_KEY missing. Please add it to .env")
-    exit(1)
-
-# Configure Gemini
-genai.configure(api_key=GEMINI_API_KEY)
-
-# Configure Pinecone
-pc = Pinecone(api_key=PINECONE_API_KEY)
 INDEX_NAME = "resume-bullets"
+# "pinecone" or "local" (in-process NumPy index, see local_index.py)
+VECTOR_BACKEND = os.getenv("VECTOR_BACKEND", "pinecone")
+# PINECONE_NAMESPACES=1 puts each domain in its own namespace so domain-scoped queries only search that partition
+USE_NAMESPACES = os.getenv("PINECONE_NAMESPACES", "0") == "1"
+UPSERT_BATCH_SIZE = 100
+DELETE_BATCH_SIZE = 1000
+MANIFEST_SAVE_EVERY = 10  # upsert batches between manifest saves during a sync
+
+# Local record of what is in the Pinecone index, so a sync only sends the difference
+script_dir = os.path.dirname(os.path.abspath(__file__))
+MANIFEST_PATH = os.path.join(script_dir, ".cache", "pinecone_manifest.json")
 
 def get_embedding(text):
-    # Use Gemini's text-embedding-004
+    # Single-text helper kept for ad-hoc use; ingestion goes through embed_and_upsert
     try:
-        result = genai.embed_content(
-            model="models/text-embedding-004",
-            content=text,
-            task_type="retrieval_document",
-            title="Resume Bullet Point"
-        )
-        return result['embedding']
+        return get_embedder(title="Resume Bullet Point").embed([text])[0]
     except Exception as e:
         print(f"Error embedding text: {e}")
         return None
 
 import traceback
 
-def main():
+def bullet_id(domain, bullet_type, text):
+    # Content-addressed: the same bullet keeps its id no matter where it sits in the list
+    digest = hashlib.sha256(f"{domain}\0{bullet_type}\0{text}".encode("utf-8")).hexdigest()[:24]
+    return f"{domain_namespace(domain)}_{digest}"
+
+def iter_points(records):
+    # (vector_id, text, metadata) for every real + synthetic bullet, streamed from the corpus
+    for record in records:
+        domain, text, bullet_type = record["domain"], record["text"], record["source"]
+
+        # Metadata
+        metadata = {
+            "text": text,
+            "domain": domain,
+            "type": bullet_type
+        }
+        yield bullet_id(domain, bullet_type, text), text, metadata
+
+def load_manifest():
+    if not os.path.exists(MANIFEST_PATH):
+        return None
+    with open(MANIFEST_PATH, 'r', encoding='utf-8') as f:
+        manifest = json.load(f)
+    if manifest.get("index") != INDEX_NAME or manifest.get("namespaced", False) != USE_NAMESPACES:
+        return None
+    return manifest
+
+def save_manifest(ids):
+    os.makedirs(os.path.dirname(MANIFEST_PATH), exist_ok=True)
+    tmp_path = MANIFEST_PATH + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({"index": INDEX_NAME, "namespaced": USE_NAMESPACES, "ids": sorted(ids)}, f)
+    os.replace(tmp_path, MANIFEST_PATH)
+
+def diff_points(points, indexed_ids):
+    # Returns (points to upsert, ids to delete); duplicates of the same bullet collapse to one id
+    desired = {}
+    for point in points:
+        desired.setdefault(point[0], point)
+    to_add = [p for vector_id, p in desired.items() if vector_id not in indexed_ids]
+    to_delete = sorted(indexed_ids - desired.keys())
+    return to_add, to_delete, set(desired)
+
+class NamespacedIndex:
+    # Wraps a Pinecone index so upsert/delete route every bullet to its domain's namespace.
+    # Ids start with the namespace (see bullet_id), so deletes need no metadata lookup.
+    def __init__(self, index):
+        self.index = index
+
+    def namespaces(self):
+        stats = self.index.describe_index_stats()
+        namespaces = getattr(stats, "namespaces", None)
+        if namespaces is None:
+            namespaces = stats.get("namespaces", {})
+        return list(namespaces)
+
+    def upsert(self, vectors):
+        groups = {}
+        for vector in vectors:
+            groups.setdefault(domain_namespace(vector[2]["domain"]), []).append(vector)
+        for namespace, chunk in groups.items():
+            self.index.upsert(vectors=chunk, namespace=namespace)
+
+    def delete(self, ids=None, delete_all=False):
+        if delete_all:
+            for namespace in self.namespaces():
+                self.index.delete(delete_all=True, namespace=namespace)
+            return
+        groups = {}
+        for vector_id in ids:
+            groups.setdefault(vector_id.split("_", 1)[0], []).append(vector_id)
+        for namespace, chunk in groups.items():
+            self.index.delete(ids=chunk, namespace=namespace)
+
+    def describe_index_stats(self):
+        return self.index.describe_index_stats()
+
+def delete_ids(index, ids):
+    for start in range(0, len(ids), DELETE_BATCH_SIZE):
+        chunk = ids[start:start + DELETE_BATCH_SIZE]
+        if index is not None:
+            index.delete(ids=chunk)
+        print(f"    Deleted {start + len(chunk)}/{len(ids)} stale vectors...")
+
+def embed_and_upsert(points, index, embedder, batch_size=EMBED_BATCH_SIZE, concurrency=EMBED_CONCURRENCY, on_upserted=None):
+    # Embedding batches run on a thread pool while a separate thread drains finished vectors
+    # into Pinecone, so network time for the two APIs overlaps instead of alternating.
+    upsert_queue = queue.Queue(maxsize=concurrency * 2)
+    stats = {"embedded": 0, "upserted": 0, "failed": 0}
+    stats_lock = threading.Lock()
+
+    def count(key, n):
+        with stats_lock:
+            stats[key] += n
+
+    def upserter():
+        pending = []
+        while True:
+            item = upsert_queue.get()
+            if item is not None:
+                pending.extend(item)
+            while len(pending) >= UPSERT_BATCH_SIZE or (item is None and pending):
+                chunk, pending = pending[:UPSERT_BATCH_SIZE], pending[UPSERT_BATCH_SIZE:]
+                try:
+                    if index is not None:
+                        index.upsert(vectors=chunk)
+                except Exception as e:
+                    # Keep draining the queue, otherwise the embedding threads block forever
+                    print(f"Error upserting batch of {len(chunk)}: {e}")
+                    count("failed", len(chunk))
+                    continue
+                count("upserted", len(chunk))
+                if on_upserted:
+                    on_upserted([vector_id for vector_id, _, _ in chunk])
+                print(f"    Upserted {stats['upserted']} vectors...")
+            if item is None:
+                return
+
+    def embed_batch(batch):
+        texts = [text for _, text, _ in batch]
+        try:
+            vectors = embedder.embed(texts)
+        except Exception as e:
+            print(f"Error embedding batch of {len(batch)}: {e}")
+            count("failed", len(batch))
+            return
+        count("embedded", len(batch))
+        upsert_queue.put([
+            (vector_id, vector, metadata)
+            for (vector_id, _, metadata), vector in zip(batch, vectors)
+        ])
+
+    upsert_thread = threading.Thread(target=upserter, daemon=True)
+    upsert_thread.start()
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        # Bounded submission keeps memory flat for large corpora
+        in_flight = []
+        for batch in batched(points, batch_size):
+            in_flight.append(pool.submit(embed_batch, batch))
+            if len(in_flight) >= concurrency * 2:
+                in_flight.pop(0).result()
+        for future in in_flight:
+            future.result()
+
+    upsert_queue.put(None)
+    upsert_thread.join()
+    return stats
+
+def get_index(pc):
+    from pinecone import ServerlessSpec
+    # Get index names safely for V5
+    indexes_response = pc.list_indexes()
     try:
-        # 1. Setup Index
-        print(f"Using Key: {PINECONE_API_KEY[:10]}...") 
-        
-        # Get index names safely for V5
-        indexes_response = pc.list_indexes()
+        if hasattr(indexes_response, 'names'):
+            existing_indexes = indexes_response.names()
+        else:
+             # Fallback for some versions
+            existing_indexes = [i.name for i in indexes_response]
+    except:
+        existing_indexes = []
+
+    print(f"Indexes found: {existing_indexes}")
+
+    if INDEX_NAME not in existing_indexes:
+        print(f"Creating Pinecone Index: {INDEX_NAME}...")
         try:
-            if hasattr(indexes_response, 'names'):
-                existing_indexes = indexes_response.names()
-            else:
-                 # Fallback for some versions
-                existing_indexes = [i.name for i in indexes_response]
-        except:
-            existing_indexes = []
-            
-        print(f"Indexes found: {existing_indexes}")
-        
-        if INDEX_NAME not in existing_indexes:
-            print(f"Creating Pinecone Index: {INDEX_NAME}...")
-            try:
-                pc.create_index(
-                    name=INDEX_NAME,
-                    dimension=768, # Gemini 004 dimension
-                    metric="cosine",
-                    spec=ServerlessSpec(
-                        cloud="aws",
-                        region="us-east-1"
-                    )
+            pc.create_index(
+                name=INDEX_NAME,
+                dimension=EMBED_DIM,
+                metric="cosine",
+                spec=ServerlessSpec(
+                    cloud="aws",
+                    region="us-east-1"
                 )
-                time.sleep(15) # Wait for init
-            except Exception as e:
-                print(f"Error creating index (Free Tier limit?): {e}")
-                # Try to use existing if creation fails
-                pass
-        
-        index = pc.Index(INDEX_NAME)
-        
-        # 2. Load Data
-        with open('augmented_resumes.json', 'r', encoding='utf-8') as f:
-            data = json.load(f)
-
-        vectors_to_upsert = []
-        
-        print("Generating Embeddings...")
-        
-        # Process Domains
-        for domain, content in data.items():
-            # Combine Real + Synthetic
-            real_pts = content.get("real", [])
-            synth_pts = content.get("synthetic", [])
-            all_pts = real_pts + synth_pts
-            
-            print(f"  > {domain}: {len(all_pts)} points")
-            
-            for i, text in enumerate(all_pts):
-                # Generate ID
-                vector_id = f"{domain}_{i}"
-                
-                # Embed
-                embedding = get_embedding(text)
-                if not embedding:
-                    continue
-                    
-                # Metadata
-                metadata = {
-                    "text": text,
-                    "domain": domain,
-                    "type": "real" if i < len(real_pts) else "synthetic"
-                }
-                
-                vectors_to_upsert.append((vector_id, embedding, metadata))
-                
-                # Batch Upsert (every 50)
-                if len(vectors_to_upsert) >= 50:
-                    index.upsert(vectors=vectors_to_upsert)
-                    vectors_to_upsert = []
-                    print(f"    Upserted batch for {domain}...")
-                    time.sleep(1) # Rate limit nice-ness
-
-        # Final Batch
-        if vectors_to_upsert:
-            index.upsert(vectors=vectors_to_upsert)
-            print("    Upserted final batch.")
-
-        print("\nSUCCESS: All data stored in Pinecone!")
-        stats = index.describe_index_stats()
-        print(stats)
+            )
+            time.sleep(15) # Wait for init
+        except Exception as e:
+            print(f"Error creating index (Free Tier limit?): {e}")
+            # Try to use existing if creation fails
+            pass
+
+    return pc.Index(INDEX_NAME)
+
+def build_local_index(args):
+    # The local index is cheap to rebuild from the embedding cache, so it is always rebuilt whole
+    if not GEMINI_API_KEY and os.getenv("EMBEDDER") != "fake":
+        print("Error: GEMINI_API_KEY missing.")
+        sys.exit(1)
+    embedder = get_embedder(title="Resume Bullet Point")
+
+    to_add, _, _ = diff_points(iter_points(iter_records(CORPUS_PATH)), set())
+
+    start = time.perf_counter()
+    builder = LocalIndexBuilder()
+    stats = embed_and_upsert(to_add, builder, embedder, batch_size=args.batch_size, concurrency=args.concurrency)
+    count = builder.save()
+    bump_index_version("local")
+    elapsed = max(time.perf_counter() - start, 1e-9)
+
+    print(f"\nSUCCESS: Local index built with {count} vectors ({stats['failed']} failed) at {builder.index_dir}")
+    if hasattr(embedder, "hits"):
+        print(f"Embedding cache: {embedder.hits} hits, {embedder.misses} new embeddings")
+    print(f"End-to-end: {elapsed:.1f}s, {count / elapsed:.1f} vectors/sec")
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Embed the bullet corpus into Pinecone.")
+    arg_parser.add_argument("--batch-size", type=int, default=EMBED_BATCH_SIZE, help="Texts per embedding request")
+    arg_parser.add_argument("--concurrency", type=int, default=EMBED_CONCURRENCY, help="Embedding requests in flight")
+    arg_parser.add_argument("--dry-run", action="store_true", help="Embed only, skip Pinecone (use with EMBEDDER=fake for offline runs)")
+    arg_parser.add_argument("--full", action="store_true", help="Wipe the index and re-upload everything instead of syncing the diff")
+    arg_parser.add_argument("--backend", choices=["pinecone", "local"], default=VECTOR_BACKEND)
+    args = arg_parser.parse_args()
+
+    if args.backend == "local":
+        build_local_index(args)
+        return
+
+    fake = os.getenv("EMBEDDER") == "fake"
+    if not GEMINI_API_KEY and not fake:
+        print("Error: GEMINI_API_KEY missing.")
+        sys.exit(1)
+    if not PINECONE_API_KEY and not args.dry_run:
+        print("Error: PINECONE_API_KEY missing. Please add it to .env")
+        sys.exit(1)
+
+    try:
+        # 1. Setup Index
+        index = None
+        if not args.dry_run:
+            print(f"Using Key: {PINECONE_API_KEY[:10]}...")
+            # Imported here, like the Gemini SDK in embeddings.py, so the local backend runs without it
+            from pinecone import Pinecone
+            index = get_index(Pinecone(api_key=PINECONE_API_KEY))
+            if USE_NAMESPACES:
+                index = NamespacedIndex(index)
+
+        embedder = get_embedder(title="Resume Bullet Point")
+
+        # 2. Diff against what is already indexed
+        manifest = None if args.full else load_manifest()
+        if manifest is None and not args.full:
+            print("No sync manifest found: uploading everything. Run with --full once to also clear vectors from older runs.")
+        indexed_ids = set(manifest["ids"]) if manifest else set()
+
+        to_add, to_delete, desired_ids = diff_points(iter_points(iter_records(CORPUS_PATH)), indexed_ids)
+        print(f"Sync plan: {len(to_add)} to upsert, {len(to_delete)} to delete, {len(desired_ids) - len(to_add)} unchanged.")
+
+        start = time.perf_counter()
+        if args.full and index is not None:
+            print("Clearing index for full rebuild...")
+            index.delete(delete_all=True)
+            save_manifest(set())
+
+        # What the index holds right now, saved every MANIFEST_SAVE_EVERY upsert batches so a crash
+        # mid-sync only re-sends the batches since the last save. Stale ids stay listed until
+        # they are actually deleted, so the next run still deletes them.
+        in_index = set(indexed_ids)
+        upserted_batches = 0
+        def on_upserted(ids):
+            nonlocal upserted_batches
+            in_index.update(ids)
+            upserted_batches += 1
+            if index is not None and upserted_batches % MANIFEST_SAVE_EVERY == 0:
+                save_manifest(in_index)
+
+        print(f"Generating Embeddings (batch size {args.batch_size}, concurrency {args.concurrency})...")
+        stats = embed_and_upsert(to_add, index, embedder, batch_size=args.batch_size, concurrency=args.concurrency, on_upserted=on_upserted)
+
+        if to_delete:
+            delete_ids(index, to_delete)
+
+        if index is not None:
+            save_manifest(in_index - set(to_delete))
+            if to_add or to_delete or args.full:
+                bump_index_version("pinecone")
+        elapsed = max(time.perf_counter() - start, 1e-9)
+
+        print(f"\nEmbedded {stats['embedded']} vectors ({stats['failed']} failed), upserted {stats['upserted']}, deleted {len(to_delete)}.")
+        if hasattr(embedder, "hits"):
+            print(f"Embedding cache: {embedder.hits} hits, {embedder.misses} new embeddings")
+        print(f"End-to-end: {elapsed:.1f}s, {stats['upserted'] / elapsed:.1f} vectors/sec")
+
+        if index is not None:
+            print("\nSUCCESS: Pinecone index is in sync with the bullet corpus!")
+            stats = index.describe_index_stats()
+            print(stats)
 
     except Exception as e:
         print("\nCRITICAL ERROR:")
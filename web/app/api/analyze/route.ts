@@ -1,11 +1,55 @@
+import { join } from "path";
 import { groq } from "@/lib/groq";
-import { streamText } from "ai";
+import { generateText, streamText } from "ai";
+import { getPythonWorker } from "@/lib/pythonWorker";
 
+export const runtime = "nodejs"; // Required for child processes
 export const maxDuration = 30;
 
+// Script is at ../bullet_analyzer.py relative to web/
+const scriptPath = () => join(process.cwd(), "..", "bullet_analyzer.py");
+
 export async function POST(req: Request) {
     const { resumeData } = await req.json();
 
+    // Clear-cut bullets (no numbers, weak verbs, already strong) are classified locally;
+    // the LLM only sees the borderline ones, and not at all when there are none
+    const worker = getPythonWorker(scriptPath());
+    let local: any;
+    try {
+        local = await worker.request({ resumeData });
+        if (local.error) throw new Error(local.error);
+    } catch (error: any) {
+        console.error("Local analysis failed, sending the whole resume to the LLM:", error);
+        return analyzeWithLLM(resumeData);
+    }
+
+    let analysis = local.analysis;
+    if (local.messages) {
+        try {
+            const { text } = await generateText({
+                model: groq('llama-3.3-70b-versatile'),
+                messages: local.messages,
+            });
+            const merged = await worker.request({ op: "merge", analysis, llm: text });
+            if (merged.error) throw new Error(merged.error);
+            analysis = merged.analysis;
+        } catch (error: any) {
+            // The local findings still stand; the borderline bullets just get none
+            console.error("Borderline analysis failed:", error);
+        }
+    }
+
+    // "borderline" only carries the bullets between the worker's analyze and merge steps;
+    // the client gets the same { intro, critical, warning, niceToHave } as from the LLM
+    delete analysis.borderline;
+    return new Response(JSON.stringify(analysis), {
+        headers: { "Content-Type": "application/json; charset=utf-8" },
+    });
+}
+
+// The whole resume in one prompt: what this route did before bullet_analyzer.py
+async function analyzeWithLLM(resumeData: unknown) {
     const result = await streamText({
         model: groq('llama-3.3-70b-versatile'),
         messages: [
@@ -1,7 +1,7 @@
 import { NextRequest, NextResponse } from "next/server";
 import { writeFile, unlink } from "fs/promises";
 import { join } from "path";
-import { spawn } from "child_process";
+import { getPythonWorker } from "@/lib/pythonWorker";
 
 
 
@@ -29,63 +29,46 @@ export async function POST(req: NextRequest) {
         const tmpDir = join(process.cwd(), "tmp");
         // We'll trust os.tmpdir or create a local tmp
         // Simplest: just save to root or a known temp
-        tempFilePath = join(process.cwd(), `temp_${Date.now()}.pdf`);
+        tempFilePath = join(process.cwd(), `temp_${Date.now()}_${Math.random().toString(36).slice(2, 8)}.pdf`);
 
         await writeFile(tempFilePath, buffer);
         console.log("Saved temp file:", tempFilePath);
 
-        // 2. Spawn Python Script
+        // 2. Hand the file to the resident parser worker
         // Script is at ../parser.py relative to web/
         const scriptPath = join(process.cwd(), "..", "parser.py");
-        console.log("Calling script at:", scriptPath);
-
-        return new Promise((resolve) => {
-            const pythonProcess = spawn("python", [scriptPath, tempFilePath]);
-
-            let outputData = "";
-            let errorData = "";
-
-            pythonProcess.stdout.on("data", (data) => {
-                outputData += data.toString();
-            });
-
-            pythonProcess.stderr.on("data", (data) => {
-                errorData += data.toString();
-            });
-
-            pythonProcess.on("close", async (code) => {
-                // Cleanup temp file
-                try { await unlink(tempFilePath); } catch (e) { }
-
-                if (code !== 0) {
-                    console.error("Python Script Error:", errorData);
-                    resolve(NextResponse.json({ error: "Parser script failed", details: errorData }, { status: 500 }));
-                    return;
-                }
-
-                try {
-                    console.log("Python Output Length:", outputData.length);
-                    const json = JSON.parse(outputData);
-
-                    if (json.error) {
-                        throw new Error(json.error);
-                    }
-
-                    // Post-process IDs
-                    const addId = (item: any) => ({ ...item, id: item.id || Math.random().toString(36).substr(2, 9) });
-                    if (json.experience) json.experience = json.experience.map(addId);
-                    if (json.projects) json.projects = json.projects.map(addId);
-                    if (json.education) json.education = json.education.map(addId);
-
-                    resolve(NextResponse.json(json));
-
-                } catch (e: any) {
-                    console.error("JSON Parse Error:", e);
-                    console.log("Raw Output:", outputData);
-                    resolve(NextResponse.json({ error: "Invalid response from parser", details: e.message }, { status: 500 }));
-                }
-            });
-        });
+        console.log("Calling parser worker at:", scriptPath);
+
+        let json: any;
+        try {
+            json = await getPythonWorker(scriptPath).request({ file: tempFilePath });
+        } catch (e: any) {
+            console.error("Python Worker Error:", e);
+            return NextResponse.json({ error: "Parser script failed", details: e.message }, { status: 500 });
+        } finally {
+            // Cleanup temp file
+            try { await unlink(tempFilePath); } catch (e) { }
+            tempFilePath = "";
+        }
+
+        try {
+            if (json.error) {
+                throw new Error(json.error);
+            }
+
+            // Post-process IDs
+            const addId = (item: any) => ({ ...item, id: item.id || Math.random().toString(36).substr(2, 9) });
+            if (json.experience) json.experience = json.experience.map(addId);
+            if (json.projects) json.projects = json.projects.map(addId);
+            if (json.education) json.education = json.education.map(addId);
+
+            return NextResponse.json(json);
+
+        } catch (e: any) {
+            console.error("JSON Parse Error:", e);
+            console.log("Raw Output:", json);
+            return NextResponse.json({ error: "Invalid response from parser", details: e.message }, { status: 500 });
+        }
 
     } catch (error: any) {
         // Cleanup if error occurs before promise
@@ -0,0 +1,48 @@
+import { NextRequest, NextResponse } from "next/server";
+import { join } from "path";
+import { getPythonWorker } from "@/lib/pythonWorker";
+
+export const runtime = "nodejs"; // Required for child processes
+
+// Script is at ../rag_search.py relative to web/
+const scriptPath = () => join(process.cwd(), "..", "rag_search.py");
+
+// POST { query } or { queries: [...] }, optional top_k / domain ("auto" to detect) / type / mode / resume
+export async function POST(req: NextRequest) {
+    try {
+        const body = await req.json();
+
+        if (!body.query && !Array.isArray(body.queries)) {
+            return NextResponse.json({ error: "No query provided" }, { status: 400 });
+        }
+
+        const json = await getPythonWorker(scriptPath()).request({
+            query: body.query,
+            queries: body.queries,
+            top_k: body.top_k,
+            domain: body.domain,
+            type: body.type,
+            mode: body.mode,
+            resume: body.resume,
+        });
+
+        if (json && json.error) {
+            return NextResponse.json({ error: "Search failed", details: json.error }, { status: 500 });
+        }
+        return NextResponse.json({ results: json });
+
+    } catch (error: any) {
+        console.error("----- SEARCH API ERROR -----", error);
+        return NextResponse.json({ error: "Search failed", details: error.message }, { status: 500 });
+    }
+}
+
+// GET returns the worker's latency metrics (p50/p95 over recent requests)
+export async function GET() {
+    try {
+        const metrics = await getPythonWorker(scriptPath()).request({ op: "metrics" });
+        return NextResponse.json(metrics);
+    } catch (error: any) {
+        return NextResponse.json({ error: "Metrics unavailable", details: error.message }, { status: 500 });
+    }
+}
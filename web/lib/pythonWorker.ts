@@ -0,0 +1,110 @@
+import { spawn, ChildProcessWithoutNullStreams } from "child_process";
+import { createInterface } from "readline";
+
+// Keeps one long-lived `python <script> --serve` process and multiplexes requests over its
+// stdin/stdout JSON-lines protocol (see jsonl_worker.py). Avoids paying interpreter start-up,
+// imports and client construction on every API call.
+
+// A request with no reply by then is rejected; parses wait on the LLM, retries included
+const REQUEST_TIMEOUT_MS = Number(process.env.PYTHON_WORKER_TIMEOUT_MS) || 300_000;
+
+type Pending = {
+    resolve: (value: any) => void;
+    reject: (error: Error) => void;
+    timer: ReturnType<typeof setTimeout>;
+};
+
+export class PythonWorker {
+    private proc: ChildProcessWithoutNullStreams | null = null;
+    private pending = new Map<string, Pending>();
+    private nextId = 0;
+
+    constructor(
+        private scriptPath: string,
+        private args: string[] = ["--serve"],
+        private timeoutMs: number = REQUEST_TIMEOUT_MS,
+    ) { }
+
+    private fail(proc: ChildProcessWithoutNullStreams, error: Error) {
+        // Fail everything in flight; the next request restarts the worker
+        for (const pending of this.pending.values()) {
+            clearTimeout(pending.timer);
+            pending.reject(error);
+        }
+        this.pending.clear();
+        if (this.proc === proc) this.proc = null;
+    }
+
+    private start() {
+        const proc = spawn("python", [this.scriptPath, ...this.args]);
+
+        const lines = createInterface({ input: proc.stdout });
+        lines.on("line", (line) => {
+            let message: any;
+            try {
+                message = JSON.parse(line);
+            } catch (e) {
+                console.error("Python worker sent invalid JSON:", line);
+                return;
+            }
+
+            const id = message.id === null || message.id === undefined ? "" : String(message.id);
+            const pending = this.pending.get(id);
+            if (!pending) return;
+
+            this.pending.delete(id);
+            clearTimeout(pending.timer);
+            pending.resolve(message.result);
+        });
+
+        proc.stderr.on("data", (data) => {
+            console.error("Python worker stderr:", data.toString());
+        });
+
+        proc.on("exit", (code) => {
+            this.fail(proc, new Error(`Python worker exited with code ${code}`));
+        });
+
+        // Spawn failures (no python on PATH) and writes to a dead worker (EPIPE) arrive as "error"
+        // events; unhandled, they would take down the server
+        proc.on("error", (error) => {
+            this.fail(proc, new Error(`Python worker failed: ${error.message}`));
+        });
+        proc.stdin.on("error", (error) => {
+            this.fail(proc, new Error(`Python worker stdin failed: ${error.message}`));
+            proc.kill(); // it can't take requests any more; the next one starts a fresh worker
+        });
+
+        this.proc = proc;
+        return proc;
+    }
+
+    request(payload: Record<string, unknown>): Promise<any> {
+        const proc = this.proc ?? this.start();
+        const id = String(this.nextId++);
+
+        return new Promise((resolve, reject) => {
+            const timer = setTimeout(() => {
+                // A reply that turns up later finds no pending entry and is dropped
+                this.pending.delete(id);
+                reject(new Error(`Python worker did not reply within ${this.timeoutMs} ms`));
+            }, this.timeoutMs);
+            this.pending.set(id, { resolve, reject, timer });
+            proc.stdin.write(JSON.stringify({ ...payload, id }) + "\n");
+        });
+    }
+}
+
+// Survive Next.js dev hot reloads without leaking a process per reload
+const globalWorkers = globalThis as unknown as { pythonWorkers?: Map<string, PythonWorker> };
+
+export function getPythonWorker(scriptPath: string): PythonWorker {
+    if (!globalWorkers.pythonWorkers) globalWorkers.pythonWorkers = new Map();
+
+    let worker = globalWorkers.pythonWorkers.get(scriptPath);
+    if (!worker) {
+        worker = new PythonWorker(scriptPath);
+        globalWorkers.pythonWorkers.set(scriptPath, worker);
+    }
+    return worker;
+}